@@ -1,4 +1,4 @@
 """Configuration module for GenAI RAG Q&A System."""
-from .settings import settings
+from .settings import settings, dotenv_file
 
-__all__ = ["settings"]
+__all__ = ["settings", "dotenv_file"]
@@ -2,11 +2,29 @@
 Centralized configuration management using Pydantic Settings.
 All settings can be overridden via environment variables.
 """
+import os
+from functools import cached_property
 from pathlib import Path
-from pydantic_settings import BaseSettings
+from typing import Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
+def dotenv_file() -> Optional[str]:
+    """
+    Path of the .env file to load, if any.
+    
+    Containers inject env vars directly, so the file is skipped when it is
+    absent or when DISABLE_DOTENV=1 (a stale .env can't shadow real config).
+    
+    Returns:
+        ".env" if it should be loaded, otherwise None
+    """
+    if os.getenv("DISABLE_DOTENV") == "1" or not os.path.exists(".env"):
+        return None
+    return ".env"
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
@@ -39,21 +57,23 @@ class Settings(BaseSettings):
     chunk_overlap: int = Field(default=200)
     top_k_results: int = Field(default=5)
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    model_config = SettingsConfigDict(
+        env_file=dotenv_file(),
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore"
+    )
     
-    @property
+    @cached_property
     def upload_path(self) -> Path:
-        """Get upload directory as Path object."""
+        """Get upload directory as Path object (created on first access)."""
         path = Path(self.upload_dir)
         path.mkdir(parents=True, exist_ok=True)
         return path
     
-    @property
+    @cached_property
     def chroma_path(self) -> Path:
-        """Get ChromaDB directory as Path object."""
+        """Get ChromaDB directory as Path object (created on first access)."""
         path = Path(self.chroma_persist_dir)
         path.mkdir(parents=True, exist_ok=True)
         return path
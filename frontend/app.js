@@ -126,18 +126,47 @@ async function sendMessage() {
     setLoading(true, 'Thinking...');
 
     try {
-        const response = await fetch(`${CONFIG.apiUrl}/query`, {
+        // The answer streams in as Server-Sent Events: sources first, then
+        // answer chunks rendered as they arrive
+        const response = await fetch(`${CONFIG.apiUrl}/query/stream`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ question: message, top_k: 5 }),
         });
 
-        if (!response.ok) throw new Error('Failed to get response');
-
-        const data = await response.json();
+        if (!response.ok || !response.body) throw new Error('Failed to get response');
+
+        const { messageDiv, entry } = addMessage('assistant', '');
+        const textEl = messageDiv.querySelector('.message-content p');
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+            for (const raw of events) {
+                if (!raw.startsWith('data: ')) continue;
+                const event = JSON.parse(raw.slice(6));
+
+                if (event.type === 'sources') {
+                    entry.sources = event.sources;
+                } else if (event.type === 'token') {
+                    setLoading(false);
+                    entry.content += event.text;
+                    textEl.innerHTML = formatMessage(entry.content);
+                    elements.messagesContainer.scrollTop = elements.messagesContainer.scrollHeight;
+                } else if (event.type === 'error') {
+                    throw new Error(event.detail);
+                }
+            }
+        }
 
-        // Add assistant message
-        addMessage('assistant', data.answer, data.sources);
+        textEl.insertAdjacentHTML('afterend', sourcesHtml(entry.sources));
 
     } catch (error) {
         console.error('Error:', error);
@@ -148,31 +177,31 @@ async function sendMessage() {
     }
 }
 
+function sourcesHtml(sources) {
+    if (!sources || sources.length === 0) return '';
+    return `
+        <div class="sources">
+            <div class="sources-title">📚 Sources</div>
+            ${sources.map(s => `
+                <div class="source-item">
+                    ${s.title || s.source} (${(s.relevance_score * 100).toFixed(0)}% relevant)
+                </div>
+            `).join('')}
+        </div>
+    `;
+}
+
 function addMessage(role, content, sources = []) {
     const timestamp = new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' });
 
     const messageDiv = document.createElement('div');
     messageDiv.className = `message ${role}`;
 
-    let sourcesHtml = '';
-    if (sources && sources.length > 0) {
-        sourcesHtml = `
-            <div class="sources">
-                <div class="sources-title">📚 Sources</div>
-                ${sources.map(s => `
-                    <div class="source-item">
-                        ${s.title || s.source} (${(s.relevance_score * 100).toFixed(0)}% relevant)
-                    </div>
-                `).join('')}
-            </div>
-        `;
-    }
-
     messageDiv.innerHTML = `
         <div class="message-avatar">${role === 'user' ? '👤' : '🤖'}</div>
         <div class="message-content">
             <p>${formatMessage(content)}</p>
-            ${sourcesHtml}
+            ${sourcesHtml(sources)}
             <div class="message-meta">
                 <span class="timestamp">${timestamp}</span>
             </div>
@@ -182,8 +211,10 @@ function addMessage(role, content, sources = []) {
     elements.messagesContainer.appendChild(messageDiv);
     elements.messagesContainer.scrollTop = elements.messagesContainer.scrollHeight;
 
-    // Save to state
-    state.messages.push({ role, content, sources, timestamp });
+    // Save to state (streamed messages fill the entry in as chunks arrive)
+    const entry = { role, content, sources, timestamp };
+    state.messages.push(entry);
+    return { messageDiv, entry };
 }
 
 function formatMessage(text) {
@@ -608,6 +639,27 @@ async function loadKGStats() {
     }
 }
 
+// Expand the column-oriented (format=soa) payload into the node/link
+// objects D3's force simulation works on
+function graphFromSoa(data) {
+    const nodeCols = data.nodes_soa || { id: [] };
+    const linkCols = data.links_soa || { source: [] };
+
+    const nodes = nodeCols.id.map((id, i) => ({
+        id,
+        name: nodeCols.name[i],
+        type: nodeCols.type[i],
+        group: nodeCols.group[i]
+    }));
+    const links = linkCols.source.map((source, i) => ({
+        source,
+        target: linkCols.target[i],
+        type: linkCols.type[i]
+    }));
+
+    return { nodes, links };
+}
+
 async function loadKnowledgeGraph() {
     const graphContainer = document.getElementById('kg-graph');
     const visibleCounter = document.getElementById('kg-visible-nodes');
@@ -616,8 +668,8 @@ async function loadKnowledgeGraph() {
         graphContainer.innerHTML = '<div style="display: flex; align-items: center; justify-content: center; height: 100%;"><div class="spinner"></div><span style="margin-left: 10px; color: var(--text-secondary);">Loading graph...</span></div>';
 
         console.log('Fetching knowledge graph...');
-        const response = await fetch(`${CONFIG.apiUrl}/query/knowledge-graph?max_nodes=150`);
-        kgState.graphData = await response.json();
+        const response = await fetch(`${CONFIG.apiUrl}/query/knowledge-graph?max_nodes=150&format=soa`);
+        kgState.graphData = graphFromSoa(await response.json());
 
         console.log('Graph data received:', kgState.graphData.nodes?.length || 0, 'nodes,', kgState.graphData.links?.length || 0, 'links');
 
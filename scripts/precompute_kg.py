@@ -0,0 +1,32 @@
+"""
+Precompute the knowledge graph artifact from the vector store.
+
+Run once after repopulate_db.py. The graph is pickled under ./data/kg_cache,
+keyed by a hash of the stored document IDs, so the API, run_evaluation.py
+and test_backend.py load it instead of rebuilding.
+
+One-time setup: install the project with `pip install -e .` so the `src`
+package is importable.
+"""
+import logging
+
+from src.vectorstore.store import VectorStore
+from src.knowledge_graph.build import ensure_kg_built
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def precompute_kg():
+    logger.info("Loading Vector Store...")
+    vs = VectorStore(persist_directory="./data/vector_db")
+    
+    if vs.count() == 0:
+        logger.error("Vector Store is empty! Run repopulate_db.py first.")
+        return
+    
+    kg = ensure_kg_built(vs)
+    stats = kg.get_stats()
+    logger.info(f"KG ready: {stats['total_entities']} entities, {stats['total_relationships']} relationships")
+
+if __name__ == "__main__":
+    precompute_kg()
@@ -1,11 +1,19 @@
+"""
+Populate the vector store from the generated e-commerce product data.
+
+Products get a stable ID from their name and brand, so re-runs only embed
+products that are not stored yet. Pass --fresh to wipe the store first.
+
+One-time setup: install the project with `pip install -e .` so the `src`
+package is importable.
+"""
+import argparse
+import hashlib
 import shutil
 from pathlib import Path
 import logging
-import sys
 import os
-
-# Add project root to path
-sys.path.append(os.getcwd())
+from concurrent.futures import ThreadPoolExecutor
 
 from src.data.ecommerce_data import get_all_products_as_documents
 from src.vectorstore.store import VectorStore
@@ -13,31 +21,81 @@ from src.vectorstore.store import VectorStore
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def repopulate_db():
-    # 1. Clear existing DB
+# Documents embedded per add_documents() call
+BATCH_SIZE = 200
+
+def product_id(metadata):
+    """Stable document ID for a product, derived from its name and brand."""
+    name = metadata.get("title") or metadata.get("name", "")
+    key = f"{name}|{metadata.get('brand', '')}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+def repopulate_db(fresh=False):
+    # 1. Clear existing DB (only when asked to)
     db_path = Path("./data/vector_db")
-    if db_path.exists():
+    if fresh and db_path.exists():
         logger.warning(f"Removing existing vector DB at {db_path}")
         shutil.rmtree(db_path)
     
-    # 2. Initialize new internal DB
-    logger.info("Initializing new Vector Store...")
+    # 2. Open the Vector Store
+    logger.info("Opening Vector Store...")
     vs = VectorStore(persist_directory="./data/vector_db")
     
     # 3. Generate Data
     logger.info("Generating 4000+ products with STRICT BRAND LOGIC...")
     docs = get_all_products_as_documents(4000)
     
-    # 4. Ingest
-    logger.info(f"Ingesting {len(docs)} documents into Vector Store...")
+    # 4. Keep only products that are not stored yet
+    seen = set(vs.get_all_ids())
+    contents, metadatas, ids = [], [], []
+    for d in docs:
+        doc_id = product_id(d["metadata"])
+        if doc_id in seen:
+            continue
+        seen.add(doc_id)
+        contents.append(d["content"])
+        metadatas.append(d["metadata"])
+        ids.append(doc_id)
+    
+    if not contents:
+        logger.info(f"All {len(docs)} products already stored. Nothing to ingest.")
+        return
+    
+    # 5. Ingest
+    logger.info(f"Ingesting {len(contents)} new documents ({len(docs) - len(contents)} already stored)...")
     
-    contents = [d["content"] for d in docs]
-    metadatas = [d["metadata"] for d in docs]
+    # Embed batches concurrently, then add them in order from this thread so
+    # rows keep the input order. persist=False skips the per-batch save; one
+    # persist() at the end appends all new embedding rows and JSONL records
+    total = len(contents)
+    batches = [
+        (start, min(start + BATCH_SIZE, total))
+        for start in range(0, total, BATCH_SIZE)
+    ]
+    embedder = vs.embedding_model
+    embedder.model  # Load once before the workers race to lazy-load it
     
-    vs.add_documents(contents, metadatas=metadatas)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [
+            executor.submit(embedder.embed_texts, contents[start:end], show_progress=False)
+            for start, end in batches
+        ]
+        for (start, end), future in zip(batches, futures):
+            vs.add_documents(
+                contents[start:end],
+                metadatas=metadatas[start:end],
+                ids=ids[start:end],
+                embeddings=future.result(),
+                persist=False
+            )
+            logger.info(f"Ingested {end}/{total} documents")
+    vs.persist()
     
-    logger.info("Database repopulation COMPLETE.")
+    logger.info("Database repopulation COMPLETE. Run precompute_kg.py to build the knowledge graph.")
     logger.info(f"Total documents: {vs.count()}")
 
 if __name__ == "__main__":
-    repopulate_db()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fresh", action="store_true", help="Delete the existing vector DB first")
+    args = parser.parse_args()
+    repopulate_db(fresh=args.fresh)
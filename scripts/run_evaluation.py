@@ -1,53 +1,35 @@
-import os
-import sys
-# Add project root to sys.path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+"""
+Run the full ablation study (vector-only vs graph-only vs hybrid).
 
+One-time setup: install the project with `pip install -e .` so the `src`
+package is importable.
+"""
+import os
 import logging
 import asyncio
 from dotenv import load_dotenv
+from config import dotenv_file
 from src.vectorstore.store import VectorStore
 from src.rag.generator import LLMGenerator
 from src.rag.chain import RAGChain
-from src.evaluation.ablation import run_ablation_study
-from src.knowledge_graph.graph import get_knowledge_graph, reset_knowledge_graph
+from src.evaluation.ablation import arun_ablation_study
+from src.knowledge_graph.build import ensure_kg_built
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def build_kg_from_vs(vs):
-    """Rebuilds KG from vector store documents."""
-    logger.info("Rebuilding Knowledge Graph...")
-    kg = get_knowledge_graph()
-    reset_knowledge_graph()
-    kg = get_knowledge_graph()
-    
-    all_docs = vs.get_all_documents()
-    products = []
-    
-    for doc in all_docs:
-        metadata = doc.get("metadata", {})
-        name = metadata.get("title") or metadata.get("name")
-        if name and metadata.get("brand"):
-            products.append({
-                "name": name,
-                "brand": metadata.get("brand"),
-                "category": metadata.get("category", ""),
-                "price": metadata.get("price", 0),
-                "rating": metadata.get("rating"),
-                "reviews_count": metadata.get("reviews_count"),
-                "description": metadata.get("description", ""),
-                "features": metadata.get("features", [])
-            })
-            
-    kg.build_from_products(products)
+    """Builds the KG from vector store documents, reusing a cached build."""
+    logger.info("Loading Knowledge Graph...")
+    kg = ensure_kg_built(vs)
     stats = kg.get_stats()
     logger.info(f"KG Built: {stats}")
 
 def main():
     print("--- STARTING FULL EVALUATION ---")
-    load_dotenv()
+    if env_file := dotenv_file():
+        load_dotenv(env_file)
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         print("Error: GOOGLE_API_KEY not found.")
@@ -65,11 +47,11 @@ def main():
     
     # 4. Run Study
     print("Running Ablation Study... This may take 5-10 minutes.")
-    results = run_ablation_study(
+    results = asyncio.run(arun_ablation_study(
         rag_chain=chain, 
         llm_generator=gen,
         output_dir="./data/evaluation_results"
-    )
+    ))
     
     print("\n" + "="*50)
     print("EVALUATION REPORT")
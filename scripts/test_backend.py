@@ -1,22 +1,27 @@
-import sys
+"""
+Backend validation: load the vector store, build the knowledge graph and
+run a few hybrid queries.
+
+One-time setup: install the project with `pip install -e .` so the `src`
+package is importable.
+"""
 import os
 import logging
 
-# Add project root to path
-sys.path.append(os.getcwd())
-
 from src.rag.chain import RAGChain
 from src.vectorstore.store import VectorStore
 from src.rag.generator import LLMGenerator
-from src.knowledge_graph.graph import get_knowledge_graph, reset_knowledge_graph
+from src.knowledge_graph.build import ensure_kg_built
 from dotenv import load_dotenv
+from config import dotenv_file
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def test_backend():
     print("--- BACKEND VALIDATION TEST ---")
-    load_dotenv()
+    if env_file := dotenv_file():
+        load_dotenv(env_file)
     
     # 1. Load Vector Store
     logger.info("Loading Vector Store...")
@@ -30,28 +35,7 @@ def test_backend():
 
     # 2. Rebuild Knowledge Graph (Simulating main.py startup)
     logger.info("Building Knowledge Graph from Vector Store...")
-    kg = get_knowledge_graph()
-    reset_knowledge_graph()
-    kg = get_knowledge_graph()
-    
-    all_docs = vs.get_all_documents()
-    products = []
-    for doc in all_docs:
-        metadata = doc.get("metadata", {})
-        name = metadata.get("title") or metadata.get("name")
-        if name and metadata.get("brand"):
-            products.append({
-                "name": name,
-                "brand": metadata.get("brand"),
-                "category": metadata.get("category", ""),
-                "price": metadata.get("price", 0),
-                "rating": metadata.get("rating"),
-                "reviews_count": metadata.get("reviews_count"),
-                "description": metadata.get("description", ""),
-                "features": metadata.get("features", [])
-            })
-            
-    kg.build_from_products(products)
+    kg = ensure_kg_built(vs)
     stats = kg.get_stats()
     print(f"KG Stats: {stats['total_entities']} entities, {stats['total_relationships']} rels")
     
@@ -4,26 +4,32 @@ FastAPI Application - Main entry point.
 GenAI RAG Intelligent Q&A System
 Using Google Gemini (FREE tier)
 """
+import asyncio
 import logging
 import os
+import threading
 from contextlib import asynccontextmanager
-from typing import Optional
+from functools import wraps
+from typing import Callable, TypeVar
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse
 from pathlib import Path
 from dotenv import load_dotenv
 
+from config import dotenv_file
 from .models import HealthResponse
 from .routes import ingest, query, evaluation
 from ..vectorstore import VectorStore, EmbeddingModel
+from ..vectorstore.embeddings import EMBED_THREADS
 from ..rag import RAGChain, LLMGenerator
-from ..knowledge_graph import get_knowledge_graph
+from ..knowledge_graph import KnowledgeGraph, get_knowledge_graph, ensure_kg_built
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (skipped when injected by the container)
+if env_file := dotenv_file():
+    load_dotenv(env_file)
 
 # Configure logging
 logging.basicConfig(
@@ -32,83 +38,115 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global RAG chain instance
-rag_chain: Optional[RAGChain] = None
+# Components are created on first use and cached, so the server can answer
+# /health and serve the frontend before the LLM client and graph are ready.
 
+T = TypeVar("T")
 
-def initialize_rag():
-    """Initialize the RAG chain with Gemini LLM."""
-    global rag_chain
+
+def _singleton(create: Callable[[], T]) -> Callable[[], T]:
+    """
+    Create a component on the first call and return it from then on.
+    
+    Sync dependencies run in FastAPI's threadpool, so concurrent first
+    requests can call a getter at the same time. Creation is
+    double-checked under a lock, so it runs at most once. A creation that
+    raises is not remembered, and the next call retries it.
+    """
+    lock = threading.Lock()
+    instance = None
+    created = False
+    
+    @wraps(create)
+    def get() -> T:
+        nonlocal instance, created
+        if not created:
+            with lock:
+                if not created:
+                    instance = create()
+                    created = True
+        return instance
     
+    get.is_created = lambda: created
+    return get
+
+
+@_singleton
+def get_embedder() -> EmbeddingModel:
+    """Get the embedding model (FREE - local HuggingFace, weights load lazily)."""
+    return EmbeddingModel(
+        model_name=os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+        use_onnx=os.getenv("EMBEDDING_USE_ONNX", "0") == "1",
+        num_threads=int(os.getenv("RAG_EMBED_THREADS", str(EMBED_THREADS))),
+        fp16=os.getenv("EMBEDDING_FP16", "0") == "1"
+    )
+
+
+@_singleton
+def get_vector_store() -> VectorStore:
+    """Get the vector store (FREE - local storage)."""
+    return VectorStore(
+        collection_name="documents",
+        persist_directory=os.getenv("CHROMA_PERSIST_DIR", "./data/vector_db"),
+        embedding_model=get_embedder()
+    )
+
+
+@_singleton
+def get_generator() -> LLMGenerator:
+    """Get the Gemini LLM generator."""
+    google_api_key = os.getenv("GOOGLE_API_KEY", "")
+    
+    if not google_api_key:
+        raise ValueError("GOOGLE_API_KEY not set in .env file!")
+    
+    # Answers are always reused for exact repeats; matching near-duplicate
+    # questions by embedding is opt-in
+    semantic_cache = os.getenv("ANSWER_CACHE_SEMANTIC", "0") == "1"
+    generator = LLMGenerator(
+        api_key=google_api_key,
+        model_name=os.getenv("GEMINI_MODEL", "gemini-2.0-flash"),
+        embedding_model=get_embedder() if semantic_cache else None
+    )
+    logger.info("Using Gemini LLM (gemini-2.0-flash)")
+    return generator
+
+
+@_singleton
+def _build_knowledge_graph() -> None:
+    """Build the Knowledge Graph from existing documents (once it succeeds)."""
+    ensure_kg_built(get_vector_store())
+
+
+def get_kg() -> KnowledgeGraph:
+    """Get the knowledge graph, building it from stored documents on first use."""
     try:
-        # Get API key
-        google_api_key = os.getenv("GOOGLE_API_KEY", "")
-        
-        if not google_api_key:
-            raise ValueError("GOOGLE_API_KEY not set in .env file!")
-        
-        # Initialize embedding model (FREE - local HuggingFace)
-        embedding_model = EmbeddingModel(
-            model_name=os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
-        )
-        
-        # Initialize vector store (FREE - local storage)
-        vector_store = VectorStore(
-            collection_name="documents",
-            persist_directory=os.getenv("CHROMA_PERSIST_DIR", "./data/vector_db"),
-            embedding_model=embedding_model
-        )
-        
-        # Initialize Gemini LLM generator
-        generator = LLMGenerator(
-            api_key=google_api_key,
-            model_name=os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
-        )
-        logger.info("Using Gemini LLM (gemini-2.0-flash)")
+        _build_knowledge_graph()
+    except Exception as kg_error:
+        # Serve the graph as it is; the next call retries the build
+        logger.warning(f"Could not build Knowledge Graph: {kg_error}")
+    # Looked up on every call: ingest can replace the global graph
+    return get_knowledge_graph()
+
+
+@_singleton
+def get_rag_chain() -> RAGChain:
+    """Get the RAG chain with Gemini LLM."""
+    try:
+        generator = get_generator()
+        get_kg()
         
         # Create RAG chain with lower threshold
         rag_chain = RAGChain(
-            vector_store=vector_store,
+            vector_store=get_vector_store(),
             generator=generator,
             top_k=5,
-            score_threshold=0.1  # Lowered from 0.3
+            score_threshold=0.1,  # Lowered from 0.3
+            hybrid_search=os.getenv("RAG_HYBRID_SEARCH", "1") != "0",
+            cache_context=os.getenv("RAG_CONTEXT_CACHE", "0") == "1"
         )
         logger.info("RAG chain initialized successfully")
-        
-        # Build Knowledge Graph from existing documents
-        try:
-            doc_count = vector_store.count()
-            if doc_count > 0:
-                logger.info(f"Building Knowledge Graph from {doc_count} documents...")
-                kg = get_knowledge_graph()
-                
-                # Extract product data from stored documents
-                all_docs = vector_store.get_all_documents()
-                products = []
-                for doc in all_docs:
-                    metadata = doc.get("metadata", {})
-                    # Check for 'title' (product documents) or 'name'
-                    name = metadata.get("title") or metadata.get("name")
-                    if name and metadata.get("brand"):  # Only process product documents
-                        products.append({
-                            "name": name,
-                            "brand": metadata.get("brand"),
-                            "category": metadata.get("category", ""),
-                            "price": metadata.get("price", 0),
-                            "rating": metadata.get("rating"),
-                            "reviews_count": metadata.get("reviews_count"),
-                            "description": metadata.get("description", ""),
-                            "features": metadata.get("features", "").split(", ") if isinstance(metadata.get("features"), str) else metadata.get("features", [])
-                        })
-                
-                if products:
-                    kg.build_from_products(products)
-                    stats = kg.get_stats()
-                    logger.info(f"Knowledge Graph built: {stats['total_entities']} entities, {stats['total_relationships']} relationships")
-                else:
-                    logger.info("No product documents found for Knowledge Graph")
-        except Exception as kg_error:
-            logger.warning(f"Could not build Knowledge Graph on startup: {kg_error}")
+        return rag_chain
             
     except Exception as e:
         logger.error(f"Error initializing RAG chain: {e}")
@@ -119,9 +157,13 @@ def initialize_rag():
 async def lifespan(app: FastAPI):
     """Application lifespan - startup and shutdown."""
     logger.info("Starting GenAI RAG Q&A System...")
-    initialize_rag()
+    await asyncio.to_thread(get_vector_store)
     yield
     logger.info("Shutting down...")
+    if get_vector_store.is_created():
+        await asyncio.to_thread(get_vector_store().persist)
+    if get_generator.is_created():
+        await get_generator().aclose()
 
 
 # Create FastAPI app
@@ -141,6 +183,7 @@ app = FastAPI(
     - 🤖 **LLM**: Google Gemini (FREE tier)
     """,
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -163,39 +206,23 @@ frontend_path = Path(__file__).resolve().parent.parent.parent / "frontend"
 logger.info(f"Frontend path: {frontend_path}")
 
 
-@app.get("/", include_in_schema=False)
-async def root():
-    """Serve the frontend."""
-    index_path = frontend_path / "index.html"
-    if index_path.exists():
-        return FileResponse(str(index_path), media_type="text/html")
-    return {"message": "GenAI RAG Q&A System API", "docs": "/docs"}
-
-
-@app.get("/styles.css", include_in_schema=False)
-async def get_styles():
-    """Serve CSS file."""
-    css_path = frontend_path / "styles.css"
-    if css_path.exists():
-        return FileResponse(str(css_path), media_type="text/css")
-    return {"error": "CSS not found"}
-
-
-@app.get("/app.js", include_in_schema=False)
-async def get_js():
-    """Serve JS file."""
-    js_path = frontend_path / "app.js"
-    if js_path.exists():
-        return FileResponse(str(js_path), media_type="application/javascript")
-    return {"error": "JS not found"}
-
-
 @app.get("/health", response_model=HealthResponse, tags=["System"])
 async def health_check():
     """Health check endpoint."""
     return HealthResponse(status="healthy", version="1.0.0")
 
 
+# Serve the frontend (index.html, styles.css, app.js) as static files.
+# Mounted last so the API routes above take precedence.
+if frontend_path.is_dir():
+    app.mount("/", StaticFiles(directory=str(frontend_path), html=True), name="frontend")
+else:
+    @app.get("/", include_in_schema=False)
+    async def root():
+        """Frontend not bundled - point to the API docs."""
+        return {"message": "GenAI RAG Q&A System API", "docs": "/docs"}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("src.api.main:app", host="0.0.0.0", port=8000, reload=True)
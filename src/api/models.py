@@ -9,7 +9,7 @@ from pydantic import BaseModel, Field, HttpUrl
 
 class URLIngestRequest(BaseModel):
     """Request to ingest content from URLs."""
-    urls: List[str] = Field(..., description="List of URLs to scrape")
+    urls: List[HttpUrl] = Field(..., description="List of URLs to scrape")
     
     class Config:
         json_schema_extra = {
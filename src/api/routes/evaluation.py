@@ -2,10 +2,16 @@
 Evaluation API Routes - Endpoints for running ablation studies and benchmarks.
 """
 
+import asyncio
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from pydantic import BaseModel
+import time
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
+
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
 from ...evaluation import (
     BENCHMARK_QUESTIONS,
@@ -14,25 +20,41 @@ from ...evaluation import (
     AblationStudy,
     AblationStudyConfig,
 )
-from ...evaluation.benchmark import QuestionCategory, Difficulty
+from ...evaluation.ablation import DEFAULT_MAX_WORKERS
+from ...evaluation.benchmark import CATEGORY_BY_VALUE, DIFFICULTY_BY_VALUE, QuestionCategory, Difficulty
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/evaluation", tags=["Evaluation"])
 
-# Store for ongoing/completed evaluations
-evaluation_state = {
-    "running": False,
-    "progress": 0,
-    "total": 0,
-    "current_question": "",
-    "results": None
-}
+@dataclass(slots=True)
+class EvalState:
+    """Progress and results of the ongoing/last evaluation."""
+    running: bool = False
+    progress: int = 0
+    total: int = 0
+    current_question: str = ""
+    results: Optional[dict] = None
+    summary: Optional[dict] = None  # cached /results/summary for results
+
+
+# Store for ongoing/completed evaluations. Async code takes _state_lock for
+# multi-field reads and writes; the study's progress callback runs on the
+# event loop between awaits, so its updates never interleave with those.
+evaluation_state = EvalState()
+_state_lock = asyncio.Lock()
+
+# Seconds between /stream progress events
+PROGRESS_STREAM_INTERVAL = 0.5
 
 
 # ============================================================================
 # Request/Response Models
 # ============================================================================
 
+# Endpoints serving internally built data declare their schema through
+# `responses=` rather than `response_model=`, so FastAPI documents it
+# without re-validating every response.
+
 class BenchmarkStatsResponse(BaseModel):
     """Statistics about the benchmark dataset."""
     total_questions: int
@@ -42,6 +64,18 @@ class BenchmarkStatsResponse(BaseModel):
     graph_optional: int
 
 
+# The benchmark dataset is static, so its statistics are validated and
+# dumped once
+_BENCHMARK_STATS = BenchmarkStatsResponse(**get_statistics()).model_dump()
+
+# Unfiltered /benchmark/questions payload, encoded once (this also warms
+# each question's cached to_dict() used by filtered requests)
+_ALL_QUESTIONS_JSON = orjson.dumps({
+    "count": len(BENCHMARK_QUESTIONS),
+    "questions": [q.to_dict() for q in BENCHMARK_QUESTIONS]
+})
+
+
 class QuestionResponse(BaseModel):
     """A single benchmark question."""
     id: str
@@ -60,6 +94,7 @@ class RunEvaluationRequest(BaseModel):
     category: Optional[str] = None
     difficulty: Optional[str] = None
     limit: Optional[int] = None
+    concurrency: Optional[int] = Field(default=None, ge=1, le=16)
 
 
 class EvaluationProgressResponse(BaseModel):
@@ -84,29 +119,125 @@ class SingleEvaluationRequest(BaseModel):
 
 def get_rag_chain():
     """Get RAG chain instance."""
-    from ..main import rag_chain
-    if rag_chain is None:
+    from ..main import get_rag_chain as load_rag_chain
+    try:
+        return load_rag_chain()
+    except Exception:
         raise HTTPException(status_code=503, detail="RAG chain not initialized")
-    return rag_chain
 
 
 def get_llm_generator():
     """Get LLM generator instance."""
-    from ..main import rag_chain
-    if rag_chain is None:
+    from ..main import get_generator
+    try:
+        return get_generator()
+    except Exception:
         raise HTTPException(status_code=503, detail="RAG chain not initialized")
-    return rag_chain.generator
+
+
+def _parse_filters(
+    category: Optional[str],
+    difficulty: Optional[str]
+) -> Tuple[Optional[QuestionCategory], Optional[Difficulty]]:
+    """Parse category/difficulty filter values, raising 400 on unknown ones."""
+    cat_enum = CATEGORY_BY_VALUE.get(category) if category else None
+    if category and cat_enum is None:
+        raise HTTPException(400, f"Invalid category: {category}")
+    
+    diff_enum = DIFFICULTY_BY_VALUE.get(difficulty) if difficulty else None
+    if difficulty and diff_enum is None:
+        raise HTTPException(400, f"Invalid difficulty: {difficulty}")
+    
+    return cat_enum, diff_enum
+
+
+# ============================================================================
+# Background Study
+# ============================================================================
+
+def _progress_callback(current, total, message):
+    """Record AblationStudy progress in evaluation_state."""
+    evaluation_state.progress = current
+    evaluation_state.total = total
+    evaluation_state.current_question = message
+
+
+async def _run_study(rag, generator, config: AblationStudyConfig):
+    """Run an ablation study and store its results in evaluation_state."""
+    try:
+        study = AblationStudy(rag, generator)
+        results = await study.arun(config, progress_callback=_progress_callback)
+        outcome = results.to_dict()
+    except Exception as e:
+        logger.error(f"Evaluation failed: {e}")
+        outcome = {"error": str(e)}
+    
+    async with _state_lock:
+        evaluation_state.results = outcome
+        evaluation_state.summary = None
+        evaluation_state.running = False
+
+
+async def _state_snapshot() -> EvalState:
+    """Consistent copy of evaluation_state."""
+    async with _state_lock:
+        return replace(evaluation_state)
+
+
+async def _progress_payload() -> dict:
+    """Snapshot of evaluation progress."""
+    state = await _state_snapshot()
+    total = state.total or 1
+    return {
+        "running": state.running,
+        "progress": state.progress,
+        "total": total,
+        "current_question": state.current_question,
+        "percentage": (state.progress / total) * 100
+    }
+
+
+# (metric name, aggregated key, higher is better) shown in /results/summary
+SUMMARY_METRICS = [
+    ("relevance", "avg_relevance_score", True),
+    ("accuracy", "avg_accuracy_score", True),
+    ("response_time_ms", "avg_response_time_ms", False),
+    ("hallucination_rate", "hallucination_rate", False),
+    ("source_count", "avg_source_count", True),
+]
+
+
+def _build_results_summary(results: dict) -> dict:
+    """Per-metric values and best mode from a results dict."""
+    aggregated = results.get("aggregated", {})
+    by_mode = aggregated.get("by_mode", {})
+    
+    summary = {
+        "total_evaluations": aggregated.get("total_evaluations", 0),
+        "modes": list(by_mode.keys()),
+        "comparison": {}
+    }
+    
+    for metric_name, metric_key, higher_is_better in SUMMARY_METRICS:
+        values = {mode: stats.get(metric_key, 0) for mode, stats in by_mode.items()}
+        pick = max if higher_is_better else min
+        
+        summary["comparison"][metric_name] = {
+            "values": {mode: round(value, 3) for mode, value in values.items()},
+            "best_mode": pick(values, key=values.get) if values else None
+        }
+    
+    return summary
 
 
 # ============================================================================
 # Endpoints
 # ============================================================================
 
-@router.get("/benchmark/stats", response_model=BenchmarkStatsResponse)
+@router.get("/benchmark/stats", responses={200: {"model": BenchmarkStatsResponse}})
 async def get_benchmark_stats():
     """Get statistics about the benchmark dataset."""
-    stats = get_statistics()
-    return BenchmarkStatsResponse(**stats)
+    return ORJSONResponse(content=_BENCHMARK_STATS)
 
 
 @router.get("/benchmark/questions")
@@ -117,21 +248,10 @@ async def list_benchmark_questions(
     limit: Optional[int] = None
 ):
     """List benchmark questions with optional filters."""
-    # Parse category enum
-    cat_enum = None
-    if category:
-        try:
-            cat_enum = QuestionCategory(category)
-        except ValueError:
-            raise HTTPException(400, f"Invalid category: {category}")
-    
-    # Parse difficulty enum
-    diff_enum = None
-    if difficulty:
-        try:
-            diff_enum = Difficulty(difficulty)
-        except ValueError:
-            raise HTTPException(400, f"Invalid difficulty: {difficulty}")
+    if not (category or difficulty or limit) and requires_graph is None:
+        return Response(content=_ALL_QUESTIONS_JSON, media_type="application/json")
+    
+    cat_enum, diff_enum = _parse_filters(category, difficulty)
     
     questions = get_benchmark_questions(
         category=cat_enum,
@@ -157,25 +277,11 @@ async def run_evaluation(
     Start a full ablation study evaluation.
     This runs in the background and returns immediately.
     """
-    global evaluation_state
-    
-    if evaluation_state["running"]:
+    if evaluation_state.running:
         raise HTTPException(400, "Evaluation already in progress")
     
     # Filter questions
-    cat_enum = None
-    if request.category:
-        try:
-            cat_enum = QuestionCategory(request.category)
-        except ValueError:
-            raise HTTPException(400, f"Invalid category: {request.category}")
-    
-    diff_enum = None
-    if request.difficulty:
-        try:
-            diff_enum = Difficulty(request.difficulty)
-        except ValueError:
-            raise HTTPException(400, f"Invalid difficulty: {request.difficulty}")
+    cat_enum, diff_enum = _parse_filters(request.category, request.difficulty)
     
     questions = get_benchmark_questions(
         category=cat_enum,
@@ -186,70 +292,71 @@ async def run_evaluation(
     if not questions:
         raise HTTPException(400, "No questions match the criteria")
     
-    # Define progress callback
-    def progress_callback(current, total, message):
-        global evaluation_state
-        evaluation_state["progress"] = current
-        evaluation_state["total"] = total
-        evaluation_state["current_question"] = message
-    
-    # Define background task
-    async def run_study():
-        global evaluation_state
-        evaluation_state["running"] = True
-        evaluation_state["progress"] = 0
-        evaluation_state["total"] = len(questions) * len(request.modes)
-        
-        try:
-            study = AblationStudy(rag, generator)
-            config = AblationStudyConfig(
-                modes=request.modes,
-                questions=questions,
-                output_dir="./data/evaluation_results"
-            )
-            results = study.run(config, progress_callback=progress_callback)
-            evaluation_state["results"] = results.to_dict()
-        except Exception as e:
-            logger.error(f"Evaluation failed: {e}")
-            evaluation_state["results"] = {"error": str(e)}
-        finally:
-            evaluation_state["running"] = False
-    
-    # Start background task
-    background_tasks.add_task(run_study)
+    try:
+        config = AblationStudyConfig(
+            modes=request.modes,
+            questions=questions,
+            output_dir="./data/evaluation_results",
+            max_workers=request.concurrency or DEFAULT_MAX_WORKERS
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    
+    async with _state_lock:
+        if evaluation_state.running:
+            raise HTTPException(400, "Evaluation already in progress")
+        evaluation_state.running = True
+        evaluation_state.progress = 0
+        evaluation_state.total = len(questions) * len(config.modes)
+        evaluation_state.current_question = ""
+    
+    # Question × mode pairs run concurrently on the event loop; blocking
+    # work inside the study is pushed to threads. Progress updates happen
+    # between awaits on the loop thread.
+    background_tasks.add_task(_run_study, rag, generator, config)
     
     return {
         "status": "started",
         "questions": len(questions),
-        "modes": request.modes,
-        "total_evaluations": len(questions) * len(request.modes)
+        "modes": config.modes,
+        "concurrency": config.max_workers,
+        "total_evaluations": len(questions) * len(config.modes)
     }
 
 
-@router.get("/progress", response_model=EvaluationProgressResponse)
+@router.get("/progress", responses={200: {"model": EvaluationProgressResponse}})
 async def get_evaluation_progress():
     """Get the progress of an ongoing evaluation."""
-    total = evaluation_state["total"] or 1
-    return EvaluationProgressResponse(
-        running=evaluation_state["running"],
-        progress=evaluation_state["progress"],
-        total=total,
-        current_question=evaluation_state["current_question"],
-        percentage=(evaluation_state["progress"] / total) * 100
-    )
+    return ORJSONResponse(content=await _progress_payload())
+
+
+@router.get("/stream")
+async def stream_evaluation_progress():
+    """Stream evaluation progress as Server-Sent Events until it finishes."""
+    async def event_stream():
+        while True:
+            payload = await _progress_payload()
+            yield b"data: " + orjson.dumps(payload) + b"\n\n"
+            if not payload["running"]:
+                break
+            await asyncio.sleep(PROGRESS_STREAM_INTERVAL)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 
 @router.get("/results")
 async def get_evaluation_results():
     """Get the results of the last completed evaluation."""
-    if evaluation_state["running"]:
+    state = await _state_snapshot()
+    
+    if state.running:
         return {
             "status": "running",
-            "progress": evaluation_state["progress"],
-            "total": evaluation_state["total"]
+            "progress": state.progress,
+            "total": state.total
         }
     
-    if evaluation_state["results"] is None:
+    if state.results is None:
         return {
             "status": "no_results",
             "message": "No evaluation has been run yet"
@@ -257,61 +364,22 @@ async def get_evaluation_results():
     
     return {
         "status": "complete",
-        "results": evaluation_state["results"]
+        "results": state.results
     }
 
 
 @router.get("/results/summary")
 async def get_results_summary():
     """Get a summary of the evaluation results for display."""
-    if evaluation_state["results"] is None:
-        raise HTTPException(404, "No evaluation results available")
-    
-    results = evaluation_state["results"]
-    
-    # Extract key metrics
-    aggregated = results.get("aggregated", {})
-    by_mode = aggregated.get("by_mode", {})
-    
-    summary = {
-        "total_evaluations": aggregated.get("total_evaluations", 0),
-        "modes": list(by_mode.keys()),
-        "comparison": {}
-    }
-    
-    metrics = [
-        ("relevance", "avg_relevance_score", True),
-        ("accuracy", "avg_accuracy_score", True),
-        ("response_time_ms", "avg_response_time_ms", False),
-        ("hallucination_rate", "hallucination_rate", False),
-        ("source_count", "avg_source_count", True),
-    ]
-    
-    for metric_name, metric_key, higher_is_better in metrics:
-        metric_data = {}
-        best_mode = None
-        best_value = None
+    async with _state_lock:
+        if evaluation_state.results is None:
+            raise HTTPException(404, "No evaluation results available")
         
-        for mode in by_mode:
-            value = by_mode[mode].get(metric_key, 0)
-            metric_data[mode] = round(value, 3)
-            
-            if best_value is None:
-                best_value = value
-                best_mode = mode
-            elif higher_is_better and value > best_value:
-                best_value = value
-                best_mode = mode
-            elif not higher_is_better and value < best_value:
-                best_value = value
-                best_mode = mode
+        # Results only change when a study finishes, which clears the cache
+        if evaluation_state.summary is None:
+            evaluation_state.summary = _build_results_summary(evaluation_state.results)
         
-        summary["comparison"][metric_name] = {
-            "values": metric_data,
-            "best_mode": best_mode
-        }
-    
-    return summary
+        return evaluation_state.summary
 
 
 @router.post("/single")
@@ -324,16 +392,15 @@ async def evaluate_single_question(
     Evaluate a single question across all modes.
     Useful for quick testing and demonstration.
     """
-    import time
     from ...evaluation.evaluator import Evaluator
     
     evaluator = Evaluator(generator)
     results = {}
     
     for mode in request.modes:
-        start = time.time()
+        start = time.perf_counter_ns()
         response = rag.query(request.question, retrieval_mode=mode)
-        elapsed = (time.time() - start) * 1000
+        elapsed = (time.perf_counter_ns() - start) / 1e6
         
         # Basic evaluation if ground truth provided
         if request.ground_truth:
@@ -376,13 +443,13 @@ async def evaluate_single_question(
 @router.get("/report")
 async def get_markdown_report():
     """Generate a markdown report of the evaluation results."""
-    if evaluation_state["results"] is None:
+    if evaluation_state.results is None:
         raise HTTPException(404, "No evaluation results available")
     
     from ...evaluation.ablation import AblationStudyResults
     
     # Reconstruct results object
-    results_dict = evaluation_state["results"]
+    results_dict = evaluation_state.results
     
     # Generate markdown
     report = []
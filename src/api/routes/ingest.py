@@ -6,9 +6,12 @@ Supports:
 - Text input
 - File upload (PDF, DOCX, TXT)
 """
+import asyncio
 import logging
-from typing import List
+import tempfile
+from typing import Any, BinaryIO, Dict, List, Optional
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
+from fastapi.concurrency import run_in_threadpool
 
 from ..models import URLIngestRequest, TextIngestRequest, IngestResponse
 from ...data import WebScraper, TextPreprocessor, TextChunker
@@ -17,13 +20,137 @@ from ...rag import RAGChain
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/ingest", tags=["Ingestion"])
 
+# Uploads are buffered in memory up to this size, then spilled to disk
+UPLOAD_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+UPLOAD_READ_CHUNK_SIZE = 64 * 1024
+
+# Maximum URLs scraped at once by /ingest/url
+MAX_CONCURRENT_SCRAPES = 10
+
+# Minimum length of cleaned text accepted by /ingest/text
+MIN_TEXT_LENGTH = 50
+
+# Shared ingestion components, built once at import and reused across requests
+_SCRAPER = WebScraper()
+_PREPROCESSOR = TextPreprocessor()
+_CHUNKER = TextChunker(chunk_size=1000, chunk_overlap=200)
+
 
 def get_rag_chain():
     """Dependency to get RAG chain instance."""
-    from ..main import rag_chain
-    if rag_chain is None:
+    from ..main import get_rag_chain as load_rag_chain
+    try:
+        return load_rag_chain()
+    except Exception:
         raise HTTPException(status_code=503, detail="RAG chain not initialized. Check your API key.")
-    return rag_chain
+
+
+def _extract_pdf_text(stream: BinaryIO) -> str:
+    """
+    Extract text from a PDF, preferring PyMuPDF's C extractor over pypdf.
+    
+    Args:
+        stream: Seekable binary stream positioned at the start of the PDF
+        
+    Returns:
+        Page texts joined by newlines
+    """
+    try:
+        import fitz
+    except ImportError:
+        from pypdf import PdfReader
+        reader = PdfReader(stream)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    
+    with fitz.open(stream=stream.read(), filetype="pdf") as doc:
+        return "\n".join(page.get_text("text") for page in doc)
+
+
+def _extract_text(ext: str, stream: BinaryIO) -> str:
+    """
+    Extract plain text from an uploaded file.
+    
+    Args:
+        ext: File extension (txt, pdf or docx)
+        stream: Seekable binary stream positioned at the start of the file
+        
+    Returns:
+        Extracted text
+    """
+    if ext == "txt":
+        return stream.read().decode("utf-8", errors="ignore")
+    if ext == "pdf":
+        return _extract_pdf_text(stream)
+    if ext == "docx":
+        from docx import Document
+        doc = Document(stream)
+        return "\n".join(para.text for para in doc.paragraphs)
+    return ""
+
+
+async def _scrape_urls(urls: List[str]) -> List[Any]:
+    """
+    Scrape URLs concurrently, one threadpool call per URL.
+    
+    Args:
+        urls: URLs to scrape
+        
+    Returns:
+        Scraped documents, in URL order (failed URLs are skipped)
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+    
+    async def scrape_one(url: str) -> List[Any]:
+        async with semaphore:
+            return await run_in_threadpool(_SCRAPER.scrape_urls, [url])
+    
+    results = await asyncio.gather(
+        *(scrape_one(url) for url in urls),
+        return_exceptions=True
+    )
+    
+    documents = []
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Failed to scrape {url}: {result}")
+            continue
+        documents.extend(result)
+    return documents
+
+
+def _text_pipeline(text: str, source: str, min_length: int = 0) -> Optional[List[Dict[str, Any]]]:
+    """
+    Clean and chunk raw text. CPU-bound, so endpoints run it in the threadpool.
+    
+    Args:
+        text: Raw text
+        source: Source label stored on each chunk
+        min_length: Minimum cleaned length to accept
+        
+    Returns:
+        Chunk dictionaries, or None if the cleaned text is too short
+    """
+    cleaned_text = _PREPROCESSOR.clean_text(text)
+    if len(cleaned_text) < min_length:
+        return None
+    
+    chunks = _CHUNKER.chunk_text(cleaned_text, source=source)
+    return [c.to_dict() for c in chunks]
+
+
+def _documents_pipeline(documents: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Clean and chunk scraped documents. CPU-bound, so endpoints run it in the threadpool.
+    
+    Args:
+        documents: Scraped documents
+        
+    Returns:
+        Chunk dictionaries
+    """
+    cleaned_docs = _PREPROCESSOR.clean_documents([d.to_dict() for d in documents])
+    chunks = _CHUNKER.chunk_documents(cleaned_docs)
+    return [c.to_dict() for c in chunks]
 
 
 @router.post("/url", response_model=IngestResponse)
@@ -37,9 +164,8 @@ async def ingest_from_urls(
     Scrapes the provided URLs and adds the content to the knowledge base.
     """
     try:
-        # Scrape URLs
-        scraper = WebScraper()
-        documents = scraper.scrape_urls(request.urls)
+        # Scrape URLs concurrently
+        documents = await _scrape_urls([str(url) for url in request.urls])
         
         if not documents:
             return IngestResponse(
@@ -48,23 +174,17 @@ async def ingest_from_urls(
                 documents_added=0
             )
         
-        # Preprocess
-        preprocessor = TextPreprocessor()
-        cleaned_docs = preprocessor.clean_documents([d.to_dict() for d in documents])
-        
-        # Chunk
-        chunker = TextChunker(chunk_size=1000, chunk_overlap=200)
-        chunks = chunker.chunk_documents(cleaned_docs)
+        # Preprocess and chunk
+        chunk_dicts = await run_in_threadpool(_documents_pipeline, documents)
         
-        # Add to vector store
-        chunk_dicts = [c.to_dict() for c in chunks]
-        rag.vector_store.add_chunks(chunk_dicts)
+        # Add to vector store (batched embedding, off the event loop)
+        await run_in_threadpool(rag.vector_store.add_chunks, chunk_dicts)
         
         return IngestResponse(
             success=True,
             message=f"Successfully ingested {len(documents)} URLs",
             documents_added=len(documents),
-            chunks_created=len(chunks)
+            chunks_created=len(chunk_dicts)
         )
         
     except Exception as e:
@@ -83,30 +203,26 @@ async def ingest_text(
     Adds the provided text directly to the knowledge base.
     """
     try:
-        # Preprocess
-        preprocessor = TextPreprocessor()
-        cleaned_text = preprocessor.clean_text(request.text)
+        # Preprocess and chunk
+        chunk_dicts = await run_in_threadpool(
+            _text_pipeline, request.text, request.source, MIN_TEXT_LENGTH
+        )
         
-        if len(cleaned_text) < 50:
+        if chunk_dicts is None:
             return IngestResponse(
                 success=False,
-                message="Text too short after cleaning (minimum 50 characters)",
+                message=f"Text too short after cleaning (minimum {MIN_TEXT_LENGTH} characters)",
                 documents_added=0
             )
         
-        # Chunk
-        chunker = TextChunker(chunk_size=1000, chunk_overlap=200)
-        chunks = chunker.chunk_text(cleaned_text, source=request.source)
-        
-        # Add to vector store
-        chunk_dicts = [c.to_dict() for c in chunks]
-        rag.vector_store.add_chunks(chunk_dicts)
+        # Add to vector store (batched embedding, off the event loop)
+        await run_in_threadpool(rag.vector_store.add_chunks, chunk_dicts)
         
         return IngestResponse(
             success=True,
             message="Successfully ingested text",
             documents_added=1,
-            chunks_created=len(chunks)
+            chunks_created=len(chunk_dicts)
         )
         
     except Exception as e:
@@ -135,24 +251,14 @@ async def ingest_file(
                 detail=f"Unsupported file type: {ext}. Supported: txt, pdf, docx"
             )
         
-        # Read content
-        content = await file.read()
-        
-        # Extract text based on file type
-        if ext == "txt":
-            text = content.decode("utf-8", errors="ignore")
-        elif ext == "pdf":
-            from pypdf import PdfReader
-            import io
-            reader = PdfReader(io.BytesIO(content))
-            text = "\n".join(page.extract_text() or "" for page in reader.pages)
-        elif ext == "docx":
-            from docx import Document
-            import io
-            doc = Document(io.BytesIO(content))
-            text = "\n".join(para.text for para in doc.paragraphs)
-        else:
-            text = ""
+        # Stream the upload into a spooled file instead of reading it whole,
+        # then parse it off the event loop
+        with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_SIZE) as spooled:
+            while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+                spooled.write(chunk)
+            spooled.seek(0)
+            
+            text = await run_in_threadpool(_extract_text, ext, spooled)
         
         if not text.strip():
             return IngestResponse(
@@ -161,23 +267,17 @@ async def ingest_file(
                 documents_added=0
             )
         
-        # Preprocess
-        preprocessor = TextPreprocessor()
-        cleaned_text = preprocessor.clean_text(text)
-        
-        # Chunk
-        chunker = TextChunker(chunk_size=1000, chunk_overlap=200)
-        chunks = chunker.chunk_text(cleaned_text, source=filename)
+        # Preprocess and chunk
+        chunk_dicts = await run_in_threadpool(_text_pipeline, text, filename)
         
-        # Add to vector store
-        chunk_dicts = [c.to_dict() for c in chunks]
-        rag.vector_store.add_chunks(chunk_dicts)
+        # Add to vector store (batched embedding, off the event loop)
+        await run_in_threadpool(rag.vector_store.add_chunks, chunk_dicts)
         
         return IngestResponse(
             success=True,
             message=f"Successfully ingested file: {filename}",
             documents_added=1,
-            chunks_created=len(chunks)
+            chunks_created=len(chunk_dicts)
         )
         
     except HTTPException:
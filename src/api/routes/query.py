@@ -6,7 +6,11 @@ Supports:
 - Chat with conversation history
 """
 import logging
-from fastapi import APIRouter, HTTPException, Depends
+from typing import Literal
+
+import orjson
+from fastapi import APIRouter, HTTPException, Depends, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from ..models import (
     QueryRequest, QueryResponse,
@@ -19,15 +23,33 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/query", tags=["Query"])
 
 
+# Responses below are built from our own pipeline output, so they skip
+# Pydantic validation: models are created with model_construct() (or the
+# data is already a plain dict) and returned as ORJSONResponse. The schema
+# is declared through `responses=` for the OpenAPI docs only.
+
+def _source_infos(result: dict) -> list:
+    """SourceInfo models for a RAG result's sources, without validation."""
+    return [
+        SourceInfo.model_construct(
+            source=s.get("source", "Unknown"),
+            title=s.get("title", ""),
+            relevance_score=s.get("relevance_score", 0)
+        )
+        for s in result.get("sources", [])
+    ]
+
+
 def get_rag_chain():
     """Dependency to get RAG chain instance."""
-    from ..main import rag_chain
-    if rag_chain is None:
+    from ..main import get_rag_chain as load_rag_chain
+    try:
+        return load_rag_chain()
+    except Exception:
         raise HTTPException(status_code=503, detail="RAG chain not initialized. Check your API key.")
-    return rag_chain
 
 
-@router.post("", response_model=QueryResponse)
+@router.post("", responses={200: {"model": QueryResponse}})
 async def query_knowledge_base(
     request: QueryRequest,
     rag: RAGChain = Depends(get_rag_chain)
@@ -45,29 +67,44 @@ async def query_knowledge_base(
         # Process query through RAG pipeline
         result = rag.query(request.question)
         
-        # Format sources
-        sources = [
-            SourceInfo(
-                source=s.get("source", "Unknown"),
-                title=s.get("title", ""),
-                relevance_score=s.get("relevance_score", 0)
-            )
-            for s in result.get("sources", [])
-        ]
-        
-        return QueryResponse(
+        response = QueryResponse.model_construct(
             answer=result["answer"],
-            sources=sources,
+            sources=_source_infos(result),
             context_used=result.get("context_used", True),
             documents_retrieved=result.get("documents_retrieved", 0)
         )
+        return ORJSONResponse(content=response.model_dump())
         
     except Exception as e:
         logger.error(f"Error processing query: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/chat", response_model=ChatResponse)
+@router.post("/stream")
+async def stream_query(
+    request: QueryRequest,
+    rag: RAGChain = Depends(get_rag_chain)
+):
+    """
+    Query the knowledge base, streaming the answer as Server-Sent Events.
+    
+    The first event carries the sources, then one event per chunk of the
+    answer as it is generated, then a "done" event.
+    """
+    rag.retriever.top_k = request.top_k
+    
+    async def event_stream():
+        try:
+            async for event in rag.aquery_stream(request.question):
+                yield b"data: " + orjson.dumps(event) + b"\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming query: {e}")
+            yield b"data: " + orjson.dumps({"type": "error", "detail": str(e)}) + b"\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.post("/chat", responses={200: {"model": ChatResponse}})
 async def chat(
     request: ChatRequest,
     rag: RAGChain = Depends(get_rag_chain)
@@ -87,39 +124,30 @@ async def chat(
         # Process through RAG chat
         result = rag.chat(messages)
         
-        # Format sources
-        sources = [
-            SourceInfo(
-                source=s.get("source", "Unknown"),
-                title=s.get("title", ""),
-                relevance_score=s.get("relevance_score", 0)
-            )
-            for s in result.get("sources", [])
-        ]
-        
-        return ChatResponse(
+        response = ChatResponse.model_construct(
             answer=result["answer"],
-            sources=sources
+            sources=_source_infos(result)
         )
+        return ORJSONResponse(content=response.model_dump())
         
     except Exception as e:
         logger.error(f"Error in chat: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/stats", response_model=StatsResponse)
+@router.get("/stats", responses={200: {"model": StatsResponse}})
 async def get_stats(rag: RAGChain = Depends(get_rag_chain)):
     """
     Get statistics about the knowledge base.
     """
     try:
         stats = rag.get_stats()
-        return StatsResponse(
-            collection_name=stats.get("collection_name", ""),
-            document_count=stats.get("document_count", 0),
-            embedding_model=stats.get("embedding_model", ""),
-            llm_model=stats.get("llm_model", "")
-        )
+        return ORJSONResponse(content={
+            "collection_name": stats.get("collection_name", ""),
+            "document_count": stats.get("document_count", 0),
+            "embedding_model": stats.get("embedding_model", ""),
+            "llm_model": stats.get("llm_model", "")
+        })
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -128,31 +156,41 @@ async def get_stats(rag: RAGChain = Depends(get_rag_chain)):
 # ===================== KNOWLEDGE GRAPH ENDPOINTS =====================
 
 from ...knowledge_graph import KnowledgeGraph
-from ...knowledge_graph.graph import get_knowledge_graph
+
+
+def get_kg() -> KnowledgeGraph:
+    """Dependency to get the knowledge graph, built on first use."""
+    from ..main import get_kg as load_kg
+    return load_kg()
 
 
 @router.get("/knowledge-graph")
-async def get_knowledge_graph_data(max_nodes: int = 200):
+async def get_knowledge_graph_data(
+    max_nodes: int = 200,
+    format: Literal["aos", "soa"] = "aos",
+    kg: KnowledgeGraph = Depends(get_kg)
+):
     """
     Get knowledge graph data for D3.js visualization.
     
-    Returns nodes and links in D3 force-directed graph format.
+    Returns nodes and links in D3 force-directed graph format, or as
+    parallel column arrays (nodes_soa/links_soa) with format=soa.
     """
     try:
-        kg = get_knowledge_graph()
-        return kg.to_d3_format(max_nodes=max_nodes)
+        # Served as cached pre-encoded JSON, skipping per-request encoding
+        payload = kg.to_d3_json(max_nodes=max_nodes, soa=format == "soa")
+        return Response(content=payload, media_type="application/json")
     except Exception as e:
         logger.error(f"Error getting knowledge graph: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/knowledge-graph/stats")
-async def get_knowledge_graph_stats():
+async def get_knowledge_graph_stats(kg: KnowledgeGraph = Depends(get_kg)):
     """
     Get statistics about the knowledge graph.
     """
     try:
-        kg = get_knowledge_graph()
         return kg.get_stats()
     except Exception as e:
         logger.error(f"Error getting knowledge graph stats: {e}")
@@ -160,12 +198,11 @@ async def get_knowledge_graph_stats():
 
 
 @router.get("/knowledge-graph/entity/{entity_name}")
-async def get_entity_details(entity_name: str):
+async def get_entity_details(entity_name: str, kg: KnowledgeGraph = Depends(get_kg)):
     """
     Get details about a specific entity and its relationships.
     """
     try:
-        kg = get_knowledge_graph()
         entity = kg.find_entity(entity_name)
         
         if not entity:
@@ -185,13 +222,19 @@ async def get_entity_details(entity_name: str):
 
 
 @router.get("/knowledge-graph/search")
-async def search_knowledge_graph(q: str, entity_type: str = None):
+async def search_knowledge_graph(
+    q: str,
+    entity_type: str = None,
+    prefix: bool = False,
+    kg: KnowledgeGraph = Depends(get_kg)
+):
     """
     Search for entities in the knowledge graph.
+    
+    With prefix=true, partial words match too ("appl" finds Apple products).
     """
     try:
-        kg = get_knowledge_graph()
-        results = kg.search_entities(q, entity_type)
+        results = kg.search_entities(q, entity_type, prefix=prefix)
         return {"results": results, "count": len(results)}
     except Exception as e:
         logger.error(f"Error searching knowledge graph: {e}")
@@ -199,12 +242,11 @@ async def search_knowledge_graph(q: str, entity_type: str = None):
 
 
 @router.get("/knowledge-graph/brands")
-async def get_brands():
+async def get_brands(kg: KnowledgeGraph = Depends(get_kg)):
     """
     Get all brands in the knowledge graph.
     """
     try:
-        kg = get_knowledge_graph()
         brands = kg.get_entities_by_type("brand")
         return {"brands": brands, "count": len(brands)}
     except Exception as e:
@@ -213,12 +255,11 @@ async def get_brands():
 
 
 @router.get("/knowledge-graph/categories")
-async def get_categories():
+async def get_categories(kg: KnowledgeGraph = Depends(get_kg)):
     """
     Get all categories in the knowledge graph.
     """
     try:
-        kg = get_knowledge_graph()
         categories = kg.get_entities_by_type("category")
         return {"categories": categories, "count": len(categories)}
     except Exception as e:
@@ -227,12 +268,11 @@ async def get_categories():
 
 
 @router.get("/knowledge-graph/brand/{brand_name}/products")
-async def get_products_by_brand(brand_name: str):
+async def get_products_by_brand(brand_name: str, kg: KnowledgeGraph = Depends(get_kg)):
     """
     Get all products for a specific brand.
     """
     try:
-        kg = get_knowledge_graph()
         products = kg.get_products_by_brand(brand_name)
         return {"brand": brand_name, "products": products, "count": len(products)}
     except Exception as e:
@@ -241,12 +281,11 @@ async def get_products_by_brand(brand_name: str):
 
 
 @router.get("/knowledge-graph/category/{category_name}/products")
-async def get_products_by_category(category_name: str):
+async def get_products_by_category(category_name: str, kg: KnowledgeGraph = Depends(get_kg)):
     """
     Get all products in a specific category.
     """
     try:
-        kg = get_knowledge_graph()
         products = kg.get_products_by_category(category_name)
         return {"category": category_name, "products": products, "count": len(products)}
     except Exception as e:
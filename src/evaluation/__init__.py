@@ -7,17 +7,29 @@ Provides ablation study capabilities comparing:
 - Hybrid GraphRAG
 """
 
-from .benchmark import BENCHMARK_QUESTIONS, get_benchmark_questions, get_statistics
-from .evaluator import Evaluator, evaluate_response
-from .ablation import AblationStudy, AblationStudyConfig, run_ablation_study
+from . import benchmark
+from .benchmark import get_benchmark_questions, get_statistics
+from .evaluator import Evaluator, EvalRequest, evaluate_response, evaluate_responses
+from .judge_cache import JudgeCache
+from .ablation import AblationStudy, AblationStudyConfig, arun_ablation_study
 
 __all__ = [
     "BENCHMARK_QUESTIONS",
     "get_benchmark_questions",
     "get_statistics",
     "Evaluator",
+    "EvalRequest",
     "evaluate_response",
+    "evaluate_responses",
+    "JudgeCache",
     "AblationStudy",
     "AblationStudyConfig",
-    "run_ablation_study",
+    "arun_ablation_study",
 ]
+
+
+def __getattr__(name: str):
+    # BENCHMARK_QUESTIONS is built lazily by the benchmark module
+    if name == "BENCHMARK_QUESTIONS":
+        return benchmark.BENCHMARK_QUESTIONS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,35 +4,200 @@ Ablation Study Runner - Compare Vector-only, Graph-only, and Hybrid RAG.
 Runs benchmark questions through each retrieval mode and collects metrics.
 """
 
+import asyncio
+import hashlib
+import io
 import logging
+import sys
+import threading
 import time
-import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, NamedTuple, Optional, Sequence, TextIO
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+import orjson
+
 from .benchmark import (
-    BENCHMARK_QUESTIONS, 
     BenchmarkQuestion, 
     get_benchmark_questions,
     get_statistics
 )
-from .evaluator import Evaluator, EvaluationResult, aggregate_results
+from .evaluator import AggregateAccumulator, Evaluator, EvalRequest, EvaluationResult, aggregate_results
+from .judge_cache import JUDGE_CACHE_VERSION, JudgeCache
+from .rate_limit import ERROR_REPLY_PREFIXES, TokenBucket, is_rate_limited
 
 logger = logging.getLogger(__name__)
 
+# Characters of each answer kept in the comparison table
+RESPONSE_PREVIEW_CHARS = 200
+
+# Fixed parts of the markdown report, formatted once per report
+REPORT_MODES = ["vector_only", "graph_only", "hybrid"]
+
+REPORT_HEADER = (
+    "# Ablation Study Results: RAG vs GraphRAG\n"
+    "**Generated:** {end_time}\n"
+    "**Duration:** {duration:.1f} seconds\n"
+    "**Total Questions:** {question_count}\n\n"
+)
+
+REPORT_SUMMARY_HEADER = (
+    "## Summary Statistics\n"
+    "| Metric | Vector-Only | Graph-Only | Hybrid (Ours) |\n"
+    "|--------|-------------|------------|---------------|\n"
+)
+
+REPORT_CATEGORY_HEADER = (
+    "| Category | Vector-Only | Graph-Only | Hybrid | Best Mode |\n"
+    "|----------|-------------|------------|--------|----------|\n"
+)
+
+# (label, aggregated key, value formatter) rows of the summary table
+REPORT_METRICS = [
+    ("Avg. Relevance Score (1-5)", "avg_relevance_score", "{:.2f}".format),
+    ("Avg. Accuracy Score (0-1)", "avg_accuracy_score", "{:.2%}".format),
+    ("Avg. Keyword Coverage", "avg_keyword_coverage", "{:.2%}".format),
+    ("Avg. Entity Coverage", "avg_entity_coverage", "{:.2%}".format),
+    ("Avg. Response Time (ms)", "avg_response_time_ms", "{:.0f}".format),
+    ("Avg. Source Count", "avg_source_count", "{:.1f}".format),
+    ("Hallucination Rate", "hallucination_rate", "{:.1%}".format),
+]
+
+# Retrieval modes RAGChain.query() accepts
+RETRIEVAL_MODES = ("vector_only", "graph_only", "hybrid")
+
+# Default number of question × mode pairs arun() works on at once
+DEFAULT_MAX_WORKERS = 8
+
+# Default pace of arun(): RAG queries plus judge LLM calls per minute. Only
+# waits when the calls themselves were faster than that, and backs off
+# when Gemini reports rate limiting.
+DEFAULT_RATE_LIMIT_RPM = 30
+
+# Journal of finished evaluations in the output dir, one JSON object per
+# line, after a header line identifying the chain and config that produced
+# them. arun() resumes from it after a crash (if the header still matches)
+# and deletes it on completion.
+PARTIAL_RESULTS_FILE = "ablation_partial.jsonl"
+
+# orjson options for saved results: numpy values and non-string keys
+# (e.g. from aggregations) serialize instead of raising
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# RAG responses cached across runs, under the output dir
+RAG_CACHE_DIR = "rag_cache"
+
+# Judge verdicts cached across runs, under the output dir
+JUDGE_CACHE_FILE = "judge_cache.sqlite3"
+
+# (improvement name, baseline mode, metric, lower is better) reported by
+# _calculate_improvements as the hybrid mode's percent change vs the baseline
+IMPROVEMENT_METRICS = [
+    ("accuracy_vs_vector", "vector_only", "avg_accuracy_score", False),
+    ("accuracy_vs_graph", "graph_only", "avg_accuracy_score", False),
+    ("hallucination_reduction_vs_vector", "vector_only", "hallucination_rate", True),
+]
+
+
+class ModeKeys(NamedTuple):
+    """Per-mode column names in a comparison table row."""
+    response: str
+    relevance: str
+    accuracy: str
+    hallucinated: str
+    time_ms: str
+
 
-@dataclass
+@lru_cache(maxsize=None)
+def mode_keys(mode: str) -> ModeKeys:
+    """Comparison row keys for a mode, built once per mode."""
+    return ModeKeys(
+        response=f"{mode}_response",
+        relevance=f"{mode}_relevance",
+        accuracy=f"{mode}_accuracy",
+        hallucinated=f"{mode}_hallucinated",
+        time_ms=f"{mode}_time_ms"
+    )
+
+
+class ResponseCache:
+    """
+    Disk cache of RAG responses, one JSON file per (chain version, mode, question).
+    
+    Lets evaluator and prompt changes be re-run without querying the RAG
+    chain again while the corpus and chain settings are unchanged.
+    """
+    
+    def __init__(self, cache_dir: Path, version: str):
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, question: str, mode: str) -> Path:
+        key = hashlib.blake2b(
+            f"{self.version}:{mode}:{question}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return self.cache_dir / f"{key}.json"
+    
+    def get(self, question: str, mode: str) -> Optional[tuple]:
+        """Cached (response, query time in ms), or None."""
+        path = self._path(question, mode)
+        try:
+            entry = orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        return entry["response"], entry["query_time_ms"]
+    
+    def put(self, question: str, mode: str, response: Dict[str, Any], query_time: float):
+        """Store a response; ones that aren't JSON-serializable are skipped."""
+        try:
+            data = orjson.dumps(
+                {"response": response, "query_time_ms": query_time}, option=JSON_OPTIONS
+            )
+        except TypeError as e:
+            logger.warning(f"Not caching RAG response for {mode}: {e}")
+            return
+        
+        # Write then rename, so concurrent readers never see a partial file
+        path = self._path(question, mode)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+
+@dataclass(slots=True)
 class AblationStudyConfig:
     """Configuration for ablation study."""
-    modes: List[str] = field(default_factory=lambda: ["vector_only", "graph_only", "hybrid"])
-    questions: List[BenchmarkQuestion] = field(default_factory=lambda: BENCHMARK_QUESTIONS)
+    modes: List[str] = field(default_factory=lambda: list(RETRIEVAL_MODES))
+    questions: Sequence[BenchmarkQuestion] = field(default_factory=get_benchmark_questions)
     output_dir: str = "./data/evaluation_results"
     save_intermediate: bool = True
+    batch_judge: bool = False  # submit all judge calls as one Gemini batch job
+    rate_limit_rpm: Optional[float] = DEFAULT_RATE_LIMIT_RPM  # None disables pacing
+    use_cache: bool = True  # reuse RAG responses and judge verdicts cached under output_dir
+    max_workers: int = DEFAULT_MAX_WORKERS  # question × mode pairs in flight at once
+    fast_path: bool = True  # skip the LLM judge for answers with every expected keyword/entity
+    minimize_memory: bool = False  # keep only answer previews, not full answers, in all_results
     
+    def __post_init__(self):
+        unknown = [mode for mode in self.modes if mode not in RETRIEVAL_MODES]
+        if unknown:
+            raise ValueError(f"Unknown retrieval modes: {unknown}")
+        if self.max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {self.max_workers}")
+        if self.rate_limit_rpm is not None and self.rate_limit_rpm <= 0:
+            raise ValueError(
+                f"rate_limit_rpm must be positive (or None for no pacing), got {self.rate_limit_rpm}"
+            )
+        
+        # Mode names are used as dict keys throughout the study
+        self.modes = [sys.intern(mode) for mode in self.modes]
     
-@dataclass
+    
+@dataclass(slots=True)
 class AblationStudyResults:
     """Complete results of an ablation study."""
     config: Dict[str, Any]
@@ -66,101 +231,109 @@ class AblationStudyResults:
     
     def to_json(self, filepath: str):
         """Save results to JSON file."""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(self.to_dict(), option=JSON_OPTIONS | orjson.OPT_INDENT_2))
+    
+    def _category_accuracy(self, modes: List[str]):
+        """
+        Mean accuracy per question category and mode.
+        
+        Args:
+            modes: Modes to report, one column each
+            
+        Returns:
+            DataFrame indexed by category (in first-seen order); NaN where
+            a mode has no results for the category
+        """
+        import pandas as pd
+        
+        columns = [mode_keys(mode).accuracy for mode in modes]
+        df = pd.DataFrame.from_records(self.comparison_table)
+        df = df.reindex(columns=["category", *columns])
+        df["category"] = df["category"].fillna("unknown")
+        df[columns] = df[columns].astype(float)
+        
+        return df.groupby("category", sort=False)[columns].mean()
     
     def to_markdown_report(self) -> str:
         """Generate a markdown report for publication."""
-        report = []
+        buffer = io.StringIO()
+        self.write_markdown_report(buffer)
+        return buffer.getvalue()
+    
+    def write_markdown_report(self, fp: TextIO):
+        """
+        Write the markdown report to an open text file, piece by piece.
         
-        report.append("# Ablation Study Results: RAG vs GraphRAG\n")
-        report.append(f"**Generated:** {self.end_time}\n")
-        report.append(f"**Duration:** {self.duration_seconds:.1f} seconds\n")
-        report.append(f"**Total Questions:** {len(self.comparison_table)}\n\n")
+        Args:
+            fp: Writable text file handle
+        """
+        fp.write(REPORT_HEADER.format(
+            end_time=self.end_time,
+            duration=self.duration_seconds,
+            question_count=len(self.comparison_table)
+        ))
         
         # Summary Table
-        report.append("## Summary Statistics\n")
-        report.append("| Metric | Vector-Only | Graph-Only | Hybrid (Ours) |\n")
-        report.append("|--------|-------------|------------|---------------|\n")
+        fp.write(REPORT_SUMMARY_HEADER)
         
-        modes = ["vector_only", "graph_only", "hybrid"]
+        modes = REPORT_MODES
         agg = self.aggregated.get("by_mode", {})
         
-        metrics = [
-            ("Avg. Relevance Score (1-5)", "avg_relevance_score", "{:.2f}"),
-            ("Avg. Accuracy Score (0-1)", "avg_accuracy_score", "{:.2%}"),
-            ("Avg. Keyword Coverage", "avg_keyword_coverage", "{:.2%}"),
-            ("Avg. Entity Coverage", "avg_entity_coverage", "{:.2%}"),
-            ("Avg. Response Time (ms)", "avg_response_time_ms", "{:.0f}"),
-            ("Avg. Source Count", "avg_source_count", "{:.1f}"),
-            ("Hallucination Rate", "hallucination_rate", "{:.1%}"),
-        ]
-        
-        for metric_name, metric_key, fmt in metrics:
-            row = f"| {metric_name} |"
-            for mode in modes:
-                if mode in agg:
-                    value = agg[mode].get(metric_key, 0)
-                    row += f" {fmt.format(value)} |"
-                else:
-                    row += " N/A |"
-            report.append(row + "\n")
+        for metric_name, metric_key, fmt in REPORT_METRICS:
+            parts = [f"| {metric_name} |"]
+            parts.extend(
+                f" {fmt(agg[mode].get(metric_key, 0))} |" if mode in agg else " N/A |"
+                for mode in modes
+            )
+            parts.append("\n")
+            fp.write("".join(parts))
         
-        report.append("\n")
+        fp.write("\n")
         
         # Hallucination Examples
         if self.hallucination_examples:
-            report.append("## Hallucination Examples\n")
-            report.append("Comparing responses where hallucination was detected:\n\n")
+            fp.write("## Hallucination Examples\n")
+            fp.write("Comparing responses where hallucination was detected:\n\n")
             
             for i, example in enumerate(self.hallucination_examples[:5], 1):
-                report.append(f"### Example {i}: {example['question'][:60]}...\n")
-                report.append(f"**Ground Truth:** {example['ground_truth'][:100]}...\n\n")
+                fp.write(f"### Example {i}: {example['question'][:60]}...\n")
+                fp.write(f"**Ground Truth:** {example['ground_truth'][:100]}...\n\n")
                 
                 for mode_result in example.get('mode_responses', []):
                     mode = mode_result['mode']
                     response = mode_result['response'][:150]
                     hallucinated = "❌ Hallucinated" if mode_result['hallucinated'] else "✅ Accurate"
-                    report.append(f"- **{mode}:** {response}... ({hallucinated})\n")
+                    fp.write(f"- **{mode}:** {response}... ({hallucinated})\n")
                 
-                report.append("\n")
+                fp.write("\n")
         
         # Per-Category Performance
-        report.append("## Performance by Question Category\n")
-        
-        # Group by category
-        category_stats = {}
-        for row in self.comparison_table:
-            cat = row.get("category", "unknown")
-            if cat not in category_stats:
-                category_stats[cat] = {mode: [] for mode in modes}
-            
-            for mode in modes:
-                if f"{mode}_accuracy" in row:
-                    category_stats[cat][mode].append(row[f"{mode}_accuracy"])
-        
-        report.append("| Category | Vector-Only | Graph-Only | Hybrid | Best Mode |\n")
-        report.append("|----------|-------------|------------|--------|----------|\n")
-        
-        for cat, stats in category_stats.items():
-            row = f"| {cat} |"
-            best_mode = ""
-            best_score = 0
-            
-            for mode in modes:
-                if stats[mode]:
-                    avg = sum(stats[mode]) / len(stats[mode])
-                    row += f" {avg:.2%} |"
-                    if avg > best_score:
-                        best_score = avg
-                        best_mode = mode
-                else:
-                    row += " N/A |"
-            
-            row += f" {best_mode} |"
-            report.append(row + "\n")
-        
-        return "".join(report)
+        fp.write("## Performance by Question Category\n")
+        
+        # Mean accuracy per category and mode in one groupby pass
+        means = self._category_accuracy(modes)
+        scores = means.to_numpy(dtype=float)
+        # Best mode: first highest average, if any is above zero
+        ranked = np.where(np.isnan(scores), -np.inf, scores)
+        best = ranked.argmax(axis=1)
+        has_best = ranked.max(axis=1) > 0
+        
+        fp.write(REPORT_CATEGORY_HEADER)
+        
+        for cat, values, best_idx, found in zip(means.index, scores, best, has_best):
+            parts = [f"| {cat} |"]
+            parts.extend(" N/A |" if np.isnan(avg) else f" {avg:.2%} |" for avg in values)
+            parts.append(f" {modes[best_idx] if found else ''} |\n")
+            fp.write("".join(parts))
+
+
+class _StudyRun(NamedTuple):
+    """Collaborators of one arun() call, built from its config."""
+    evaluator: Evaluator
+    limiter: Optional[TokenBucket]
+    cache: Optional[ResponseCache]
+    journal: Optional[Any]  # open partial results file, if saving intermediates
 
 
 class AblationStudy:
@@ -177,10 +350,13 @@ class AblationStudy:
             llm_generator: LLMGenerator for evaluation
         """
         self.rag_chain = rag_chain
-        self.evaluator = Evaluator(llm_generator)
+        self.llm_generator = llm_generator
         self.results: List[EvaluationResult] = []
+        # Per-mode means of the results so far, for progress reporting
+        self.running_stats = AggregateAccumulator()
+        self.minimize_memory = False
     
-    def run(
+    async def arun(
         self,
         config: AblationStudyConfig = None,
         progress_callback=None
@@ -188,6 +364,11 @@ class AblationStudy:
         """
         Run the complete ablation study.
         
+        Question × mode pairs are independent, so up to config.max_workers
+        of them run concurrently on the event loop, paced by a rate limiter
+        shared by their RAG queries and judge calls. Each run builds its own
+        evaluator, so runs never change each other's settings.
+        
         Args:
             config: Study configuration
             progress_callback: Optional callback(current, total, message) for progress
@@ -199,85 +380,377 @@ class AblationStudy:
             config = AblationStudyConfig()
         
         start_time = datetime.now()
+        start_counter = time.perf_counter()  # monotonic, for the duration
+        self.minimize_memory = config.minimize_memory
         self.results = []
+        self.running_stats = AggregateAccumulator()
+        
+        limiter = TokenBucket(config.rate_limit_rpm) if config.rate_limit_rpm is not None else None
+        version = None
+        cache = None
+        judge_cache = None
+        if config.output_dir and (config.use_cache or config.save_intermediate):
+            # Hashes every stored document ID, so keep it off the event loop
+            version = await asyncio.to_thread(getattr, self.rag_chain, "version", None)
+        if config.use_cache and config.output_dir:
+            if version is not None:
+                cache = ResponseCache(Path(config.output_dir) / RAG_CACHE_DIR, version)
+            judge_cache = JudgeCache(Path(config.output_dir) / JUDGE_CACHE_FILE)
+        evaluator = Evaluator(
+            self.llm_generator,
+            fast_path=config.fast_path,
+            judge_cache=judge_cache,
+            limiter=limiter
+        )
         
         total_steps = len(config.questions) * len(config.modes)
-        current_step = 0
         
-        logger.info(f"Starting ablation study: {len(config.questions)} questions × {len(config.modes)} modes")
+        logger.info(f"Starting ablation study: {len(config.questions)} questions × {len(config.modes)} modes "
+                    f"(up to {config.max_workers} concurrent)")
+        
+        # With batch_judge, (row, mode, query time, request) tuples
+        # evaluated together once every query has run
+        pending = []
+        
+        # Evaluations finished by an earlier, interrupted run
+        journal_path = None
+        journal = None
+        completed = {}
+        try:
+            if config.output_dir and config.save_intermediate:
+                journal_path = Path(config.output_dir) / PARTIAL_RESULTS_FILE
+                header = self._journal_header(config, version)
+                completed = self._load_journal(journal_path, header)
+                journal_path.parent.mkdir(parents=True, exist_ok=True)
+                # Unbuffered: each line reaches the file as soon as it is written
+                if completed is None:
+                    completed = {}
+                    journal = open(journal_path, "wb", buffering=0)
+                    journal.write(orjson.dumps(header, option=orjson.OPT_APPEND_NEWLINE))
+                else:
+                    logger.info(f"Resuming ablation study: {len(completed)} evaluations already done")
+                    journal = open(journal_path, "ab", buffering=0)
+            
+            run = _StudyRun(evaluator=evaluator, limiter=limiter, cache=cache, journal=journal)
+            
+            # Run each question through each mode
+            comparison_table = await self._run_pairs(
+                run, config, progress_callback, pending, completed, total_steps
+            )
+            
+            if pending:
+                logger.info(f"Judging {len(pending)} responses in one batch job")
+                # Submits the job and polls it until done, so keep it off the event loop
+                eval_results = await asyncio.to_thread(
+                    evaluator.evaluate_batch, [p[3] for p in pending]
+                )
+                for (row, mode, query_time, _), eval_result in zip(pending, eval_results):
+                    self._record(run, row, mode, eval_result, query_time)
+            
+            study_results = self._finish(config, start_time, start_counter, comparison_table, judge_cache)
+        finally:
+            if journal is not None:
+                journal.close()
+            if judge_cache is not None:
+                judge_cache.close()
+        
+        if journal_path is not None:
+            journal_path.unlink(missing_ok=True)
+        
+        return study_results
+    
+    async def _run_pairs(
+        self,
+        run: _StudyRun,
+        config: AblationStudyConfig,
+        progress_callback,
+        pending: List,
+        completed: Dict,
+        total_steps: int
+    ) -> List[Dict]:
+        """
+        Query and evaluate every question × mode pair not already completed.
+        
+        At most max_workers pairs are in flight at once. Rows are assembled
+        in question order afterwards, as a sequential run would.
+        """
+        tasks = [
+            (index, question, mode)
+            for index, question in enumerate(config.questions)
+            for mode in config.modes
+            if (question.id, mode) not in completed
+        ]
+        
+        # (question index, mode) -> (response, query time, result) or the exception raised
+        outcomes = {}
+        current_step = total_steps - len(tasks)
+        for previous in completed.values():
+            self.running_stats.update(previous)
+        
+        semaphore = asyncio.Semaphore(config.max_workers)
+        
+        async def run_task(index: int, question: BenchmarkQuestion, mode: str):
+            nonlocal current_step
+            async with semaphore:
+                try:
+                    outcome = await self._run_pair(run, question, mode, config.batch_judge)
+                except Exception as e:
+                    logger.error(f"Error evaluating {question.id} with {mode}: {e}")
+                    outcome = e
+            
+            if not isinstance(outcome, Exception) and not config.batch_judge:
+                self._journal_write(run, outcome[2])
+                self.running_stats.update(outcome[2])
+            outcomes[(index, mode)] = outcome
+            current_step += 1
+            
+            logger.info(f"[{current_step}/{total_steps}] {question.id} - {mode}")
+            if progress_callback:
+                progress_callback(
+                    current_step, 
+                    total_steps, 
+                    f"Evaluated {question.id} with {mode}"
+                )
+        
+        futures = [asyncio.ensure_future(run_task(*task)) for task in tasks]
+        try:
+            await asyncio.gather(*futures)
+        finally:
+            # Drop pairs still waiting if a callback or cancellation aborted the run
+            for future in futures:
+                future.cancel()
         
-        # Run each question through each mode
         comparison_table = []
         
-        for question in config.questions:
-            question_comparison = {
-                "question_id": question.id,
-                "question": question.question,
-                "category": question.category.value,
-                "difficulty": question.difficulty.value,
-                "ground_truth": question.ground_truth
-            }
+        for index, question in enumerate(config.questions):
+            question_comparison = self._new_comparison_row(question)
             
             for mode in config.modes:
-                current_step += 1
-                
-                if progress_callback:
-                    progress_callback(
-                        current_step, 
-                        total_steps, 
-                        f"Evaluating {question.id} with {mode}"
-                    )
+                previous = completed.get((question.id, mode))
+                if previous is not None:
+                    self.results.append(previous)
+                    self._add_to_row(question_comparison, mode, previous, previous.response_time_ms)
+                    continue
                 
-                logger.info(f"[{current_step}/{total_steps}] {question.id} - {mode}")
+                outcome = outcomes[(index, mode)]
+                if isinstance(outcome, Exception):
+                    question_comparison[f"{mode}_error"] = str(outcome)
+                    continue
                 
-                try:
-                    # Run query with specific mode
-                    query_start = time.time()
-                    response = self.rag_chain.query(
-                        question.question,
-                        retrieval_mode=mode
-                    )
-                    query_time = (time.time() - query_start) * 1000  # ms
-                    
-                    # Evaluate
-                    eval_result = self.evaluator.evaluate_response(
-                        question_id=question.id,
-                        question=question.question,
-                        response=response.get("answer", ""),
-                        ground_truth=question.ground_truth,
-                        expected_entities=question.expected_entities,
-                        expected_keywords=question.expected_keywords,
-                        retrieval_mode=mode,
-                        sources=response.get("sources", []),
-                        response_time_ms=query_time,
-                        context_length=len(str(response)),
-                        graph_entities_found=response.get("graph_entities_found", 0)
-                    )
-                    
-                    self.results.append(eval_result)
-                    
-                    # Add to comparison
-                    question_comparison[f"{mode}_response"] = response.get("answer", "")[:200]
-                    question_comparison[f"{mode}_relevance"] = eval_result.relevance_score
-                    question_comparison[f"{mode}_accuracy"] = eval_result.accuracy_score
-                    question_comparison[f"{mode}_hallucinated"] = eval_result.hallucination_detected
-                    question_comparison[f"{mode}_time_ms"] = query_time
-                    
-                    # Add delay to respect API rate limits (15 RPM for free tier)
-                    time.sleep(2.0)
-
-                    
-                except Exception as e:
-                    logger.error(f"Error evaluating {question.id} with {mode}: {e}")
-                    question_comparison[f"{mode}_error"] = str(e)
+                response, query_time, evaluated = outcome
+                if config.batch_judge:
+                    pending.append((question_comparison, mode, query_time, evaluated))
+                else:
+                    self.results.append(evaluated)
+                    self._add_to_row(question_comparison, mode, evaluated, query_time)
             
             comparison_table.append(question_comparison)
         
+        return comparison_table
+    
+    async def _run_pair(
+        self,
+        run: _StudyRun,
+        question: BenchmarkQuestion,
+        mode: str,
+        batch_judge: bool
+    ) -> tuple:
+        """
+        Query one question × mode pair and evaluate the answer.
+        
+        Returns:
+            (response, query time in ms, EvaluationResult), or with batch_judge
+            an EvalRequest to judge later in place of the result
+        """
+        response, query_time = await self._timed_query(run, question.question, mode)
+        request = self._eval_request(question, mode, response, query_time)
+        
+        if batch_judge:
+            return response, query_time, request
+        
+        # The evaluator paces its own LLM calls through the run's limiter
+        return response, query_time, await run.evaluator.aevaluate_response(**vars(request))
+    
+    def _new_comparison_row(self, question: BenchmarkQuestion) -> Dict[str, Any]:
+        """Start a per-question comparison row."""
+        return {
+            "question_id": question.id,
+            "question": question.question,
+            "category": question.category.value,
+            "difficulty": question.difficulty.value,
+            "ground_truth": question.ground_truth
+        }
+    
+    async def _timed_query(self, run: _StudyRun, question: str, mode: str):
+        """
+        Run one RAG query, returning (response, query time in ms).
+        
+        A cached response is returned with the query time it originally took.
+        Rate-limited answers slow the limiter down and are not cached.
+        """
+        if run.cache is not None:
+            cached = run.cache.get(question, mode)
+            if cached is not None:
+                return cached
+        
+        if run.limiter is not None:
+            await run.limiter.aacquire()
+        query_start = time.perf_counter_ns()
+        try:
+            response = await self.rag_chain.aquery(question, retrieval_mode=mode)
+        except Exception as e:
+            if run.limiter is not None and is_rate_limited(e):
+                await run.limiter.apenalize()
+            raise
+        query_time = (time.perf_counter_ns() - query_start) / 1e6
+        
+        answer = response.get("answer", "")
+        if run.limiter is not None:
+            if is_rate_limited(answer):
+                await run.limiter.apenalize()
+            else:
+                run.limiter.record_success()
+        
+        if run.cache is not None and not answer.startswith(ERROR_REPLY_PREFIXES):
+            run.cache.put(question, mode, response, query_time)
+        
+        return response, query_time
+    
+    def _eval_request(
+        self,
+        question: BenchmarkQuestion,
+        mode: str,
+        response: Dict[str, Any],
+        query_time: float
+    ) -> EvalRequest:
+        """Evaluator inputs for one RAG response."""
+        return EvalRequest(
+            question_id=question.id,
+            question=question.question,
+            response=response.get("answer", ""),
+            ground_truth=question.ground_truth,
+            expected_entities=question.expected_entities,
+            expected_keywords=question.expected_keywords,
+            retrieval_mode=mode,
+            sources=response.get("sources", []),
+            response_time_ms=query_time,
+            context_length=response.get("context_length", 0),
+            graph_entities_found=response.get("graph_entities_found", 0)
+        )
+    
+    def _record(
+        self,
+        run: _StudyRun,
+        question_comparison: Dict[str, Any],
+        mode: str,
+        eval_result: EvaluationResult,
+        query_time: float
+    ):
+        """Store an evaluation and add it to the comparison row."""
+        self.results.append(eval_result)
+        self.running_stats.update(eval_result)
+        self._add_to_row(question_comparison, mode, eval_result, query_time)
+        self._journal_write(run, eval_result)
+    
+    @staticmethod
+    def _journal_write(run: _StudyRun, eval_result: EvaluationResult):
+        """Append an evaluation to the partial results file, if the run keeps one."""
+        if run.journal is not None:
+            run.journal.write(eval_result.to_json_bytes(orjson.OPT_APPEND_NEWLINE))
+    
+    def _add_to_row(
+        self,
+        question_comparison: Dict[str, Any],
+        mode: str,
+        eval_result: EvaluationResult,
+        query_time: float
+    ):
+        """
+        Add one mode's evaluation to a per-question comparison row.
+        
+        The row keeps a preview of the answer. With minimize_memory the
+        result keeps only that same preview instead of the full text.
+        """
+        keys = mode_keys(mode)
+        preview = eval_result.response[:RESPONSE_PREVIEW_CHARS]
+        if self.minimize_memory:
+            eval_result.response = preview
+        question_comparison[keys.response] = preview
+        question_comparison[keys.relevance] = eval_result.relevance_score
+        question_comparison[keys.accuracy] = eval_result.accuracy_score
+        question_comparison[keys.hallucinated] = eval_result.hallucination_detected
+        question_comparison[keys.time_ms] = query_time
+    
+    def _journal_header(self, config: AblationStudyConfig, chain_version: Optional[str]) -> Dict[str, Any]:
+        """
+        First line of the partial results file: the RAG chain version and a
+        hash of everything else the journaled evaluations depend on (judge
+        model and settings, and the questions with their ground truth).
+        """
+        judged = orjson.dumps([
+            JUDGE_CACHE_VERSION,
+            getattr(self.llm_generator, "model_name", None),
+            config.fast_path,
+            [
+                [q.id, q.question, q.ground_truth, q.expected_entities, q.expected_keywords]
+                for q in config.questions
+            ]
+        ])
+        return {
+            "chain_version": chain_version,
+            "config_hash": hashlib.sha256(judged).hexdigest()[:16]
+        }
+    
+    @staticmethod
+    def _load_journal(path: Path, header: Dict[str, Any]) -> Optional[Dict[tuple, EvaluationResult]]:
+        """
+        Read evaluations saved by an interrupted run.
+        
+        Args:
+            path: Partial results JSONL file
+            header: Header the current run would write
+            
+        Returns:
+            Dict of (question_id, mode) -> EvaluationResult, or None if there
+            is no journal or it was written for another chain version or config
+        """
+        if not path.exists():
+            return None
+        
+        completed = {}
+        with open(path, "rb") as f:
+            try:
+                saved_header = orjson.loads(f.readline())
+            except orjson.JSONDecodeError:
+                saved_header = None
+            if saved_header != header:
+                logger.info("Partial results are from another chain version or config, starting fresh")
+                return None
+            
+            for line in f:
+                try:
+                    result = EvaluationResult(**orjson.loads(line))
+                except (orjson.JSONDecodeError, TypeError):
+                    # Torn last line from a crash mid-write
+                    continue
+                completed[(result.question_id, result.retrieval_mode)] = result
+        
+        return completed
+    
+    def _finish(
+        self,
+        config: AblationStudyConfig,
+        start_time: datetime,
+        start_counter: float,
+        comparison_table: List[Dict],
+        judge_cache: Optional[JudgeCache] = None
+    ) -> AblationStudyResults:
+        """Aggregate the collected results and save them."""
         end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        duration = time.perf_counter() - start_counter
         
         # Aggregate results
-        aggregated = aggregate_results(self.results)
+        aggregated = aggregate_results(self.results, judge_cache=judge_cache)
         
         # Find hallucination examples
         hallucination_examples = self._find_hallucination_examples(comparison_table)
@@ -313,31 +786,31 @@ class AblationStudy:
     def _find_hallucination_examples(self, comparison_table: List[Dict]) -> List[Dict]:
         """Find examples where hallucination behavior differs between modes."""
         examples = []
+        keys = {mode: mode_keys(mode) for mode in ["vector_only", "graph_only", "hybrid"]}
+        hybrid_key = keys["hybrid"].hallucinated
+        baseline_keys = [keys["vector_only"].hallucinated, keys["graph_only"].hallucinated]
         
         for row in comparison_table:
-            # Check if any mode hallucinated
-            modes_hallucinated = {
-                mode: row.get(f"{mode}_hallucinated", False)
-                for mode in ["vector_only", "graph_only", "hybrid"]
-            }
-            
             # Interesting: hybrid didn't hallucinate but others did
-            if not modes_hallucinated.get("hybrid", True) and \
-               (modes_hallucinated.get("vector_only") or modes_hallucinated.get("graph_only")):
-                examples.append({
-                    "question": row["question"],
-                    "ground_truth": row["ground_truth"],
-                    "mode_responses": [
-                        {
-                            "mode": mode,
-                            "response": row.get(f"{mode}_response", ""),
-                            "hallucinated": modes_hallucinated.get(mode, False)
-                        }
-                        for mode in ["vector_only", "graph_only", "hybrid"]
-                    ]
-                })
-        
-        return examples[:10]  # Return top 10 examples
+            if row.get(hybrid_key, False) or not any(row.get(key) for key in baseline_keys):
+                continue
+            
+            examples.append({
+                "question": row["question"],
+                "ground_truth": row["ground_truth"],
+                "mode_responses": [
+                    {
+                        "mode": mode,
+                        "response": row.get(mode_key.response, ""),
+                        "hallucinated": row.get(mode_key.hallucinated, False)
+                    }
+                    for mode, mode_key in keys.items()
+                ]
+            })
+            if len(examples) == 10:  # Return top 10 examples
+                break
+        
+        return examples
     
     def _build_summary_table(self, aggregated: Dict) -> Dict:
         """Build a summary comparison table."""
@@ -357,28 +830,23 @@ class AblationStudy:
             "hallucination_rate"
         ]
         
-        winners = {}
-        for metric in metrics:
-            best_mode = None
-            best_value = None
-            higher_is_better = metric != "hallucination_rate" and metric != "avg_response_time_ms"
-            
-            for mode in modes:
-                value = by_mode[mode].get(metric, 0)
-                if best_value is None:
-                    best_value = value
-                    best_mode = mode
-                elif higher_is_better and value > best_value:
-                    best_value = value
-                    best_mode = mode
-                elif not higher_is_better and value < best_value:
-                    best_value = value
-                    best_mode = mode
-            
-            winners[metric] = {
-                "winner": best_mode,
-                "value": best_value
+        # modes × metrics; the best mode per column (first one on ties)
+        values = np.array(
+            [[by_mode[mode].get(metric, 0) for metric in metrics] for mode in modes],
+            dtype=float
+        )
+        higher_is_better = np.array(
+            [metric not in ("hallucination_rate", "avg_response_time_ms") for metric in metrics]
+        )
+        best = np.where(higher_is_better, values.argmax(axis=0), values.argmin(axis=0))
+        
+        winners = {
+            metric: {
+                "winner": modes[best[i]],
+                "value": float(values[best[i], i])
             }
+            for i, metric in enumerate(metrics)
+        }
         
         return {
             "winners": winners,
@@ -391,39 +859,31 @@ class AblationStudy:
             return {}
         
         hybrid = by_mode["hybrid"]
-        vector = by_mode.get("vector_only", {})
-        graph = by_mode.get("graph_only", {})
-        
-        improvements = {}
         
-        # Accuracy improvement
-        if vector.get("avg_accuracy_score"):
-            improvements["accuracy_vs_vector"] = (
-                (hybrid.get("avg_accuracy_score", 0) - vector["avg_accuracy_score"]) 
-                / vector["avg_accuracy_score"] * 100
-            )
+        # Comparisons whose baseline metric is present and non-zero
+        comparisons = [
+            (name, by_mode[baseline][metric], hybrid.get(metric, 0), lower_is_better)
+            for name, baseline, metric, lower_is_better in IMPROVEMENT_METRICS
+            if by_mode.get(baseline, {}).get(metric)
+        ]
+        if not comparisons:
+            return {}
         
-        if graph.get("avg_accuracy_score"):
-            improvements["accuracy_vs_graph"] = (
-                (hybrid.get("avg_accuracy_score", 0) - graph["avg_accuracy_score"]) 
-                / graph["avg_accuracy_score"] * 100
-            )
+        names, base, ours, lower = zip(*comparisons)
+        base = np.array(base, dtype=float)
+        ours = np.array(ours, dtype=float)
         
-        # Hallucination reduction
-        if vector.get("hallucination_rate"):
-            improvements["hallucination_reduction_vs_vector"] = (
-                (vector["hallucination_rate"] - hybrid.get("hallucination_rate", 0)) 
-                / vector["hallucination_rate"] * 100
-            )
+        # Percent change relative to the baseline, positive when hybrid is better
+        change = np.where(lower, base - ours, ours - base) / base * 100
         
-        return improvements
+        return dict(zip(names, change.tolist()))
     
     def _save_results(self, results: AblationStudyResults, output_dir: str):
         """Save results to files."""
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.fromisoformat(results.end_time).strftime("%Y%m%d_%H%M%S")
         
         # Save JSON
         json_file = output_path / f"ablation_study_{timestamp}.json"
@@ -433,16 +893,18 @@ class AblationStudy:
         # Save Markdown report
         md_file = output_path / f"ablation_report_{timestamp}.md"
         with open(md_file, 'w', encoding='utf-8') as f:
-            f.write(results.to_markdown_report())
+            results.write_markdown_report(f)
         logger.info(f"Saved Markdown report to {md_file}")
 
 
-def run_ablation_study(
+async def arun_ablation_study(
     rag_chain,
     llm_generator,
     questions: List[BenchmarkQuestion] = None,
     modes: List[str] = None,
-    output_dir: str = "./data/evaluation_results"
+    output_dir: str = "./data/evaluation_results",
+    batch_judge: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS
 ) -> AblationStudyResults:
     """
     Convenience function to run an ablation study.
@@ -453,6 +915,8 @@ def run_ablation_study(
         questions: Optional subset of questions (defaults to all)
         modes: Optional list of modes (defaults to all three)
         output_dir: Where to save results
+        batch_judge: Submit all LLM-judge calls as one batch job
+        max_workers: Maximum question × mode pairs in flight at once
         
     Returns:
         AblationStudyResults
@@ -460,9 +924,11 @@ def run_ablation_study(
     study = AblationStudy(rag_chain, llm_generator)
     
     config = AblationStudyConfig(
-        modes=modes or ["vector_only", "graph_only", "hybrid"],
-        questions=questions or BENCHMARK_QUESTIONS,
-        output_dir=output_dir
+        modes=modes or list(RETRIEVAL_MODES),
+        questions=questions or get_benchmark_questions(),
+        output_dir=output_dir,
+        batch_judge=batch_judge,
+        max_workers=max_workers
     )
     
-    return study.run(config)
+    return await study.arun(config)
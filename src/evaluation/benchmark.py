@@ -9,8 +9,12 @@ Contains 50+ curated questions with ground truth answers for:
 - Reasoning Queries (combined criteria)
 """
 
-from typing import List, Dict, Any
-from dataclasses import dataclass
+import sys
+from collections import Counter, defaultdict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
 
@@ -30,7 +34,12 @@ class Difficulty(Enum):
     HARD = "hard"
 
 
-@dataclass
+# Value -> member lookups (cheaper than Enum(value) with try/except)
+CATEGORY_BY_VALUE: Dict[str, QuestionCategory] = {m.value: m for m in QuestionCategory}
+DIFFICULTY_BY_VALUE: Dict[str, Difficulty] = {m.value: m for m in Difficulty}
+
+
+@dataclass(frozen=True, slots=True)
 class BenchmarkQuestion:
     """A single benchmark question with ground truth."""
     id: str
@@ -38,522 +47,404 @@ class BenchmarkQuestion:
     category: QuestionCategory
     difficulty: Difficulty
     ground_truth: str
-    expected_entities: List[str]  # Entities that should be found
-    expected_keywords: List[str]  # Keywords expected in answer
+    expected_entities: Tuple[str, ...]  # Entities that should be found
+    expected_keywords: Tuple[str, ...]  # Keywords expected in answer
     requires_graph: bool  # True if graph context is essential
+    _cached_dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        # Immutable, with repeated terms ("Nike", "laptop", ...) sharing one
+        # string object across questions (set through object.__setattr__
+        # since the dataclass is frozen)
+        object.__setattr__(
+            self, "expected_entities", tuple(sys.intern(e) for e in self.expected_entities)
+        )
+        object.__setattr__(
+            self, "expected_keywords", tuple(sys.intern(k) for k in self.expected_keywords)
+        )
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "question": self.question,
-            "category": self.category.value,
-            "difficulty": self.difficulty.value,
-            "ground_truth": self.ground_truth,
-            "expected_entities": self.expected_entities,
-            "expected_keywords": self.expected_keywords,
-            "requires_graph": self.requires_graph
-        }
+        """Serialize the question (built once and reused; treat as read-only)."""
+        if self._cached_dict is None:
+            object.__setattr__(self, "_cached_dict", {
+                "id": self.id,
+                "question": self.question,
+                "category": self.category.value,
+                "difficulty": self.difficulty.value,
+                "ground_truth": self.ground_truth,
+                "expected_entities": self.expected_entities,
+                "expected_keywords": self.expected_keywords,
+                "requires_graph": self.requires_graph
+            })
+        return self._cached_dict
 
 
 # ============================================================================
 # BENCHMARK QUESTIONS (50+)
 # ============================================================================
 
-BENCHMARK_QUESTIONS: List[BenchmarkQuestion] = [
+# One row per question, in BenchmarkQuestion field order: (id, question,
+# category, difficulty, ground truth, expected entities, expected keywords,
+# requires graph). Plain constant data, built into questions in one pass below.
+_ROWS: Tuple[tuple, ...] = (
     # =========================================================================
     # CATEGORY 1: ENTITY LOOKUP (Direct Fact Retrieval)
     # =========================================================================
-    BenchmarkQuestion(
-        id="EL001",
-        question="What is the price of Nike Air Max 270?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.EASY,
-        ground_truth="Nike Air Max 270 is a premium running shoe priced around ₹8000-₹15000.",
-        expected_entities=["Nike", "Air Max 270"],
-        expected_keywords=["price", "₹", "running", "shoe"],
-        requires_graph=False
-    ),
-    BenchmarkQuestion(
-        id="EL002",
-        question="What brand manufactures the UltraBoost Light sneakers?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.EASY,
-        ground_truth="UltraBoost Light sneakers are manufactured by Adidas.",
-        expected_entities=["Adidas", "UltraBoost Light"],
-        expected_keywords=["Adidas", "brand", "manufactures"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="EL003",
-        question="What is the rating of Samsung Galaxy S24 Ultra?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.EASY,
-        ground_truth="Samsung Galaxy S24 Ultra typically has high ratings between 4.5 to 5.0 stars.",
-        expected_entities=["Samsung", "Galaxy S24 Ultra"],
-        expected_keywords=["rating", "stars", "4", "5"],
-        requires_graph=False
-    ),
-    BenchmarkQuestion(
-        id="EL004",
-        question="What category does iPhone 15 Pro Max belong to?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.EASY,
-        ground_truth="iPhone 15 Pro Max belongs to the Electronics/Smartphones category.",
-        expected_entities=["Apple", "iPhone 15 Pro Max"],
-        expected_keywords=["category", "electronics", "smartphone"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="EL005",
-        question="What are the key features of Sony WH-1000XM5 headphones?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Sony WH-1000XM5 features include active noise cancellation, long battery life, and premium sound quality.",
-        expected_entities=["Sony", "WH-1000XM5"],
-        expected_keywords=["noise cancellation", "battery", "sound"],
-        requires_graph=False
-    ),
-    BenchmarkQuestion(
-        id="EL006",
-        question="How much does the Puma RS-X sneaker cost?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.EASY,
-        ground_truth="Puma RS-X sneakers are priced around ₹6000-₹9000.",
-        expected_entities=["Puma", "RS-X"],
-        expected_keywords=["price", "₹", "cost"],
-        requires_graph=False
-    ),
-    BenchmarkQuestion(
-        id="EL007",
-        question="What is the description of Levi's Premium Jeans?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Levi's Premium Jeans are classic fit jeans made from high-quality fabric.",
-        expected_entities=["Levi's", "Jeans"],
-        expected_keywords=["jeans", "fabric", "classic"],
-        requires_graph=False
-    ),
-    BenchmarkQuestion(
-        id="EL008",
-        question="What brand makes the MacBook Air M2?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.EASY,
-        ground_truth="MacBook Air M2 is manufactured by Apple.",
-        expected_entities=["Apple", "MacBook Air M2"],
-        expected_keywords=["Apple", "laptop", "brand"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="EL009",
-        question="What is the price range for Reebok fitness shoes?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.EASY,
-        ground_truth="Reebok fitness shoes are typically priced between ₹2000-₹15000.",
-        expected_entities=["Reebok"],
-        expected_keywords=["price", "₹", "fitness", "shoes"],
-        requires_graph=False
-    ),
-    BenchmarkQuestion(
-        id="EL010",
-        question="How many reviews does the Dell XPS 15 have?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Dell XPS 15 laptops typically have hundreds to thousands of reviews.",
-        expected_entities=["Dell", "XPS 15"],
-        expected_keywords=["reviews", "laptop"],
-        requires_graph=False
-    ),
-    BenchmarkQuestion(
-        id="EL011",
-        question="What are the specifictions of HP Spectre x360?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="HP Spectre x360 features high RAM (16/32GB), SSD storage, and varying processors.",
-        expected_entities=["HP", "Spectre x360"],
-        expected_keywords=["laptop", "RAM", "SSD"],
-        requires_graph=False
-    ),
-    BenchmarkQuestion(
-        id="EL012",
-        question="What is the rating of Allen Solly shirts?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.EASY,
-        ground_truth="Allen Solly shirts typically have ratings between 3.5 and 4.6.",
-        expected_entities=["Allen Solly"],
-        expected_keywords=["rating", "stars", "shirt"],
-        requires_graph=False
-    ),
+    ("EL001", "What is the price of Nike Air Max 270?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.EASY,
+     "Nike Air Max 270 is a premium running shoe priced around ₹8000-₹15000.",
+     ("Nike", "Air Max 270"),
+     ("price", "₹", "running", "shoe"),
+     False),
+    ("EL002", "What brand manufactures the UltraBoost Light sneakers?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.EASY,
+     "UltraBoost Light sneakers are manufactured by Adidas.",
+     ("Adidas", "UltraBoost Light"),
+     ("Adidas", "brand", "manufactures"),
+     True),
+    ("EL003", "What is the rating of Samsung Galaxy S24 Ultra?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.EASY,
+     "Samsung Galaxy S24 Ultra typically has high ratings between 4.5 to 5.0 stars.",
+     ("Samsung", "Galaxy S24 Ultra"),
+     ("rating", "stars", "4", "5"),
+     False),
+    ("EL004", "What category does iPhone 15 Pro Max belong to?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.EASY,
+     "iPhone 15 Pro Max belongs to the Electronics/Smartphones category.",
+     ("Apple", "iPhone 15 Pro Max"),
+     ("category", "electronics", "smartphone"),
+     True),
+    ("EL005", "What are the key features of Sony WH-1000XM5 headphones?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.MEDIUM,
+     "Sony WH-1000XM5 features include active noise cancellation, long battery life, and premium sound quality.",
+     ("Sony", "WH-1000XM5"),
+     ("noise cancellation", "battery", "sound"),
+     False),
+    ("EL006", "How much does the Puma RS-X sneaker cost?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.EASY,
+     "Puma RS-X sneakers are priced around ₹6000-₹9000.",
+     ("Puma", "RS-X"),
+     ("price", "₹", "cost"),
+     False),
+    ("EL007", "What is the description of Levi's Premium Jeans?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.MEDIUM,
+     "Levi's Premium Jeans are classic fit jeans made from high-quality fabric.",
+     ("Levi's", "Jeans"),
+     ("jeans", "fabric", "classic"),
+     False),
+    ("EL008", "What brand makes the MacBook Air M2?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.EASY,
+     "MacBook Air M2 is manufactured by Apple.",
+     ("Apple", "MacBook Air M2"),
+     ("Apple", "laptop", "brand"),
+     True),
+    ("EL009", "What is the price range for Reebok fitness shoes?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.EASY,
+     "Reebok fitness shoes are typically priced between ₹2000-₹15000.",
+     ("Reebok",),
+     ("price", "₹", "fitness", "shoes"),
+     False),
+    ("EL010", "How many reviews does the Dell XPS 15 have?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.MEDIUM,
+     "Dell XPS 15 laptops typically have hundreds to thousands of reviews.",
+     ("Dell", "XPS 15"),
+     ("reviews", "laptop"),
+     False),
+    ("EL011", "What are the specifictions of HP Spectre x360?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.MEDIUM,
+     "HP Spectre x360 features high RAM (16/32GB), SSD storage, and varying processors.",
+     ("HP", "Spectre x360"),
+     ("laptop", "RAM", "SSD"),
+     False),
+    ("EL012", "What is the rating of Allen Solly shirts?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.EASY,
+     "Allen Solly shirts typically have ratings between 3.5 and 4.6.",
+     ("Allen Solly",),
+     ("rating", "stars", "shirt"),
+     False),
 
     # =========================================================================
     # CATEGORY 2: RELATIONSHIP QUERIES
     # =========================================================================
-    BenchmarkQuestion(
-        id="REL001",
-        question="What products does Adidas manufacture?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.EASY,
-        ground_truth="Adidas manufactures UltraBoost, Superstar, Stan Smith shoes, and various clothing items.",
-        expected_entities=["Adidas"],
-        expected_keywords=["shoes", "clothing", "UltraBoost"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="REL002",
-        question="Which brands are in the Footwear/Shoes category?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Footwear category includes Nike, Adidas, Puma, Reebok, New Balance, Skechers, Asics, Woodland.",
-        expected_entities=["Nike", "Adidas", "Puma", "Skechers"],
-        expected_keywords=["Nike", "Adidas", "Puma", "Skechers"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="REL003",
-        question="What categories does Nike have products in?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Nike has products in Shoes and Clothing categories.",
-        expected_entities=["Nike"],
-        expected_keywords=["shoes", "clothing", "categories"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="REL004",
-        question="List all products by Samsung",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.EASY,
-        ground_truth="Samsung products include Galaxy smartphones and Galaxy Book laptops.",
-        expected_entities=["Samsung"],
-        expected_keywords=["Galaxy", "smartphone", "laptop"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="REL005",
-        question="Which products belong to the Electronics category?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Electronics category includes Smartphones, Laptops, and Headphones.",
-        expected_entities=[],
-        expected_keywords=["smartphone", "laptop", "headphone", "electronics"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="REL006",
-        question="What is the relationship between Apple and iPhone 15?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.EASY,
-        ground_truth="Apple is the brand that manufactures iPhone 15 smartphones.",
-        expected_entities=["Apple", "iPhone 15"],
-        expected_keywords=["manufactures", "brand", "Apple", "iPhone"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="REL007",
-        question="Which brands compete with Nike in running shoes?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.HARD,
-        ground_truth="Nike competes with Adidas, Puma, New Balance, Asics, and Reebok in the shoe category.",
-        expected_entities=["Nike", "Adidas", "Puma"],
-        expected_keywords=["Adidas", "Puma", "compete"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="REL008",
-        question="What products are in the price range ₹20000-₹50000?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Products in this range include mid-range laptops, premium headphones, and some smartphones.",
-        expected_entities=[],
-        expected_keywords=["laptop", "headphone", "smartphone"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="REL009",
-        question="List brands that sell products under ₹5000",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Brands with budget products include Boat, various Clothing brands, Grocery, and Stationery brands.",
-        expected_entities=["Boat"],
-        expected_keywords=["budget", "clothing", "stationery"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="REL010",
-        question="What products does Apple make besides iPhones?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Apple makes MacBook laptops (Air/Pro) and AirPods headphones besides iPhones.",
-        expected_entities=["Apple", "MacBook", "AirPods"],
-        expected_keywords=["MacBook", "AirPods", "laptop", "headphone"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="REL011",
-        question="Which category has the most expensive products?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.HARD,
-        ground_truth="Laptops (Electronics) typically have the highest price points, reaching up to ₹250,000.",
-        expected_entities=["Laptops"],
-        expected_keywords=["laptop", "expensive", "250000"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="REL012",
-        question="What brands are connected to the Clothing category?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Clothing brands include Levi's, Allen Solly, Van Heusen, Zara, H&M, Nike, Adidas, etc.",
-        expected_entities=["Levi's", "Zara", "Nike"],
-        expected_keywords=["Levi's", "clothing", "brands"],
-        requires_graph=True
-    ),
+    ("REL001", "What products does Adidas manufacture?",
+     QuestionCategory.RELATIONSHIP, Difficulty.EASY,
+     "Adidas manufactures UltraBoost, Superstar, Stan Smith shoes, and various clothing items.",
+     ("Adidas",),
+     ("shoes", "clothing", "UltraBoost"),
+     True),
+    ("REL002", "Which brands are in the Footwear/Shoes category?",
+     QuestionCategory.RELATIONSHIP, Difficulty.MEDIUM,
+     "Footwear category includes Nike, Adidas, Puma, Reebok, New Balance, Skechers, Asics, Woodland.",
+     ("Nike", "Adidas", "Puma", "Skechers"),
+     ("Nike", "Adidas", "Puma", "Skechers"),
+     True),
+    ("REL003", "What categories does Nike have products in?",
+     QuestionCategory.RELATIONSHIP, Difficulty.MEDIUM,
+     "Nike has products in Shoes and Clothing categories.",
+     ("Nike",),
+     ("shoes", "clothing", "categories"),
+     True),
+    ("REL004", "List all products by Samsung",
+     QuestionCategory.RELATIONSHIP, Difficulty.EASY,
+     "Samsung products include Galaxy smartphones and Galaxy Book laptops.",
+     ("Samsung",),
+     ("Galaxy", "smartphone", "laptop"),
+     True),
+    ("REL005", "Which products belong to the Electronics category?",
+     QuestionCategory.RELATIONSHIP, Difficulty.MEDIUM,
+     "Electronics category includes Smartphones, Laptops, and Headphones.",
+     (),
+     ("smartphone", "laptop", "headphone", "electronics"),
+     True),
+    ("REL006", "What is the relationship between Apple and iPhone 15?",
+     QuestionCategory.RELATIONSHIP, Difficulty.EASY,
+     "Apple is the brand that manufactures iPhone 15 smartphones.",
+     ("Apple", "iPhone 15"),
+     ("manufactures", "brand", "Apple", "iPhone"),
+     True),
+    ("REL007", "Which brands compete with Nike in running shoes?",
+     QuestionCategory.RELATIONSHIP, Difficulty.HARD,
+     "Nike competes with Adidas, Puma, New Balance, Asics, and Reebok in the shoe category.",
+     ("Nike", "Adidas", "Puma"),
+     ("Adidas", "Puma", "compete"),
+     True),
+    ("REL008", "What products are in the price range ₹20000-₹50000?",
+     QuestionCategory.RELATIONSHIP, Difficulty.MEDIUM,
+     "Products in this range include mid-range laptops, premium headphones, and some smartphones.",
+     (),
+     ("laptop", "headphone", "smartphone"),
+     True),
+    ("REL009", "List brands that sell products under ₹5000",
+     QuestionCategory.RELATIONSHIP, Difficulty.MEDIUM,
+     "Brands with budget products include Boat, various Clothing brands, Grocery, and Stationery brands.",
+     ("Boat",),
+     ("budget", "clothing", "stationery"),
+     True),
+    ("REL010", "What products does Apple make besides iPhones?",
+     QuestionCategory.RELATIONSHIP, Difficulty.MEDIUM,
+     "Apple makes MacBook laptops (Air/Pro) and AirPods headphones besides iPhones.",
+     ("Apple", "MacBook", "AirPods"),
+     ("MacBook", "AirPods", "laptop", "headphone"),
+     True),
+    ("REL011", "Which category has the most expensive products?",
+     QuestionCategory.RELATIONSHIP, Difficulty.HARD,
+     "Laptops (Electronics) typically have the highest price points, reaching up to ₹250,000.",
+     ("Laptops",),
+     ("laptop", "expensive", "250000"),
+     True),
+    ("REL012", "What brands are connected to the Clothing category?",
+     QuestionCategory.RELATIONSHIP, Difficulty.MEDIUM,
+     "Clothing brands include Levi's, Allen Solly, Van Heusen, Zara, H&M, Nike, Adidas, etc.",
+     ("Levi's", "Zara", "Nike"),
+     ("Levi's", "clothing", "brands"),
+     True),
 
     # =========================================================================
     # CATEGORY 3: COMPARISON QUERIES
     # =========================================================================
-    BenchmarkQuestion(
-        id="CMP001",
-        question="Compare Nike and Adidas shoes",
-        category=QuestionCategory.COMPARISON,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Nike offers Air Max and Pegasus, while Adidas offers UltraBoost and Superstar. Both have similar pricing and ratings.",
-        expected_entities=["Nike", "Adidas"],
-        expected_keywords=["Nike", "Adidas", "running", "compare"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="CMP002",
-        question="Which is better rated: Samsung or Apple smartphones?",
-        category=QuestionCategory.COMPARISON,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Both Samsung (Galaxy) and Apple (iPhone) have high ratings (4.0-5.0), with premium models performing similarly.",
-        expected_entities=["Samsung", "Apple"],
-        expected_keywords=["Samsung", "Apple", "rating", "better"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="CMP003",
-        question="Compare prices of Sony and Bose headphones",
-        category=QuestionCategory.COMPARISON,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Sony (WH-1000XM5) and Bose (QuietComfort) are similarly priced premium headphones in the ₹20k-₹35k range.",
-        expected_entities=["Sony", "Bose"],
-        expected_keywords=["Sony", "Bose", "price", "headphones"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="CMP004",
-        question="Nike vs Puma: which has more varied shoe models?",
-        category=QuestionCategory.COMPARISON,
-        difficulty=Difficulty.HARD,
-        ground_truth="Nike has Air Max, Air Force, Pegasus, Jordan. Puma has RS-X, Nitro, Suede. Both offer good variety.",
-        expected_entities=["Nike", "Puma"],
-        expected_keywords=["Nike", "Puma", "variety"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="CMP005",
-        question="Compare Dell and HP laptops",
-        category=QuestionCategory.COMPARISON,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Dell (XPS, Inspiron) and HP (Spectre, Pavilion) both offer laptops ranging from budget to premium.",
-        expected_entities=["Dell", "HP"],
-        expected_keywords=["Dell", "HP", "laptop", "compare"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="CMP006",
-        question="Which brand has higher ratings: Reebok or New Balance?",
-        category=QuestionCategory.COMPARISON,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Both Reebok and New Balance have strong customer reviews, often averaging above 4.0 stars.",
-        expected_entities=["Reebok", "New Balance"],
-        expected_keywords=["Reebok", "New Balance", "reviews"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="CMP007",
-        question="Compare Levi's and Allen Solly clothing",
-        category=QuestionCategory.COMPARISON,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Levi's is known for Jeans/Denim, while Allen Solly focuses more on Shirts and Trousers/Workwear.",
-        expected_entities=["Levi's", "Allen Solly"],
-        expected_keywords=["Levi's", "Allen Solly", "jeans", "shirt"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="CMP008",
-        question="Dell vs Apple: which laptop is more expensive?",
-        category=QuestionCategory.COMPARISON,
-        difficulty=Difficulty.HARD,
-        ground_truth="Apple MacBooks (Air/Pro) are consistently premium priced. Dell has both budget (Inspiron) and premium (XPS). Apple average is higher.",
-        expected_entities=["Dell", "Apple"],
-        expected_keywords=["Dell", "Apple", "expensive", "laptop"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="CMP009",
-        question="Compare features of Adidas UltraBoost and Nike Air Max 270",
-        category=QuestionCategory.COMPARISON,
-        difficulty=Difficulty.HARD,
-        ground_truth="UltraBoost emphasizes Boost cushioning. Air Max 270 emphasizes Air unit cushioning. Both are top-tier runners.",
-        expected_entities=["Adidas", "Nike", "UltraBoost", "Air Max"],
-        expected_keywords=["cushioning", "features", "running"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="CMP010",
-        question="Which is more affordable: Boat or Sony headphones?",
-        category=QuestionCategory.COMPARISON,
-        difficulty=Difficulty.EASY,
-        ground_truth="Boat headphones are significantly more affordable (budget segment) compared to Sony's premium lineup.",
-        expected_entities=["Boat", "Sony"],
-        expected_keywords=["Boat", "Sony", "affordable", "price"],
-        requires_graph=True
-    ),
+    ("CMP001", "Compare Nike and Adidas shoes",
+     QuestionCategory.COMPARISON, Difficulty.MEDIUM,
+     "Nike offers Air Max and Pegasus, while Adidas offers UltraBoost and Superstar. Both have similar pricing and ratings.",
+     ("Nike", "Adidas"),
+     ("Nike", "Adidas", "running", "compare"),
+     True),
+    ("CMP002", "Which is better rated: Samsung or Apple smartphones?",
+     QuestionCategory.COMPARISON, Difficulty.MEDIUM,
+     "Both Samsung (Galaxy) and Apple (iPhone) have high ratings (4.0-5.0), with premium models performing similarly.",
+     ("Samsung", "Apple"),
+     ("Samsung", "Apple", "rating", "better"),
+     True),
+    ("CMP003", "Compare prices of Sony and Bose headphones",
+     QuestionCategory.COMPARISON, Difficulty.MEDIUM,
+     "Sony (WH-1000XM5) and Bose (QuietComfort) are similarly priced premium headphones in the ₹20k-₹35k range.",
+     ("Sony", "Bose"),
+     ("Sony", "Bose", "price", "headphones"),
+     True),
+    ("CMP004", "Nike vs Puma: which has more varied shoe models?",
+     QuestionCategory.COMPARISON, Difficulty.HARD,
+     "Nike has Air Max, Air Force, Pegasus, Jordan. Puma has RS-X, Nitro, Suede. Both offer good variety.",
+     ("Nike", "Puma"),
+     ("Nike", "Puma", "variety"),
+     True),
+    ("CMP005", "Compare Dell and HP laptops",
+     QuestionCategory.COMPARISON, Difficulty.MEDIUM,
+     "Dell (XPS, Inspiron) and HP (Spectre, Pavilion) both offer laptops ranging from budget to premium.",
+     ("Dell", "HP"),
+     ("Dell", "HP", "laptop", "compare"),
+     True),
+    ("CMP006", "Which brand has higher ratings: Reebok or New Balance?",
+     QuestionCategory.COMPARISON, Difficulty.MEDIUM,
+     "Both Reebok and New Balance have strong customer reviews, often averaging above 4.0 stars.",
+     ("Reebok", "New Balance"),
+     ("Reebok", "New Balance", "reviews"),
+     True),
+    ("CMP007", "Compare Levi's and Allen Solly clothing",
+     QuestionCategory.COMPARISON, Difficulty.MEDIUM,
+     "Levi's is known for Jeans/Denim, while Allen Solly focuses more on Shirts and Trousers/Workwear.",
+     ("Levi's", "Allen Solly"),
+     ("Levi's", "Allen Solly", "jeans", "shirt"),
+     True),
+    ("CMP008", "Dell vs Apple: which laptop is more expensive?",
+     QuestionCategory.COMPARISON, Difficulty.HARD,
+     "Apple MacBooks (Air/Pro) are consistently premium priced. Dell has both budget (Inspiron) and premium (XPS). Apple average is higher.",
+     ("Dell", "Apple"),
+     ("Dell", "Apple", "expensive", "laptop"),
+     True),
+    ("CMP009", "Compare features of Adidas UltraBoost and Nike Air Max 270",
+     QuestionCategory.COMPARISON, Difficulty.HARD,
+     "UltraBoost emphasizes Boost cushioning. Air Max 270 emphasizes Air unit cushioning. Both are top-tier runners.",
+     ("Adidas", "Nike", "UltraBoost", "Air Max"),
+     ("cushioning", "features", "running"),
+     True),
+    ("CMP010", "Which is more affordable: Boat or Sony headphones?",
+     QuestionCategory.COMPARISON, Difficulty.EASY,
+     "Boat headphones are significantly more affordable (budget segment) compared to Sony's premium lineup.",
+     ("Boat", "Sony"),
+     ("Boat", "Sony", "affordable", "price"),
+     True),
 
     # =========================================================================
     # CATEGORY 4: AGGREGATION QUERIES
     # =========================================================================
-    BenchmarkQuestion(
-        id="AGG001",
-        question="What is the average price of Shoes?",
-        category=QuestionCategory.AGGREGATION,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Shoes average around ₹4000-₹8000, dependent on brand and type.",
-        expected_entities=[],
-        expected_keywords=["average", "price", "shoes", "₹"],
-        requires_graph=False
-    ),
-    BenchmarkQuestion(
-        id="AGG002",
-        question="How many brands are in the Electronics category?",
-        category=QuestionCategory.AGGREGATION,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Electronics includes many brands: Apple, Samsung, OnePlus, Dell, HP, Sony, Bose, etc.",
-        expected_entities=["Samsung", "Apple", "Sony"],
-        expected_keywords=["brands", "electronics"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="AGG003",
-        question="What is the price range for premium headphones?",
-        category=QuestionCategory.AGGREGATION,
-        difficulty=Difficulty.EASY,
-        ground_truth="Premium headphones (Sony, Bose, Apple) typically range from ₹15000 to ₹40000.",
-        expected_entities=["Sony", "Bose"],
-        expected_keywords=["premium", "headphones", "price"],
-        requires_graph=False
-    ),
-    BenchmarkQuestion(
-        id="AGG004",
-        question="Which category has the highest rated products?",
-        category=QuestionCategory.AGGREGATION,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Premium Electronics (like Laptops/Phones) often have high ratings, as do premium Shoes.",
-        expected_entities=[],
-        expected_keywords=["highest", "rating", "category"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="AGG005",
-        question="What is the total number of products in Clothing?",
-        category=QuestionCategory.AGGREGATION,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="The Clothing category contains products from many brands like Levis, Zara, etc.",
-        expected_entities=["Clothing"],
-        expected_keywords=["clothing", "products"],
-        requires_graph=True
-    ),
+    ("AGG001", "What is the average price of Shoes?",
+     QuestionCategory.AGGREGATION, Difficulty.MEDIUM,
+     "Shoes average around ₹4000-₹8000, dependent on brand and type.",
+     (),
+     ("average", "price", "shoes", "₹"),
+     False),
+    ("AGG002", "How many brands are in the Electronics category?",
+     QuestionCategory.AGGREGATION, Difficulty.MEDIUM,
+     "Electronics includes many brands: Apple, Samsung, OnePlus, Dell, HP, Sony, Bose, etc.",
+     ("Samsung", "Apple", "Sony"),
+     ("brands", "electronics"),
+     True),
+    ("AGG003", "What is the price range for premium headphones?",
+     QuestionCategory.AGGREGATION, Difficulty.EASY,
+     "Premium headphones (Sony, Bose, Apple) typically range from ₹15000 to ₹40000.",
+     ("Sony", "Bose"),
+     ("premium", "headphones", "price"),
+     False),
+    ("AGG004", "Which category has the highest rated products?",
+     QuestionCategory.AGGREGATION, Difficulty.MEDIUM,
+     "Premium Electronics (like Laptops/Phones) often have high ratings, as do premium Shoes.",
+     (),
+     ("highest", "rating", "category"),
+     True),
+    ("AGG005", "What is the total number of products in Clothing?",
+     QuestionCategory.AGGREGATION, Difficulty.MEDIUM,
+     "The Clothing category contains products from many brands like Levis, Zara, etc.",
+     ("Clothing",),
+     ("clothing", "products"),
+     True),
 
     # =========================================================================
     # CATEGORY 5: REASONING QUERIES
     # =========================================================================
-    BenchmarkQuestion(
-        id="RSN001",
-        question="Recommend a laptop under ₹80000",
-        category=QuestionCategory.REASONING,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Consider Dell Inspiron, HP Pavilion, or basic MacBook Air M1 models (if on sale/refurb).",
-        expected_entities=["Dell", "HP", "Apple"],
-        expected_keywords=["laptop", "recommend", "₹80000"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="RSN002",
-        question="Best budget smartphone with good ratings?",
-        category=QuestionCategory.REASONING,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Samsung Galaxy M34, OnePlus Nord CE 3 Lite, or Realme phones are good budget options.",
-        expected_entities=["Samsung", "OnePlus", "Realme"],
-        expected_keywords=["budget", "smartphone", "rating"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="RSN003",
-        question="Suggest headphones with noise cancellation for travel",
-        category=QuestionCategory.REASONING,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Sony WH-1000XM5 or Bose QuietComfort Ultra are excellent for travel noise cancellation.",
-        expected_entities=["Sony", "Bose"],
-        expected_keywords=["headphones", "noise cancellation", "travel"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="RSN004",
-        question="Which Nike shoe is best for running?",
-        category=QuestionCategory.REASONING,
-        difficulty=Difficulty.HARD,
-        ground_truth="Nike Pegasus 40 or Air Max 270 are popular choices for running.",
-        expected_entities=["Nike", "Pegasus", "Air Max"],
-        expected_keywords=["running", "shoe", "Nike"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="RSN005",
-        question="I need durable jeans. What brand to buy?",
-        category=QuestionCategory.REASONING,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Levi's is the most renowned brand for durable denim jeans.",
-        expected_entities=["Levi's"],
-        expected_keywords=["jeans", "durable", "Levi's"],
-        requires_graph=True
-    ),
+    ("RSN001", "Recommend a laptop under ₹80000",
+     QuestionCategory.REASONING, Difficulty.MEDIUM,
+     "Consider Dell Inspiron, HP Pavilion, or basic MacBook Air M1 models (if on sale/refurb).",
+     ("Dell", "HP", "Apple"),
+     ("laptop", "recommend", "₹80000"),
+     True),
+    ("RSN002", "Best budget smartphone with good ratings?",
+     QuestionCategory.REASONING, Difficulty.MEDIUM,
+     "Samsung Galaxy M34, OnePlus Nord CE 3 Lite, or Realme phones are good budget options.",
+     ("Samsung", "OnePlus", "Realme"),
+     ("budget", "smartphone", "rating"),
+     True),
+    ("RSN003", "Suggest headphones with noise cancellation for travel",
+     QuestionCategory.REASONING, Difficulty.MEDIUM,
+     "Sony WH-1000XM5 or Bose QuietComfort Ultra are excellent for travel noise cancellation.",
+     ("Sony", "Bose"),
+     ("headphones", "noise cancellation", "travel"),
+     True),
+    ("RSN004", "Which Nike shoe is best for running?",
+     QuestionCategory.REASONING, Difficulty.HARD,
+     "Nike Pegasus 40 or Air Max 270 are popular choices for running.",
+     ("Nike", "Pegasus", "Air Max"),
+     ("running", "shoe", "Nike"),
+     True),
+    ("RSN005", "I need durable jeans. What brand to buy?",
+     QuestionCategory.REASONING, Difficulty.MEDIUM,
+     "Levi's is the most renowned brand for durable denim jeans.",
+     ("Levi's",),
+     ("jeans", "durable", "Levi's"),
+     True),
     
     # =========================================================================
     # CATEGORY 6: EDGE CASES
     # =========================================================================
-    BenchmarkQuestion(
-        id="EDGE001",
-        question="What is the price of the XYZ-9999 product?",
-        category=QuestionCategory.ENTITY_LOOKUP,
-        difficulty=Difficulty.HARD,
-        ground_truth="There is no product named XYZ-9999 in the database.",
-        expected_entities=[],
-        expected_keywords=["not found", "no product"],
-        requires_graph=False
-    ),
-    BenchmarkQuestion(
-        id="EDGE002",
-        question="What smartphone does Adidas make?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Adidas does not manufacture smartphones. It is a footwear/clothing brand.",
-        expected_entities=["Adidas"],
-        expected_keywords=["does not", "footwear"],
-        requires_graph=True
-    ),
-    BenchmarkQuestion(
-        id="EDGE003",
-        question="What cars does Samsung sell?",
-        category=QuestionCategory.RELATIONSHIP,
-        difficulty=Difficulty.MEDIUM,
-        ground_truth="Samsung does not sell cars in this database (Electronics/Appliances only).",
-        expected_entities=["Samsung"],
-        expected_keywords=["does not", "cars"],
-        requires_graph=True
-    ),
-]
+    ("EDGE001", "What is the price of the XYZ-9999 product?",
+     QuestionCategory.ENTITY_LOOKUP, Difficulty.HARD,
+     "There is no product named XYZ-9999 in the database.",
+     (),
+     ("not found", "no product"),
+     False),
+    ("EDGE002", "What smartphone does Adidas make?",
+     QuestionCategory.RELATIONSHIP, Difficulty.MEDIUM,
+     "Adidas does not manufacture smartphones. It is a footwear/clothing brand.",
+     ("Adidas",),
+     ("does not", "footwear"),
+     True),
+    ("EDGE003", "What cars does Samsung sell?",
+     QuestionCategory.RELATIONSHIP, Difficulty.MEDIUM,
+     "Samsung does not sell cars in this database (Electronics/Appliances only).",
+     ("Samsung",),
+     ("does not", "cars"),
+     True),
+)
+
+
+@lru_cache(maxsize=None)
+def _get_all() -> Tuple[BenchmarkQuestion, ...]:
+    """
+    All benchmark questions, built from _ROWS on first use.
+    
+    Immutable, so callers and the lookup indices below can share it without
+    copying. BenchmarkQuestion is a frozen, slotted dataclass: no
+    per-instance __dict__, direct slot reads in the filter loops, and
+    hashable questions.
+    """
+    return tuple(BenchmarkQuestion(*row) for row in _ROWS)
+
+
+def __getattr__(name: str):
+    # BENCHMARK_QUESTIONS is only built when first accessed (PEP 562), so
+    # importing the module for its types or enums stays cheap
+    if name == "BENCHMARK_QUESTIONS":
+        return _get_all()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_BucketKey = Tuple[Optional[QuestionCategory], Optional[Difficulty], Optional[bool]]
+
+
+@lru_cache(maxsize=None)
+def _buckets() -> Dict[_BucketKey, Tuple[BenchmarkQuestion, ...]]:
+    """
+    Questions for every (category, difficulty, requires_graph) filter.
+    
+    None in a key position means "any", so each question lands in the 8
+    buckets its attributes can match, in dataset order. Built on first use.
+    """
+    buckets = defaultdict(list)
+    for q in _get_all():
+        for category in (None, q.category):
+            for difficulty in (None, q.difficulty):
+                for requires_graph in (None, q.requires_graph):
+                    buckets[(category, difficulty, requires_graph)].append(q)
+    return {key: tuple(questions) for key, questions in buckets.items()}
+
+
+@lru_cache(maxsize=None)
+def _id_index() -> Dict[str, BenchmarkQuestion]:
+    """Question ID -> question (the first one, should an ID repeat)."""
+    index = {}
+    for q in _get_all():
+        index.setdefault(q.id, q)
+    return index
 
 
 def get_benchmark_questions(
@@ -565,6 +456,8 @@ def get_benchmark_questions(
     """
     Get filtered benchmark questions.
     
+    Every filter combination is precomputed, so this is a dict lookup.
+    
     Args:
         category: Filter by question category
         difficulty: Filter by difficulty level
@@ -574,51 +467,30 @@ def get_benchmark_questions(
     Returns:
         List of matching BenchmarkQuestion objects
     """
-    questions = BENCHMARK_QUESTIONS.copy()
-    
-    if category:
-        questions = [q for q in questions if q.category == category]
-    
-    if difficulty:
-        questions = [q for q in questions if q.difficulty == difficulty]
-    
-    if requires_graph is not None:
-        questions = [q for q in questions if q.requires_graph == requires_graph]
-    
-    if limit:
-        questions = questions[:limit]
-    
-    return questions
+    questions = _buckets().get((category or None, difficulty or None, requires_graph), ())
+    return list(questions[:limit] if limit else questions)
 
 
 def get_question_by_id(question_id: str) -> BenchmarkQuestion:
     """Get a specific question by ID."""
-    for q in BENCHMARK_QUESTIONS:
-        if q.id == question_id:
-            return q
-    return None
+    return _id_index().get(question_id)
 
 
-def get_statistics() -> Dict[str, Any]:
-    """Get statistics about the benchmark dataset."""
-    categories = {}
-    difficulties = {}
-    graph_required = 0
+@lru_cache(maxsize=1)
+def get_statistics() -> Mapping[str, Any]:
+    """
+    Get statistics about the benchmark dataset.
     
-    for q in BENCHMARK_QUESTIONS:
-        cat = q.category.value
-        diff = q.difficulty.value
-        
-        categories[cat] = categories.get(cat, 0) + 1
-        difficulties[diff] = difficulties.get(diff, 0) + 1
-        
-        if q.requires_graph:
-            graph_required += 1
+    The dataset is immutable, so they are computed once and returned as a
+    read-only view.
+    """
+    questions = _get_all()
+    graph_required = sum(1 for q in questions if q.requires_graph)
     
-    return {
-        "total_questions": len(BENCHMARK_QUESTIONS),
-        "by_category": categories,
-        "by_difficulty": difficulties,
+    return MappingProxyType({
+        "total_questions": len(questions),
+        "by_category": MappingProxyType(Counter(q.category.value for q in questions)),
+        "by_difficulty": MappingProxyType(Counter(q.difficulty.value for q in questions)),
         "graph_required": graph_required,
-        "graph_optional": len(BENCHMARK_QUESTIONS) - graph_required
-    }
+        "graph_optional": len(questions) - graph_required
+    })
@@ -4,17 +4,276 @@ Evaluator Module - LLM-as-Judge and Metric Calculation.
 Uses Gemini to evaluate response quality and detect hallucinations.
 """
 
+import asyncio
+import json
 import logging
-import time
 import re
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
+from typing import Awaitable, Callable, Dict, Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass, field, fields
 from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import orjson
+
+# Single-pass multi-term matching for the coverage metrics, if available
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Single-pass multi-pattern scan for the hallucination rules, if available
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+from .judge_cache import JudgeCache
+from .rate_limit import TokenBucket, is_rate_limited
 
 logger = logging.getLogger(__name__)
 
+# Judge calls in flight at once in aevaluate_batch()
+MAX_CONCURRENT_JUDGE_CALLS = 5
 
-@dataclass
+# Default thread pool size of evaluate_parallel()
+DEFAULT_EVAL_WORKERS = 8
+
+# orjson options for serialized results: numpy values and non-string keys
+# (e.g. in source metadata) serialize instead of raising
+RESULT_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# How evaluate_responses() calls the judge
+EVALUATION_MODES = ("interactive", "batch")
+
+# (aggregate name, EvaluationResult attribute) averaged per mode by aggregate_results
+AGGREGATE_METRICS = [
+    ("avg_relevance_score", "relevance_score"),
+    ("avg_accuracy_score", "accuracy_score"),
+    ("avg_keyword_coverage", "keyword_coverage"),
+    ("avg_entity_coverage", "entity_coverage"),
+    ("avg_response_time_ms", "response_time_ms"),
+    ("avg_source_count", "source_count"),
+    ("hallucination_rate", "hallucination_detected"),
+    ("avg_graph_entities", "graph_entities_found"),
+    ("judge_skip_rate", "judge_skipped"),
+]
+
+# One float64 column per aggregated EvaluationResult attribute
+METRIC_DTYPE = np.dtype([(attr, np.float64) for _, attr in AGGREGATE_METRICS])
+_metric_values = attrgetter(*(attr for _, attr in AGGREGATE_METRICS))
+
+# Judge prompts are the same for every retrieval mode, so the fixed
+# instructions are built once and lead the prompt: every call shares the
+# same prefix, and only the question fields and a short answer-format
+# line follow it.
+JUDGE_PROMPT_PREFIX = """You are an expert evaluator. Rate a response to a question on two metrics (1-5 scale):
+
+1. RELEVANCE: Does the response directly address the question?
+   1 = Completely irrelevant
+   2 = Tangentially related
+   3 = Partially addresses the question
+   4 = Mostly addresses the question
+   5 = Fully addresses the question
+
+2. ACCURACY: Is the information factually correct compared to ground truth?
+   1 = Completely wrong or fabricated
+   2 = Mostly incorrect
+   3 = Partially correct
+   4 = Mostly correct with minor errors
+   5 = Fully accurate
+
+"""
+
+JUDGE_PROMPT_SUFFIX = """Respond with ONLY this JSON: {"relevance": N, "accuracy": N} where N is 1, 2, 3, 4 or 5.
+Do not include any other text."""
+
+HALLUCINATION_PROMPT_PREFIX = """Analyze if a response contains hallucinated (made-up) information, that is, information that:
+1. Is not supported by the ground truth
+2. Contains fabricated details, numbers, or facts
+3. Makes claims that contradict the ground truth
+
+"""
+
+HALLUCINATION_PROMPT_SUFFIX = """If hallucination detected, respond with a brief description of what was hallucinated.
+If no hallucination, respond with exactly: NO_HALLUCINATION"""
+
+# Relevance, accuracy and hallucination judged in one call: the judge
+# rubric, then the hallucination criteria, then a strict JSON answer format
+COMBINED_PROMPT_PREFIX = JUDGE_PROMPT_PREFIX + """3. HALLUCINATION: Does the response contain made-up information, that is, information that:
+   - Is not supported by the ground truth
+   - Contains fabricated details, numbers, or facts
+   - Makes claims that contradict the ground truth
+
+"""
+
+COMBINED_PROMPT_SUFFIX = """Respond ONLY with a JSON object, like:
+{"relevance": 4, "accuracy": 5, "hallucination": "NO"}
+"hallucination" is "NO", or a brief description of what was hallucinated.
+Do not include any other text."""
+
+# Rule-based hallucination checks (see Evaluator._hallucination_indicators)
+PRICE_RE = re.compile(r'₹\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)')
+
+INVENTED_ENTITIES = ["XYZ", "ABC Corp", "Made-up Brand", "Generic Product 9000"]
+INVENTED_ENTITY_RE = re.compile("|".join(map(re.escape, INVENTED_ENTITIES)), re.IGNORECASE)
+
+NEGATIVE_INDICATORS = ["not found", "does not exist", "no product", "unavailable"]
+NEGATIVE_RE = re.compile("|".join(map(re.escape, NEGATIVE_INDICATORS)), re.IGNORECASE)
+
+# Hyperscan expression ids: the price pattern, one per invented entity, then
+# any negative indicator
+_PRICE_ID = 0
+_NEGATIVE_ID = len(INVENTED_ENTITIES) + 1
+
+# The JSON object in a judge reply, with any code fence or chatter around it
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+# Judge calls are deterministic and their replies short
+JUDGE_TEMPERATURE = 0.0
+JUDGE_MAX_TOKENS = 32            # {"relevance": N, "accuracy": N}
+COMBINED_JUDGE_MAX_TOKENS = 256  # plus a brief hallucination description
+
+
+def _json_reply(reply: str) -> Dict[str, Any]:
+    """The JSON object in a judge reply; raises ValueError if there is none."""
+    match = _JSON_OBJECT.search(reply)
+    if match is None:
+        raise ValueError("no JSON object in reply")
+    return json.loads(match.group(0))
+
+
+@lru_cache(maxsize=1024)
+def lowered_terms(terms: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Lowercased expected keywords/entities for case-insensitive matching.
+    
+    Benchmark questions keep their terms in tuples, so each question's
+    terms are lowercased once and reused on every evaluation.
+    """
+    return tuple(term.lower() for term in terms)
+
+
+@lru_cache(maxsize=256)
+def lowered(text: str) -> str:
+    """
+    Lowercased text, cached.
+    
+    One evaluation checks the same response in several places (fast path,
+    coverage, fallback scoring, hallucination rules), and questions and
+    ground truths repeat across modes, so each is lowercased once.
+    """
+    return text.lower()
+
+
+@lru_cache(maxsize=4096)
+def reference_word_counts(text: str) -> Counter:
+    """Lowercased word counts of a question or ground truth, cached (do not mutate)."""
+    return Counter(text.lower().split())
+
+
+@lru_cache(maxsize=1024)
+def _term_automaton(terms: Tuple[str, ...]):
+    """Aho-Corasick automaton over a question's lowercased terms, built once."""
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        if term:
+            automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+
+def count_found(response_lower: str, terms: Tuple[str, ...]) -> int:
+    """
+    Count the lowercased terms that occur in a lowercased response.
+    
+    With pyahocorasick installed, the response is scanned once for all
+    terms; otherwise each term is a separate substring search.
+    """
+    if HAS_AHOCORASICK and any(terms):
+        found = {term for _, term in _term_automaton(terms).iter(response_lower)}
+        return sum(1 for term in terms if not term or term in found)
+    
+    return sum(1 for term in terms if term in response_lower)
+
+
+class PatternHits(NamedTuple):
+    """Which rule-based hallucination patterns occur in a text."""
+    has_price: bool
+    invented_entities: Tuple[str, ...]
+    has_negative: bool
+
+
+@lru_cache(maxsize=1)
+def _hallucination_database():
+    """Hyperscan database of all rule-based hallucination patterns, compiled once."""
+    caseless = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    expressions = [PRICE_RE.pattern.encode("utf-8")]
+    expressions += [re.escape(ent).encode("utf-8") for ent in INVENTED_ENTITIES]
+    expressions.append(NEGATIVE_RE.pattern.encode("utf-8"))
+    
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP] + [caseless] * (len(expressions) - 1)
+    )
+    return database
+
+
+# Hyperscan scratch space can't be shared by concurrent scans
+_scratch = threading.local()
+
+
+def scan_hallucination_patterns(text: str) -> PatternHits:
+    """
+    Find the rule-based hallucination patterns in a text.
+    
+    With hyperscan installed, every pattern is matched in one pass over
+    the text; otherwise each pattern is a separate regex scan.
+    """
+    if not HAS_HYPERSCAN:
+        found = {match.lower() for match in INVENTED_ENTITY_RE.findall(text)}
+        return PatternHits(
+            # A plain substring check rules out most texts before the regex runs
+            has_price="₹" in text and PRICE_RE.search(text) is not None,
+            invented_entities=tuple(ent for ent in INVENTED_ENTITIES if ent.lower() in found),
+            has_negative=NEGATIVE_RE.search(text) is not None
+        )
+    
+    database = _hallucination_database()
+    scratch = getattr(_scratch, "scratch", None)
+    if scratch is None:
+        scratch = _scratch.scratch = hyperscan.Scratch(database)
+    
+    matched = set()
+    database.scan(
+        text.encode("utf-8"),
+        match_event_handler=lambda expression_id, *_: matched.add(expression_id),
+        scratch=scratch
+    )
+    return PatternHits(
+        has_price=_PRICE_ID in matched,
+        invented_entities=tuple(
+            ent for i, ent in enumerate(INVENTED_ENTITIES, start=1) if i in matched
+        ),
+        has_negative=_NEGATIVE_ID in matched
+    )
+
+
+# Ground truths repeat across modes and runs, so their scans are cached
+_ground_truth_hits = lru_cache(maxsize=1024)(scan_hallucination_patterns)
+
+
+@dataclass(slots=True)
 class EvaluationResult:
     """Result of evaluating a single response."""
     question_id: str
@@ -41,28 +300,125 @@ class EvaluationResult:
     graph_entities_found: int = 0
     
     # Metadata
+    judge_skipped: bool = False  # scored by the fast path, without the LLM judge
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "question_id": self.question_id,
-            "question": self.question,
-            "retrieval_mode": self.retrieval_mode,
-            "response": self.response,
-            "ground_truth": self.ground_truth,
-            "sources": self.sources,
-            "response_time_ms": self.response_time_ms,
-            "relevance_score": self.relevance_score,
-            "accuracy_score": self.accuracy_score,
-            "keyword_coverage": self.keyword_coverage,
-            "entity_coverage": self.entity_coverage,
-            "hallucination_detected": self.hallucination_detected,
-            "hallucination_details": self.hallucination_details,
-            "context_length": self.context_length,
-            "source_count": self.source_count,
-            "graph_entities_found": self.graph_entities_found,
-            "timestamp": self.timestamp
+        return {name: getattr(self, name) for name in _RESULT_FIELDS}
+    
+    def to_json_bytes(self, option: int = 0) -> bytes:
+        """Serialize with orjson; option adds orjson flags (e.g. OPT_APPEND_NEWLINE)."""
+        return orjson.dumps(self.to_dict(), option=RESULT_JSON_OPTIONS | option)
+
+
+# EvaluationResult fields in declaration order, as serialized by to_dict()
+_RESULT_FIELDS = tuple(f.name for f in fields(EvaluationResult))
+
+
+@dataclass(slots=True)
+class EvaluationResultBatch:
+    """
+    Aggregated metrics of many EvaluationResults as parallel NumPy columns.
+    
+    Holds only what aggregate_results needs, so callers streaming thousands
+    of results can keep the columns instead of the result objects.
+    """
+    retrieval_modes: np.ndarray  # one mode name per result
+    metrics: np.ndarray          # structured array with METRIC_DTYPE fields
+    
+    @classmethod
+    def from_results(cls, results: Sequence[EvaluationResult]) -> "EvaluationResultBatch":
+        """Collect the metric columns in one pass over the results."""
+        return cls(
+            retrieval_modes=np.array([r.retrieval_mode for r in results], dtype=object),
+            metrics=np.fromiter(map(_metric_values, results), dtype=METRIC_DTYPE, count=len(results))
+        )
+    
+    def __len__(self) -> int:
+        return len(self.metrics)
+    
+    def by_mode(self) -> Dict[str, Dict[str, float]]:
+        """Result count and metric means per retrieval mode, in first-seen order."""
+        modes = list(dict.fromkeys(self.retrieval_modes.tolist()))
+        codes = np.fromiter(
+            map({mode: i for i, mode in enumerate(modes)}.__getitem__, self.retrieval_modes),
+            dtype=np.intp,
+            count=len(self)
+        )
+        
+        # Per-mode sums of every column, one bincount pass each
+        counts = np.bincount(codes, minlength=len(modes))
+        means = {
+            name: np.bincount(codes, weights=self.metrics[attr], minlength=len(modes)) / counts
+            for name, attr in AGGREGATE_METRICS
         }
+        
+        aggregates = {}
+        for i, mode in enumerate(modes):
+            aggregates[mode] = {"count": int(counts[i])}
+            aggregates[mode].update((name, float(column[i])) for name, column in means.items())
+        return aggregates
+
+
+class AggregateAccumulator:
+    """
+    Running per-mode means of the aggregated metrics (Welford's update).
+    
+    Memory is constant per mode, so long or streaming runs can report
+    aggregates at any point without keeping their results. Safe to
+    update from several threads.
+    """
+    
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.means: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+    
+    def update(self, result: EvaluationResult):
+        """Fold one result into its mode's running means."""
+        values = np.array(_metric_values(result), dtype=np.float64)
+        mode = result.retrieval_mode
+        with self._lock:
+            n = self.counts.get(mode, 0) + 1
+            self.counts[mode] = n
+            if n == 1:
+                self.means[mode] = values
+            else:
+                self.means[mode] += (values - self.means[mode]) / n
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Result count and metric means per retrieval mode so far, in first-seen order."""
+        with self._lock:
+            aggregates = {}
+            for mode, mean in self.means.items():
+                aggregates[mode] = {"count": self.counts[mode]}
+                aggregates[mode].update(
+                    (name, float(value)) for (name, _), value in zip(AGGREGATE_METRICS, mean)
+                )
+            return aggregates
+    
+    def finalize(self) -> Dict[str, Any]:
+        """Summary statistics in the same form as aggregate_results()."""
+        return aggregate_results(self)
+
+
+@dataclass
+class EvalRequest:
+    """Inputs for evaluating one response (see Evaluator.evaluate_response)."""
+    question_id: str
+    question: str
+    response: str
+    ground_truth: str
+    expected_entities: Sequence[str]
+    expected_keywords: Sequence[str]
+    retrieval_mode: str
+    sources: List[Dict]
+    response_time_ms: float
+    context_length: int = 0
+    graph_entities_found: int = 0
 
 
 class Evaluator:
@@ -70,14 +426,29 @@ class Evaluator:
     Evaluator using LLM-as-Judge (Gemini) for response quality assessment.
     """
     
-    def __init__(self, llm_generator=None):
+    def __init__(
+        self,
+        llm_generator=None,
+        fast_path: bool = False,
+        judge_cache: Optional[JudgeCache] = None,
+        limiter: Optional[TokenBucket] = None
+    ):
         """
         Initialize the evaluator.
         
         Args:
             llm_generator: LLMGenerator instance for LLM-as-Judge scoring
+            fast_path: Score responses that contain every expected keyword and
+                entity, with no rule-based hallucination indicators, as fully
+                correct without calling the LLM judge
+            judge_cache: Persistent cache of judge verdicts, reused for
+                identical (question, response, ground truth) triples
+            limiter: Token bucket pacing the judge's LLM calls (None: unpaced)
         """
         self.llm_generator = llm_generator
+        self.fast_path = fast_path
+        self.judge_cache = judge_cache
+        self.limiter = limiter
     
     def evaluate_response(
         self,
@@ -85,8 +456,8 @@ class Evaluator:
         question: str,
         response: str,
         ground_truth: str,
-        expected_entities: List[str],
-        expected_keywords: List[str],
+        expected_entities: Sequence[str],
+        expected_keywords: Sequence[str],
         retrieval_mode: str,
         sources: List[Dict],
         response_time_ms: float,
@@ -99,71 +470,374 @@ class Evaluator:
         Returns:
             EvaluationResult with all metrics
         """
-        # Calculate keyword coverage
-        keyword_coverage = self._calculate_keyword_coverage(
-            response, expected_keywords
+        request = EvalRequest(
+            question_id=question_id,
+            question=question,
+            response=response,
+            ground_truth=ground_truth,
+            expected_entities=expected_entities,
+            expected_keywords=expected_keywords,
+            retrieval_mode=retrieval_mode,
+            sources=sources,
+            response_time_ms=response_time_ms,
+            context_length=context_length,
+            graph_entities_found=graph_entities_found
         )
         
-        # Calculate entity coverage
-        entity_coverage = self._calculate_entity_coverage(
-            response, expected_entities
-        )
+        fast_result = self._fast_path_result(request)
+        if fast_result is not None:
+            return fast_result
         
-        # Get LLM-as-Judge scores
-        relevance_score, accuracy_score = self._llm_judge_scores(
-            question, response, ground_truth
-        )
+        # Scores and hallucination check from one LLM call
+        verdict = self._llm_combined_judge(question, response, ground_truth)
+        if verdict is not None:
+            return self._verdict_result(request, verdict)
         
-        # Detect hallucinations
-        time.sleep(1)  # Rate limit protection between LLM calls
-        hallucination_detected, hallucination_details = self._detect_hallucination(
-            question, response, ground_truth, expected_entities
-        )
+        # No LLM, or an unparseable combined reply: one call per metric
+        return self._judge_separately(request)
+    
+    async def aevaluate_response(
+        self,
+        question_id: str,
+        question: str,
+        response: str,
+        ground_truth: str,
+        expected_entities: Sequence[str],
+        expected_keywords: Sequence[str],
+        retrieval_mode: str,
+        sources: List[Dict],
+        response_time_ms: float,
+        context_length: int = 0,
+        graph_entities_found: int = 0
+    ) -> EvaluationResult:
+        """
+        Async version of evaluate_response() using the generator's agenerate().
         
-        return EvaluationResult(
+        Returns:
+            EvaluationResult with all metrics
+        """
+        request = EvalRequest(
             question_id=question_id,
             question=question,
-            retrieval_mode=retrieval_mode,
             response=response,
             ground_truth=ground_truth,
+            expected_entities=expected_entities,
+            expected_keywords=expected_keywords,
+            retrieval_mode=retrieval_mode,
             sources=sources,
             response_time_ms=response_time_ms,
+            context_length=context_length,
+            graph_entities_found=graph_entities_found
+        )
+        return await self._aevaluate(request, self._allm_combined_judge)
+    
+    async def _aevaluate(
+        self,
+        request: EvalRequest,
+        judge: Callable[[str, str, str], Awaitable[Optional[tuple]]]
+    ) -> EvaluationResult:
+        """Evaluate one response, getting its combined verdict from `judge`."""
+        fast_result = self._fast_path_result(request)
+        if fast_result is not None:
+            return fast_result
+        
+        verdict = await judge(request.question, request.response, request.ground_truth)
+        if verdict is not None:
+            return self._verdict_result(request, verdict)
+        
+        # The one-call-per-metric fallback is blocking, keep it off the event loop
+        return await asyncio.to_thread(self._judge_separately, request)
+    
+    async def aevaluate_batch(
+        self,
+        requests: List[EvalRequest],
+        concurrency: int = MAX_CONCURRENT_JUDGE_CALLS
+    ) -> List[EvaluationResult]:
+        """
+        Evaluate many responses concurrently.
+        
+        At most `concurrency` responses are judged at once. Identical
+        (question, response, ground truth) triples, e.g. the same short
+        answer from several retrieval modes, share one judge call. A
+        response whose evaluation raises gets keyword-overlap scores
+        instead, so one failed call does not abort the batch.
+        
+        Args:
+            requests: Responses to evaluate
+            concurrency: Maximum evaluations in flight at once
+            
+        Returns:
+            EvaluationResults in the same order as requests
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        
+        def coalesced_judge(question: str, response: str, ground_truth: str) -> asyncio.Future:
+            key = (question, response, ground_truth)
+            if key not in inflight:
+                inflight[key] = asyncio.ensure_future(
+                    self._allm_combined_judge(question, response, ground_truth)
+                )
+            return inflight[key]
+        
+        async def bounded(request: EvalRequest) -> EvaluationResult:
+            async with semaphore:
+                return await self._aevaluate(request, coalesced_judge)
+        
+        outcomes = await asyncio.gather(
+            *(bounded(r) for r in requests),
+            return_exceptions=True
+        )
+        
+        return [
+            self._failed_result(request, outcome) if isinstance(outcome, Exception) else outcome
+            for request, outcome in zip(requests, outcomes)
+        ]
+    
+    def evaluate_parallel(
+        self,
+        requests: List[EvalRequest],
+        max_workers: int = DEFAULT_EVAL_WORKERS
+    ) -> List[EvaluationResult]:
+        """
+        Evaluate many responses concurrently on a thread pool.
+        
+        For sync callers (scripts, notebooks) that can't use
+        aevaluate_batch(). A response whose evaluation raises gets
+        keyword-overlap scores instead, so one failed call does not abort
+        the batch.
+        
+        Args:
+            requests: Responses to evaluate
+            max_workers: Maximum evaluations in flight at once
+            
+        Returns:
+            EvaluationResults in the same order as requests
+        """
+        if not requests:
+            return []
+        
+        def evaluate_one(request: EvalRequest) -> EvaluationResult:
+            try:
+                return self.evaluate_response(**vars(request))
+            except Exception as e:
+                return self._failed_result(request, e)
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(requests))) as pool:
+            return list(pool.map(evaluate_one, requests))
+    
+    def _failed_result(self, request: EvalRequest, error: Exception) -> EvaluationResult:
+        """Keyword-overlap result for a response whose evaluation raised."""
+        logger.error(f"Evaluation failed for {request.question_id}: {error}")
+        relevance_score, accuracy_score = self._fallback_scoring(
+            request.question, request.response, request.ground_truth
+        )
+        return self._build_result(request, relevance_score, accuracy_score, False, "")
+    
+    def evaluate_batch(self, requests: List[EvalRequest]) -> List[EvaluationResult]:
+        """
+        Evaluate many responses with the LLM calls submitted as one batch job.
+        
+        One combined judge prompt per response goes to the generator's
+        generate_batch() in a single job. Scoring matches
+        evaluate_response(); responses whose reply cannot be parsed are
+        re-judged individually. If the batch job fails, falls back to
+        evaluating each response individually.
+        
+        Args:
+            requests: Responses to evaluate
+            
+        Returns:
+            EvaluationResults in the same order as requests
+        """
+        if not requests:
+            return []
+        
+        if not self.llm_generator:
+            return [self.evaluate_response(**vars(r)) for r in requests]
+        
+        # Responses the fast path settles are left out of the batch job
+        fast_results = [self._fast_path_result(r) for r in requests]
+        if any(result is not None for result in fast_results):
+            judged = iter(self.evaluate_batch(
+                [r for r, result in zip(requests, fast_results) if result is None]
+            ))
+            return [result if result is not None else next(judged) for result in fast_results]
+        
+        # Cached verdicts are left out of the batch job too
+        if self.judge_cache is not None:
+            verdicts = [
+                self.judge_cache.get(r.question, r.response, r.ground_truth) for r in requests
+            ]
+            if any(verdict is not None for verdict in verdicts):
+                judged = iter(self._judge_batch(
+                    [r for r, verdict in zip(requests, verdicts) if verdict is None]
+                ))
+                return [
+                    self._verdict_result(r, verdict) if verdict is not None else next(judged)
+                    for r, verdict in zip(requests, verdicts)
+                ]
+        
+        return self._judge_batch(requests)
+    
+    def _judge_batch(self, requests: List[EvalRequest]) -> List[EvaluationResult]:
+        """Judge responses with one combined prompt each, as a single batch job."""
+        if not requests:
+            return []
+        
+        prompts = [self._combined_prompt(r.question, r.response, r.ground_truth) for r in requests]
+        # Identical responses (e.g. from several retrieval modes) share one prompt
+        unique_prompts = list(dict.fromkeys(prompts))
+        
+        try:
+            unique_outputs = self.llm_generator.generate_batch(
+                unique_prompts,
+                display_name="rag-evaluation",
+                temperature=JUDGE_TEMPERATURE,
+                max_output_tokens=COMBINED_JUDGE_MAX_TOKENS
+            )
+        except Exception as e:
+            logger.error(f"Batch evaluation failed, evaluating one by one: {e}")
+            return [self.evaluate_response(**vars(r)) for r in requests]
+        
+        output_by_prompt = dict(zip(unique_prompts, unique_outputs))
+        outputs = [output_by_prompt[prompt] for prompt in prompts]
+        
+        results = []
+        for request, output in zip(requests, outputs):
+            if output is None:
+                logger.warning(f"LLM judge failed for {request.question_id}")
+                relevance_score, accuracy_score = self._fallback_scoring(
+                    request.question, request.response, request.ground_truth
+                )
+                found = self._hallucination_indicators(
+                    request.question, request.response, request.ground_truth
+                )
+                results.append(self._build_result(
+                    request, relevance_score, accuracy_score, bool(found), "; ".join(found)
+                ))
+                continue
+            
+            verdict = self._parse_combined_judge(output)
+            if verdict is None:
+                results.append(self._judge_separately(request))
+            else:
+                self._cache_verdict(request.question, request.response, request.ground_truth, verdict)
+                results.append(self._verdict_result(request, verdict))
+        
+        return results
+    
+    def _verdict_result(self, request: EvalRequest, verdict: tuple) -> EvaluationResult:
+        """Build the result for a parsed combined judge verdict."""
+        relevance_score, accuracy_score, finding = verdict
+        
+        # Rule-based indicators take precedence over the LLM's finding
+        found = self._hallucination_indicators(
+            request.question, request.response, request.ground_truth
+        )
+        if finding and not found:
+            found.append(finding)
+        
+        return self._build_result(
+            request, relevance_score, accuracy_score, bool(found), "; ".join(found)
+        )
+    
+    def _judge_separately(self, request: EvalRequest) -> EvaluationResult:
+        """Evaluate with one LLM call for the scores and one for hallucinations."""
+        relevance_score, accuracy_score = self._llm_judge_scores(
+            request.question, request.response, request.ground_truth
+        )
+        hallucination_detected, hallucination_details = self._detect_hallucination(
+            request.question, request.response, request.ground_truth, request.expected_entities
+        )
+        return self._build_result(
+            request, relevance_score, accuracy_score,
+            hallucination_detected, hallucination_details
+        )
+    
+    def _fast_path_result(self, request: EvalRequest) -> Optional[EvaluationResult]:
+        """
+        Score an obviously right or empty response without the LLM judge.
+        
+        Applies when fast_path is on and either:
+        - the response is empty (lowest scores), or
+        - the question has expected keywords or entities, the response
+          contains every one of them and the rule-based hallucination
+          checks find nothing (full scores).
+        
+        Questions without expected terms always go to the judge.
+        
+        Returns:
+            EvaluationResult marked judge_skipped, or None
+        """
+        if not self.fast_path:
+            return None
+        
+        if not request.response.strip():
+            return self._build_result(request, 1, 0.0, False, "", judge_skipped=True)
+        
+        expected = lowered_terms((*request.expected_keywords, *request.expected_entities))
+        if not expected or count_found(lowered(request.response), expected) < len(expected):
+            return None
+        
+        if self._hallucination_indicators(request.question, request.response, request.ground_truth):
+            return None
+        
+        return self._build_result(request, 5, 1.0, False, "", judge_skipped=True)
+    
+    def _build_result(
+        self,
+        request: EvalRequest,
+        relevance_score: float,
+        accuracy_score: float,
+        hallucination_detected: bool,
+        hallucination_details: str,
+        judge_skipped: bool = False
+    ) -> EvaluationResult:
+        """Combine judge scores and coverage metrics into an EvaluationResult."""
+        response_lower = lowered(request.response)
+        return EvaluationResult(
+            question_id=request.question_id,
+            question=request.question,
+            retrieval_mode=request.retrieval_mode,
+            response=request.response,
+            ground_truth=request.ground_truth,
+            sources=request.sources,
+            response_time_ms=request.response_time_ms,
             relevance_score=relevance_score,
             accuracy_score=accuracy_score,
-            keyword_coverage=keyword_coverage,
-            entity_coverage=entity_coverage,
+            keyword_coverage=self._term_coverage(response_lower, request.expected_keywords),
+            entity_coverage=self._term_coverage(response_lower, request.expected_entities),
             hallucination_detected=hallucination_detected,
             hallucination_details=hallucination_details,
-            context_length=context_length,
-            source_count=len(sources),
-            graph_entities_found=graph_entities_found
+            context_length=request.context_length,
+            source_count=len(request.sources),
+            graph_entities_found=request.graph_entities_found,
+            judge_skipped=judge_skipped
         )
     
     def _calculate_keyword_coverage(
         self, 
         response: str, 
-        expected_keywords: List[str]
+        expected_keywords: Sequence[str]
     ) -> float:
         """Calculate what percentage of expected keywords appear in response."""
-        if not expected_keywords:
-            return 1.0
-        
-        response_lower = response.lower()
-        found = sum(1 for kw in expected_keywords if kw.lower() in response_lower)
-        return found / len(expected_keywords)
+        return self._term_coverage(lowered(response), expected_keywords)
     
     def _calculate_entity_coverage(
         self, 
         response: str, 
-        expected_entities: List[str]
+        expected_entities: Sequence[str]
     ) -> float:
         """Calculate what percentage of expected entities appear in response."""
-        if not expected_entities:
+        return self._term_coverage(lowered(response), expected_entities)
+    
+    def _term_coverage(self, response_lower: str, expected: Sequence[str]) -> float:
+        """Fraction of the expected terms found in an already lowercased response."""
+        if not expected:
             return 1.0
         
-        response_lower = response.lower()
-        found = sum(1 for ent in expected_entities if ent.lower() in response_lower)
-        return found / len(expected_entities)
+        return count_found(response_lower, lowered_terms(tuple(expected))) / len(expected)
     
     def _llm_judge_scores(
         self, 
@@ -182,48 +856,198 @@ class Evaluator:
             return self._fallback_scoring(question, response, ground_truth)
         
         try:
-            judge_prompt = f"""You are an expert evaluator. Rate the following response on two dimensions.
-
-QUESTION: {question}
+            judge_response = self._generate(
+                self._judge_prompt(question, response, ground_truth),
+                max_output_tokens=JUDGE_MAX_TOKENS
+            )
+            return self._parse_judge_scores(judge_response, question, response, ground_truth)
+                
+        except Exception as e:
+            logger.error(f"LLM-as-Judge failed: {e}")
+            return self._fallback_scoring(question, response, ground_truth)
+    
+    def _llm_combined_judge(
+        self,
+        question: str,
+        response: str,
+        ground_truth: str
+    ) -> Optional[tuple]:
+        """
+        Judge relevance, accuracy and hallucination with a single LLM call.
+        
+        Returns:
+            (relevance_score, accuracy_score, hallucination description or None),
+            or None if there is no LLM or its reply could not be parsed
+        """
+        if not self.llm_generator:
+            return None
+        
+        if self.judge_cache is not None:
+            cached = self.judge_cache.get(question, response, ground_truth)
+            if cached is not None:
+                return cached
+        
+        try:
+            reply = self._generate(
+                self._combined_prompt(question, response, ground_truth),
+                max_output_tokens=COMBINED_JUDGE_MAX_TOKENS
+            )
+        except Exception as e:
+            logger.error(f"Combined LLM-as-Judge failed: {e}")
+            return None
+        
+        verdict = self._parse_combined_judge(reply)
+        self._cache_verdict(question, response, ground_truth, verdict)
+        return verdict
+    
+    async def _allm_combined_judge(
+        self,
+        question: str,
+        response: str,
+        ground_truth: str
+    ) -> Optional[tuple]:
+        """Async version of _llm_combined_judge()."""
+        if not self.llm_generator:
+            return None
+        
+        if self.judge_cache is not None:
+            cached = self.judge_cache.get(question, response, ground_truth)
+            if cached is not None:
+                return cached
+        
+        try:
+            reply = await self._agenerate(
+                self._combined_prompt(question, response, ground_truth),
+                max_output_tokens=COMBINED_JUDGE_MAX_TOKENS
+            )
+        except Exception as e:
+            logger.error(f"Combined LLM-as-Judge failed: {e}")
+            return None
+        
+        verdict = self._parse_combined_judge(reply)
+        self._cache_verdict(question, response, ground_truth, verdict)
+        return verdict
+    
+    def _cache_verdict(
+        self,
+        question: str,
+        response: str,
+        ground_truth: str,
+        verdict: Optional[tuple]
+    ):
+        """Store a parsed verdict in the judge cache, if there is one."""
+        if self.judge_cache is not None and verdict is not None:
+            self.judge_cache.put(question, response, ground_truth, verdict)
+    
+    def _generate(self, prompt: str, max_output_tokens: Optional[int] = None) -> str:
+        """
+        Call the LLM at the judge temperature, paced by the limiter and
+        slowing it down on rate limits.
+        """
+        settings = {"temperature": JUDGE_TEMPERATURE, "max_output_tokens": max_output_tokens}
+        if self.limiter is None:
+            return self.llm_generator.generate(prompt, **settings)
+        
+        self.limiter.acquire()
+        try:
+            reply = self.llm_generator.generate(prompt, **settings)
+        except Exception as e:
+            if is_rate_limited(e):
+                self.limiter.penalize()
+            raise
+        
+        if is_rate_limited(reply):
+            self.limiter.penalize()
+        else:
+            self.limiter.record_success()
+        return reply
+    
+    async def _agenerate(self, prompt: str, max_output_tokens: Optional[int] = None) -> str:
+        """Async version of _generate()."""
+        settings = {"temperature": JUDGE_TEMPERATURE, "max_output_tokens": max_output_tokens}
+        if self.limiter is None:
+            return await self.llm_generator.agenerate(prompt, **settings)
+        
+        await self.limiter.aacquire()
+        try:
+            reply = await self.llm_generator.agenerate(prompt, **settings)
+        except Exception as e:
+            if is_rate_limited(e):
+                await self.limiter.apenalize()
+            raise
+        
+        if is_rate_limited(reply):
+            await self.limiter.apenalize()
+        else:
+            self.limiter.record_success()
+        return reply
+    
+    def _combined_prompt(self, question: str, response: str, ground_truth: str) -> str:
+        """Prompt asking the LLM for scores and a hallucination verdict as JSON."""
+        return f"""{COMBINED_PROMPT_PREFIX}QUESTION: {question}
 
 EXPECTED ANSWER (Ground Truth): {ground_truth}
 
 ACTUAL RESPONSE: {response}
 
-Rate the response on these two metrics (1-5 scale):
-
-1. RELEVANCE: Does the response directly address the question?
-   1 = Completely irrelevant
-   2 = Tangentially related
-   3 = Partially addresses the question
-   4 = Mostly addresses the question
-   5 = Fully addresses the question
+{COMBINED_PROMPT_SUFFIX}"""
+    
+    def _parse_combined_judge(self, reply: str) -> Optional[tuple]:
+        """Parse a combined judge JSON reply, or None if it is malformed."""
+        try:
+            verdict = _json_reply(reply)
+            relevance = min(5, max(1, int(verdict["relevance"])))
+            accuracy = min(5, max(1, int(verdict["accuracy"])))
+            hallucination = str(verdict.get("hallucination", "NO")).strip()
+        except (TypeError, ValueError, KeyError) as e:
+            logger.warning(f"Could not parse combined judge response ({e}): {reply}")
+            return None
+        
+        finding = None
+        if hallucination.upper() not in ("NO", "NO_HALLUCINATION", ""):
+            finding = hallucination[:200]  # Truncate long responses
+        
+        return relevance, accuracy / 5.0, finding  # Convert accuracy to 0-1 scale
+    
+    def _judge_prompt(self, question: str, response: str, ground_truth: str) -> str:
+        """Prompt asking the LLM for relevance and accuracy scores."""
+        return f"""{JUDGE_PROMPT_PREFIX}QUESTION: {question}
 
-2. ACCURACY: Is the information factually correct compared to ground truth?
-   1 = Completely wrong or fabricated
-   2 = Mostly incorrect
-   3 = Partially correct
-   4 = Mostly correct with minor errors
-   5 = Fully accurate
+EXPECTED ANSWER (Ground Truth): {ground_truth}
 
-Respond ONLY with two numbers separated by a comma, like: 4,5
-Do not include any other text."""
+ACTUAL RESPONSE: {response}
 
-            judge_response = self.llm_generator.generate(judge_prompt)
-            
-            # Parse scores
-            match = re.search(r'(\d)[,\s]+(\d)', judge_response)
-            if match:
-                relevance = min(5, max(1, int(match.group(1))))
-                accuracy = min(5, max(1, int(match.group(2))))
-                return relevance, accuracy / 5.0  # Convert accuracy to 0-1 scale
-            else:
-                logger.warning(f"Could not parse LLM judge response: {judge_response}")
-                return self._fallback_scoring(question, response, ground_truth)
-                
-        except Exception as e:
-            logger.error(f"LLM-as-Judge failed: {e}")
-            return self._fallback_scoring(question, response, ground_truth)
+{JUDGE_PROMPT_SUFFIX}"""
+    
+    def _parse_judge_scores(
+        self,
+        judge_response: str,
+        question: str,
+        response: str,
+        ground_truth: str
+    ) -> tuple:
+        """
+        Parse relevance and accuracy from a judge reply.
+        
+        Expects the JSON reply the prompt asks for, then accepts a bare
+        "relevance,accuracy" pair, then falls back to word overlap.
+        """
+        try:
+            scores = _json_reply(judge_response)
+            relevance = min(5, max(1, int(scores["relevance"])))
+            accuracy = min(5, max(1, int(scores["accuracy"])))
+            return relevance, accuracy / 5.0  # Convert accuracy to 0-1 scale
+        except (TypeError, ValueError, KeyError):
+            pass
+        
+        match = re.search(r'(\d)[,\s]+(\d)', judge_response)
+        if match:
+            relevance = min(5, max(1, int(match.group(1))))
+            accuracy = min(5, max(1, int(match.group(2))))
+            return relevance, accuracy / 5.0  # Convert accuracy to 0-1 scale
+        
+        logger.warning(f"Could not parse LLM judge response: {judge_response}")
+        return self._fallback_scoring(question, response, ground_truth)
     
     def _fallback_scoring(
         self, 
@@ -231,22 +1055,27 @@ Do not include any other text."""
         response: str, 
         ground_truth: str
     ) -> tuple:
-        """Fallback scoring based on string similarity."""
+        """
+        Fallback scoring based on string similarity.
+        
+        Overlaps count words with multiplicity: a reference word that
+        appears twice is only fully matched by a response using it twice.
+        """
         # Simple word overlap scoring
-        response_words = set(response.lower().split())
-        ground_truth_words = set(ground_truth.lower().split())
-        question_words = set(question.lower().split())
+        response_words = Counter(lowered(response).split())
+        ground_truth_words = reference_word_counts(ground_truth)
+        question_words = reference_word_counts(question)
         
         # Relevance: Does response share words with question?
         if question_words:
-            relevance_overlap = len(response_words & question_words) / len(question_words)
+            relevance_overlap = (response_words & question_words).total() / question_words.total()
             relevance = min(5, max(1, int(relevance_overlap * 4) + 1))
         else:
             relevance = 3
         
         # Accuracy: Does response share words with ground truth?
         if ground_truth_words:
-            accuracy_overlap = len(response_words & ground_truth_words) / len(ground_truth_words)
+            accuracy_overlap = (response_words & ground_truth_words).total() / ground_truth_words.total()
         else:
             accuracy_overlap = 0.5
         
@@ -257,7 +1086,7 @@ Do not include any other text."""
         question: str,
         response: str,
         ground_truth: str,
-        expected_entities: List[str]
+        expected_entities: Sequence[str]
     ) -> tuple:
         """
         Detect if the response contains hallucinated information.
@@ -265,38 +1094,7 @@ Do not include any other text."""
         Returns:
             (hallucination_detected: bool, details: str)
         """
-        hallucination_indicators = []
-        
-        # Check for made-up prices (specific numbers not grounded)
-        price_pattern = r'₹\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-        response_prices = re.findall(price_pattern, response)
-        ground_truth_prices = re.findall(price_pattern, ground_truth)
-        
-        if response_prices and not ground_truth_prices:
-            # Response has specific prices but ground truth doesn't
-            hallucination_indicators.append(
-                f"Specific prices mentioned ({response_prices}) not in ground truth"
-            )
-        
-        # Check for invented entities
-        # Common hallucination: mentioning brands/products not in the context
-        invented_entities = [
-            "XYZ", "ABC Corp", "Made-up Brand", "Generic Product 9000"
-        ]
-        for ent in invented_entities:
-            if ent.lower() in response.lower():
-                hallucination_indicators.append(f"Invented entity: {ent}")
-        
-        # Check for contradictions with ground truth negatives
-        negative_indicators = ["not found", "does not exist", "no product", "unavailable"]
-        ground_has_negative = any(neg in ground_truth.lower() for neg in negative_indicators)
-        response_has_positive = not any(neg in response.lower() for neg in negative_indicators)
-        
-        if ground_has_negative and response_has_positive:
-            if "not" not in response.lower() and "no " not in response.lower():
-                hallucination_indicators.append(
-                    "Response provides info for non-existent item"
-                )
+        hallucination_indicators = self._hallucination_indicators(question, response, ground_truth)
         
         # Use LLM for deeper hallucination detection if available
         if self.llm_generator and not hallucination_indicators:
@@ -314,6 +1112,40 @@ Do not include any other text."""
         
         return detected, details
     
+    def _hallucination_indicators(
+        self,
+        question: str,
+        response: str,
+        ground_truth: str
+    ) -> List[str]:
+        """Rule-based hallucination checks (no LLM call)."""
+        hallucination_indicators = []
+        hits = scan_hallucination_patterns(response)
+        truth_hits = _ground_truth_hits(ground_truth)
+        
+        # Check for made-up prices (specific numbers not grounded)
+        if hits.has_price and not truth_hits.has_price:
+            # Response has specific prices but ground truth doesn't
+            hallucination_indicators.append(
+                f"Specific prices mentioned ({PRICE_RE.findall(response)}) not in ground truth"
+            )
+        
+        # Check for invented entities
+        # Common hallucination: mentioning brands/products not in the context
+        hallucination_indicators.extend(
+            f"Invented entity: {ent}" for ent in hits.invented_entities
+        )
+        
+        # Check for contradictions with ground truth negatives
+        if truth_hits.has_negative and not hits.has_negative:
+            response_lower = lowered(response)
+            if "not" not in response_lower and "no " not in response_lower:
+                hallucination_indicators.append(
+                    "Response provides info for non-existent item"
+                )
+        
+        return hallucination_indicators
+    
     def _llm_hallucination_check(
         self,
         question: str,
@@ -321,29 +1153,38 @@ Do not include any other text."""
         ground_truth: str
     ) -> Optional[str]:
         """Use LLM to detect subtle hallucinations."""
-        check_prompt = f"""Analyze if this response contains hallucinated (made-up) information.
-
-QUESTION: {question}
+        result = self._generate(
+            self._hallucination_prompt(question, response, ground_truth)
+        )
+        return self._parse_hallucination_check(result)
+    
+    def _hallucination_prompt(self, question: str, response: str, ground_truth: str) -> str:
+        """Prompt asking the LLM to describe hallucinated content, if any."""
+        return f"""{HALLUCINATION_PROMPT_PREFIX}QUESTION: {question}
 
 GROUND TRUTH: {ground_truth}
 
 RESPONSE TO CHECK: {response}
 
-Does the response contain any information that:
-1. Is not supported by the ground truth?
-2. Contains fabricated details, numbers, or facts?
-3. Makes claims that contradict the ground truth?
-
-If hallucination detected, respond with a brief description of what was hallucinated.
-If no hallucination, respond with exactly: NO_HALLUCINATION"""
-
-        result = self.llm_generator.generate(check_prompt)
-        
+{HALLUCINATION_PROMPT_SUFFIX}"""
+    
+    def _parse_hallucination_check(self, result: str) -> Optional[str]:
+        """Description of the hallucination from a check reply, or None."""
         if "NO_HALLUCINATION" in result.upper():
             return None
         else:
             return result[:200]  # Truncate long responses
 
+@lru_cache(maxsize=4)
+def _get_evaluator(llm_generator) -> Evaluator:
+    """
+    Evaluator shared by the convenience functions for one generator.
+    
+    Keyed by the generator object itself rather than id(), since the cache
+    keeps it alive and an id can be reused once a generator is collected.
+    """
+    return Evaluator(llm_generator)
+
 
 def evaluate_response(
     llm_generator,
@@ -351,8 +1192,8 @@ def evaluate_response(
     question: str,
     response: str,
     ground_truth: str,
-    expected_entities: List[str],
-    expected_keywords: List[str],
+    expected_entities: Sequence[str],
+    expected_keywords: Sequence[str],
     retrieval_mode: str,
     sources: List[Dict],
     response_time_ms: float,
@@ -360,9 +1201,12 @@ def evaluate_response(
 ) -> EvaluationResult:
     """
     Convenience function to evaluate a single response.
+    
+    Calls with the same llm_generator share one Evaluator, so state it
+    holds (such as a judge cache or rate limiter attached to it) carries
+    over between calls.
     """
-    evaluator = Evaluator(llm_generator)
-    return evaluator.evaluate_response(
+    return _get_evaluator(llm_generator).evaluate_response(
         question_id=question_id,
         question=question,
         response=response,
@@ -376,12 +1220,70 @@ def evaluate_response(
     )
 
 
-def aggregate_results(results: List[EvaluationResult]) -> Dict[str, Any]:
+def write_ndjson(path: Path, results: Iterable[EvaluationResult]) -> int:
+    """
+    Write results as NDJSON, one object per line, as they are produced.
+    
+    Results are serialized one at a time, so a generator of results is
+    never materialized as a list of dicts.
+    
+    Args:
+        path: Output file (overwritten)
+        results: Results to write, e.g. a generator
+        
+    Returns:
+        Number of results written
+    """
+    count = 0
+    with open(path, "wb") as f:
+        for result in results:
+            f.write(result.to_json_bytes(orjson.OPT_APPEND_NEWLINE))
+            count += 1
+    return count
+
+
+def evaluate_responses(
+    llm_generator,
+    samples: List[Dict[str, Any]],
+    max_workers: int = DEFAULT_EVAL_WORKERS,
+    mode: str = "interactive"
+) -> List[EvaluationResult]:
+    """
+    Convenience function to evaluate many responses.
+    
+    Args:
+        llm_generator: LLMGenerator instance for LLM-as-Judge scoring
+        samples: evaluate_response() keyword arguments, one dict per response
+        max_workers: Maximum evaluations in flight at once (interactive mode)
+        mode: "interactive" judges the responses in parallel with regular
+            API calls; "batch" submits every judge prompt as one Gemini
+            Batch Mode job, which is cheaper but not real-time
+        
+    Returns:
+        EvaluationResults in the same order as samples
+    """
+    if mode not in EVALUATION_MODES:
+        raise ValueError(f"Unknown evaluation mode {mode!r}, expected one of {EVALUATION_MODES}")
+    
+    evaluator = _get_evaluator(llm_generator)
+    requests = [EvalRequest(**sample) for sample in samples]
+    if mode == "batch":
+        return evaluator.evaluate_batch(requests)
+    return evaluator.evaluate_parallel(requests, max_workers=max_workers)
+
+
+def aggregate_results(
+    results: Union[List[EvaluationResult], EvaluationResultBatch, AggregateAccumulator],
+    judge_cache: Optional[JudgeCache] = None
+) -> Dict[str, Any]:
     """
     Aggregate multiple evaluation results into summary statistics.
     
     Args:
-        results: List of EvaluationResult objects
+        results: List of EvaluationResult objects, their metric columns, or
+            an accumulator they were streamed into
+        judge_cache: Judge cache used for the results, whose hit/miss
+            counts are reported under "judge_cache"
         
     Returns:
         Dictionary with aggregate statistics
@@ -389,32 +1291,19 @@ def aggregate_results(results: List[EvaluationResult]) -> Dict[str, Any]:
     if not results:
         return {}
     
-    # Group by retrieval mode
-    by_mode = {}
-    for r in results:
-        mode = r.retrieval_mode
-        if mode not in by_mode:
-            by_mode[mode] = []
-        by_mode[mode].append(r)
-    
-    # Calculate aggregates per mode
-    aggregates = {}
-    for mode, mode_results in by_mode.items():
-        n = len(mode_results)
-        aggregates[mode] = {
-            "count": n,
-            "avg_relevance_score": sum(r.relevance_score for r in mode_results) / n,
-            "avg_accuracy_score": sum(r.accuracy_score for r in mode_results) / n,
-            "avg_keyword_coverage": sum(r.keyword_coverage for r in mode_results) / n,
-            "avg_entity_coverage": sum(r.entity_coverage for r in mode_results) / n,
-            "avg_response_time_ms": sum(r.response_time_ms for r in mode_results) / n,
-            "avg_source_count": sum(r.source_count for r in mode_results) / n,
-            "hallucination_rate": sum(1 for r in mode_results if r.hallucination_detected) / n,
-            "avg_graph_entities": sum(r.graph_entities_found for r in mode_results) / n,
-        }
+    if isinstance(results, AggregateAccumulator):
+        aggregates = results.snapshot()
+    else:
+        if not isinstance(results, EvaluationResultBatch):
+            results = EvaluationResultBatch.from_results(results)
+        aggregates = results.by_mode()
     
-    return {
+    summary = {
         "total_evaluations": len(results),
         "by_mode": aggregates,
-        "modes_compared": list(by_mode.keys())
+        "modes_compared": list(aggregates.keys())
     }
+    if judge_cache is not None:
+        summary["judge_cache"] = judge_cache.stats()
+    
+    return summary
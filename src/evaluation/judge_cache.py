@@ -0,0 +1,96 @@
+"""
+Judge Cache - Persistent LLM-as-Judge Verdicts.
+
+Stores the judge's verdict for each (question, response, ground truth)
+triple in SQLite, so repeated evaluation runs skip the LLM call for
+responses that were already judged.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Part of every key: bump when the judge prompt or its parsing changes, so
+# verdicts from the old prompt are no longer reused
+JUDGE_CACHE_VERSION = "v2"
+
+# (relevance 1-5, accuracy 0-1, hallucination description or None)
+Verdict = Tuple[int, float, Optional[str]]
+
+
+class JudgeCache:
+    """
+    SQLite cache of judge verdicts keyed by SHA-256 of the judged content.
+    
+    Safe to share between threads. Counts hits and misses for reporting.
+    """
+    
+    def __init__(self, db_path: Path, version: str = JUDGE_CACHE_VERSION):
+        self.db_path = Path(db_path)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS judge ("
+            "k TEXT PRIMARY KEY, relevance INT, accuracy REAL, "
+            "hallu_detected INT, hallu_details TEXT, ts REAL)"
+        )
+    
+    def key(self, question: str, response: str, ground_truth: str) -> str:
+        """Content hash identifying one judged response."""
+        return hashlib.sha256(
+            f"{question}\0{response}\0{ground_truth}\0{self.version}".encode("utf-8")
+        ).hexdigest()
+    
+    def get(self, question: str, response: str, ground_truth: str) -> Optional[Verdict]:
+        """Cached verdict, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT relevance, accuracy, hallu_detected, hallu_details FROM judge WHERE k = ?",
+                (self.key(question, response, ground_truth),)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        
+        relevance, accuracy, detected, details = row
+        return relevance, accuracy, details if detected else None
+    
+    def put(self, question: str, response: str, ground_truth: str, verdict: Verdict):
+        """Store a verdict, replacing any earlier one for the same content."""
+        relevance, accuracy, finding = verdict
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO judge VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.key(question, response, ground_truth),
+                    relevance,
+                    accuracy,
+                    int(finding is not None),
+                    finding or "",
+                    time.time()
+                )
+            )
+    
+    def stats(self) -> Dict[str, int]:
+        """Hits and misses since the cache was opened."""
+        return {"hits": self.hits, "misses": self.misses}
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
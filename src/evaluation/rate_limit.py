@@ -0,0 +1,125 @@
+"""
+Rate Limiting for LLM and RAG Calls.
+
+Token bucket shared by the evaluator and the ablation study to pace calls
+to the Gemini API, backing off when the provider reports rate limiting.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+
+# LLMGenerator returns errors as replies starting with one of these
+from ..rag.generator import ERROR_REPLY_PREFIXES
+
+logger = logging.getLogger(__name__)
+
+# Longest backoff sleep after a rate-limit response
+MAX_BACKOFF = 60  # seconds
+
+# penalize() never slows the bucket below this
+MIN_RATE_PER_MIN = 1.0
+
+# Calls in a row without a rate limit after which record_success() doubles
+# a penalized rate again (never above the initial rate)
+RECOVERY_SUCCESSES = 10
+
+# Markers of a rate-limit (429 / quota) error from the Gemini API, and of
+# LLMGenerator's reply once its own retries are exhausted
+RATE_LIMIT_MARKERS = ("429", "resource_exhausted", "quota", "experiencing high demand")
+
+
+def is_rate_limited(reply_or_error) -> bool:
+    """Check if an LLM error, or an error reply from LLMGenerator, is a rate limit."""
+    if isinstance(reply_or_error, str) and not reply_or_error.startswith(ERROR_REPLY_PREFIXES):
+        return False
+    text = str(reply_or_error).lower()
+    return any(marker in text for marker in RATE_LIMIT_MARKERS)
+
+
+class TokenBucket:
+    """
+    Allows `rate_per_min` calls per minute, with bursts of up to `burst`.
+    
+    acquire() only sleeps when the bucket is empty. penalize() halves the
+    rate and backs off exponentially (with jitter) after the provider
+    rate-limits a call; record_success() restores it step by step once
+    calls go through again. Safe to share between threads.
+    """
+    
+    def __init__(self, rate_per_min: float, burst: int = 1):
+        self.rate_per_min = rate_per_min
+        self.max_rate_per_min = rate_per_min
+        self.burst = max(1, burst)
+        self.interval = 60.0 / rate_per_min
+        self.strikes = 0
+        self._successes = 0  # calls since the last rate limit or recovery step
+        # When the next token is due at the steady rate; up to burst - 1
+        # tokens can be taken ahead of it
+        self._empty_at = 0.0
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take the next token, returning how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            empty_at = max(self._empty_at, now)
+            wait = empty_at - (self.burst - 1) * self.interval - now
+            self._empty_at = empty_at + self.interval
+        return wait
+    
+    def acquire(self):
+        """Block until a token is available."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def aacquire(self):
+        """Async version of acquire() that yields to the event loop while waiting."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def _slow_down(self) -> float:
+        """Halve the rate and return the backoff delay for this strike."""
+        with self._lock:
+            self.strikes += 1
+            self._successes = 0
+            self.rate_per_min = max(MIN_RATE_PER_MIN, self.rate_per_min / 2)
+            self.interval = 60.0 / self.rate_per_min
+            delay = min(2 ** self.strikes, MAX_BACKOFF)
+        
+        logger.warning(f"Rate limited, slowing to {self.rate_per_min:.1f} calls/min and backing off {delay}s")
+        return delay * random.uniform(0.5, 1.0)
+    
+    def penalize(self):
+        """Slow down after a rate-limit response and sleep off the backoff."""
+        time.sleep(self._slow_down())
+    
+    async def apenalize(self):
+        """Async version of penalize()."""
+        await asyncio.sleep(self._slow_down())
+    
+    def record_success(self):
+        """
+        Count a call that was not rate-limited.
+        
+        After RECOVERY_SUCCESSES of them in a row, a penalized bucket
+        doubles its rate (up to the initial rate) and forgives one strike,
+        so a burst of 429s only slows the calls that follow it.
+        """
+        with self._lock:
+            if self.strikes == 0:
+                return
+            self._successes += 1
+            if self._successes < RECOVERY_SUCCESSES:
+                return
+            self._successes = 0
+            self.strikes -= 1
+            self.rate_per_min = min(self.max_rate_per_min, self.rate_per_min * 2)
+            self.interval = 60.0 / self.rate_per_min
+            rate = self.rate_per_min
+        
+        logger.info(f"No rate limits for {RECOVERY_SUCCESSES} calls, speeding up to {rate:.1f} calls/min")
@@ -1,4 +1,13 @@
 """Knowledge Graph module for E-commerce RAG system."""
-from .graph import KnowledgeGraph, get_knowledge_graph, reset_knowledge_graph
+from .graph import Entity, KnowledgeGraph, get_knowledge_graph, reset_knowledge_graph
+from .build import products_from_documents, products_from_metadatas, ensure_kg_built
 
-__all__ = ["KnowledgeGraph", "get_knowledge_graph", "reset_knowledge_graph"]
+__all__ = [
+    "Entity",
+    "KnowledgeGraph",
+    "get_knowledge_graph",
+    "reset_knowledge_graph",
+    "products_from_documents",
+    "products_from_metadatas",
+    "ensure_kg_built",
+]
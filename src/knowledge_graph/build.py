@@ -0,0 +1,151 @@
+"""
+Knowledge Graph Build Helpers
+
+Turns documents stored in the vector store back into the product
+dictionaries consumed by KnowledgeGraph.build_from_products().
+"""
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Sequence
+
+from .graph import KnowledgeGraph, get_knowledge_graph
+
+logger = logging.getLogger(__name__)
+
+# Built knowledge graphs, keyed by a hash of the stored document IDs
+KG_CACHE_DIR = Path("./data/kg_cache")
+
+# Above this many documents the product filter runs as a pandas column mask
+DATAFRAME_FILTER_THRESHOLD = 10_000
+
+
+def _normalize_features(features: Any) -> List[str]:
+    """Features are stored as a comma-joined string in metadata."""
+    if isinstance(features, str):
+        return features.split(", ") if features else []
+    return features or []
+
+
+def _present(column) -> Any:
+    """Mask of non-null, non-empty values in a pandas column."""
+    return column.notna() & column.ne("")
+
+
+def filter_product_metadatas(metadatas: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Keep only product metadata, filtering column-wise with pandas.
+
+    Args:
+        metadatas: Metadata dicts
+
+    Returns:
+        The metadata dicts that have a 'brand' and a 'title' or 'name'
+    """
+    import pandas as pd
+
+    records = [m for m in metadatas if m]
+    if not records:
+        return []
+
+    df = pd.DataFrame.from_records(records)
+    df = df.reindex(columns=df.columns.union(["brand", "title", "name"]))
+
+    title = df["title"]
+    name = title.where(_present(title), df["name"])
+    mask = _present(df["brand"]) & _present(name)
+
+    return [records[i] for i in mask.to_numpy().nonzero()[0]]
+
+
+def products_from_metadatas(metadatas: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Extract product data from a column of document metadata.
+
+    Only product documents (those with a 'title' or 'name' and a 'brand')
+    are kept. Large corpora are pre-filtered with pandas.
+
+    Args:
+        metadatas: Metadata dicts, e.g. VectorStore.get_columns()["metadatas"]
+
+    Returns:
+        List of product dictionaries
+    """
+    if len(metadatas) > DATAFRAME_FILTER_THRESHOLD:
+        metadatas = filter_product_metadatas(metadatas)
+
+    return [
+        {
+            "name": name,
+            "brand": m["brand"],
+            "category": m.get("category", ""),
+            "price": m.get("price", 0),
+            "rating": m.get("rating"),
+            "reviews_count": m.get("reviews_count"),
+            "description": m.get("description", ""),
+            "features": _normalize_features(m.get("features"))
+        }
+        for m in metadatas
+        if m and m.get("brand") and (name := m.get("title") or m.get("name"))
+    ]
+
+
+def products_from_documents(all_docs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Extract product data from stored documents.
+
+    Args:
+        all_docs: Documents, e.g. from VectorStore.iter_all_documents()
+
+    Returns:
+        List of product dictionaries
+    """
+    return products_from_metadatas([doc.get("metadata") for doc in all_docs])
+
+
+def ensure_kg_built(vector_store, cache_dir: Optional[Path] = KG_CACHE_DIR) -> KnowledgeGraph:
+    """
+    Make sure the global knowledge graph is built from the vector store.
+
+    Does nothing if the graph already has entities. Otherwise loads the
+    graph cached for the same set of document IDs, or builds it and writes
+    the cache, so the API and the scripts share one build.
+
+    Args:
+        vector_store: VectorStore holding the product documents
+        cache_dir: Directory for cached graphs (None disables caching)
+
+    Returns:
+        The global KnowledgeGraph
+    """
+    kg = get_knowledge_graph()
+    if kg.entities:
+        return kg
+
+    doc_count = vector_store.count()
+    if doc_count == 0:
+        return kg
+
+    cache_path = None
+    if cache_dir is not None:
+        key = hashlib.sha256(
+            "\n".join(sorted(vector_store.get_all_ids())).encode("utf-8")
+        ).hexdigest()[:16]
+        cache_path = Path(cache_dir) / f"{key}.pkl"
+        if cache_path.exists():
+            kg.load_state(cache_path)
+            return kg
+
+    logger.info(f"Building Knowledge Graph from {doc_count} documents...")
+    products = products_from_metadatas(vector_store.get_columns()["metadatas"])
+
+    if products:
+        kg.build_from_products(products)
+        if cache_path is not None:
+            kg.save_state(cache_path)
+        stats = kg.get_stats()
+        logger.info(f"Knowledge Graph built: {stats['total_entities']} entities, {stats['total_relationships']} relationships")
+    else:
+        logger.info("No product documents found for Knowledge Graph")
+
+    return kg
@@ -8,13 +8,91 @@ Builds and manages relationships between:
 - Price Ranges
 - Features
 """
+import heapq
 import json
 import logging
-from typing import Dict, List, Set, Any, Optional
+import pickle
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import chain, islice, takewhile
+from typing import Callable, Dict, Iterator, List, Set, Any, Optional, Sequence, Tuple
 from collections import defaultdict
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+
+import numpy as np
+import orjson
+
+# Prefix search over the entity name vocabulary, if available
+try:
+    import marisa_trie
+    HAS_MARISA_TRIE = True
+except ImportError:
+    HAS_MARISA_TRIE = False
 
 logger = logging.getLogger(__name__)
 
+# Tokenization and stop words for search_entities()
+_TOKEN_RE = re.compile(r'\w+')
+SEARCH_STOP_WORDS = frozenset({
+    'the', 'is', 'are', 'what', 'which', 'how', 'does', 'for', 'and', 'or', 'any', 'all',
+    'has', 'have', 'can', 'with', 'from', 'this', 'that', 'there', 'products', 'product'
+})
+
+
+def _tokenize(text: str) -> Set[str]:
+    """Lowercase word tokens of a text."""
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+# Entity ID slug: spaces and hyphens become underscores, apostrophes are dropped
+_ID_SLUG_TABLE = str.maketrans({" ": "_", "'": None, "-": "_"})
+
+
+# Entries kept in the cache of derived views (D3 payloads per max_nodes, top entity lists)
+VIEW_CACHE_SIZE = 16
+
+# D3 visualization color group per entity type (0 for unknown types)
+D3_GROUPS = {
+    "product": 1,
+    "brand": 2,
+    "category": 3,
+    "price_range": 4,
+    "feature": 5
+}
+
+
+@dataclass(slots=True)
+class Entity:
+    """
+    A node of the knowledge graph.
+    
+    Slotted to keep large graphs small. Still readable like the dicts
+    entities used to be (entity["name"], entity.get("properties")), so API
+    callers and prompts built from entities don't change.
+    """
+    id: str
+    type: str
+    name: str
+    properties: Dict[str, Any] = field(default_factory=dict)
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in _ENTITY_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _ENTITY_FIELDS else default
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """The entity as a plain dict."""
+        return {"id": self.id, "type": self.type, "name": self.name, "properties": self.properties}
+
+
+_ENTITY_FIELDS = frozenset(f.name for f in fields(Entity))
+
 
 class KnowledgeGraph:
     """
@@ -36,27 +114,59 @@ class KnowledgeGraph:
     """
     
     def __init__(self):
-        # Entities: {entity_id: {type, name, properties}}
-        self.entities: Dict[str, Dict[str, Any]] = {}
+        # Entities: {entity_id: Entity}
+        self.entities: Dict[str, Entity] = {}
         
         # Relationships: {source_id: [(relationship_type, target_id)]}
+        # (defaultdicts for cheap appends; read them with .get(), never [])
         self.relationships: Dict[str, List[tuple]] = defaultdict(list)
         
         # Reverse index for efficient lookups
         self.reverse_relationships: Dict[str, List[tuple]] = defaultdict(list)
         
+        # Inverted index: (relationship_type, target_id) -> [source_id],
+        # e.g. ("MADE_BY", "brand:nike") -> Nike product IDs
+        self._sources_by_relation: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        
+        # Every (source_id, relationship_type, target_id) edge, for O(1)
+        # duplicate checks; the lists above keep insertion order
+        self._edges: Set[Tuple[str, str, str]] = set()
+        
         # Entity type index
         self.entities_by_type: Dict[str, Set[str]] = defaultdict(set)
         
         # Name to ID mapping
         self.name_to_id: Dict[str, str] = {}
         
+        # Inverted index over name_to_id keys for search_entities(). Names
+        # are numbered in insertion order (their rank): token -> ranks, and
+        # name and token count per rank. Built lazily, so bulk builds don't
+        # pay for tokenizing every name.
+        self._ranks_by_token: Dict[str, Set[int]] = defaultdict(set)
+        self._names: List[str] = []
+        self._name_token_counts: List[int] = []
+        self._token_count_array = np.zeros(0, dtype=np.int32)
+        # Prefix index over the _ranks_by_token keys: a marisa_trie.Trie, or
+        # a sorted list without marisa-trie. Rebuilt when the vocabulary grows.
+        self._token_prefix_index = None
+        
+        # Bumped on every mutation; keys cached views of the graph
+        self._version = 0
+        self._view_cache: Dict[Tuple[str, int], Any] = {}
+        self._view_cache_version = 0
+        
         logger.info("Knowledge Graph initialized")
     
-    def _generate_id(self, entity_type: str, name: str) -> str:
-        """Generate a unique ID for an entity."""
-        clean_name = name.lower().replace(" ", "_").replace("'", "").replace("-", "_")
-        return f"{entity_type}:{clean_name}"
+    @staticmethod
+    @lru_cache(maxsize=16384)
+    def _generate_id(entity_type: str, name: str) -> str:
+        """
+        Generate a unique ID for an entity.
+        
+        Cached, since names repeat across lookups, and interned: the ID is a
+        key in several indexes, which then share one string object.
+        """
+        return sys.intern(f"{entity_type}:{name.lower().translate(_ID_SLUG_TABLE)}")
     
     def add_entity(self, entity_type: str, name: str, properties: Optional[Dict] = None) -> str:
         """
@@ -71,20 +181,16 @@ class KnowledgeGraph:
             Entity ID
         """
         entity_id = self._generate_id(entity_type, name)
+        self._version += 1
         
         if entity_id not in self.entities:
-            self.entities[entity_id] = {
-                "id": entity_id,
-                "type": entity_type,
-                "name": name,
-                "properties": properties or {}
-            }
+            self.entities[entity_id] = Entity(entity_id, entity_type, name, properties or {})
             self.entities_by_type[entity_type].add(entity_id)
             self.name_to_id[name.lower()] = entity_id
         else:
             # Update properties if entity already exists
             if properties:
-                self.entities[entity_id]["properties"].update(properties)
+                self.entities[entity_id].properties.update(properties)
         
         return entity_id
     
@@ -101,68 +207,137 @@ class KnowledgeGraph:
             logger.warning(f"Cannot add relationship: entity not found")
             return
         
-        rel_tuple = (relationship_type, target_id)
-        if rel_tuple not in self.relationships[source_id]:
+        self._link(source_id, relationship_type, target_id)
+    
+    def _link(self, source_id: str, relationship_type: str, target_id: str):
+        """add_relationship() for IDs already known to exist."""
+        edge = (source_id, relationship_type, target_id)
+        if edge not in self._edges:
+            self._version += 1
+            self._edges.add(edge)
+            rel_tuple = (relationship_type, target_id)
             self.relationships[source_id].append(rel_tuple)
             self.reverse_relationships[target_id].append((relationship_type, source_id))
+            self._sources_by_relation[rel_tuple].append(source_id)
     
-    def get_entity(self, entity_id: str) -> Optional[Dict]:
+    def get_entity(self, entity_id: str) -> Optional[Entity]:
         """Get an entity by ID."""
         return self.entities.get(entity_id)
     
-    def find_entity(self, name: str) -> Optional[Dict]:
+    def find_entity(self, name: str) -> Optional[Entity]:
         """Find an entity by name."""
         entity_id = self.name_to_id.get(name.lower())
         if entity_id:
             return self.entities.get(entity_id)
         return None
     
-    def search_entities(self, query: str, entity_type: Optional[str] = None, limit: int = 5) -> List[Dict]:
+    def _index_name(self, name: str):
+        """Add a name_to_id key to the search index."""
+        rank = len(self._names)
+        self._names.append(name)
+        tokens = _tokenize(name)
+        self._name_token_counts.append(len(tokens))
+        for token in tokens:
+            self._ranks_by_token[token].add(rank)
+    
+    def _sync_name_index(self):
+        """Index names added to name_to_id since the last search."""
+        # name_to_id only grows and keeps insertion order, so the
+        # unindexed names are exactly the trailing ones
+        for name in list(islice(self.name_to_id, len(self._names), None)):
+            self._index_name(name)
+        if len(self._token_count_array) != len(self._names):
+            self._token_count_array = np.array(self._name_token_counts, dtype=np.int32)
+    
+    def _reset_name_index(self):
+        """Drop the search index; it is rebuilt on the next search."""
+        self._ranks_by_token = defaultdict(set)
+        self._names = []
+        self._name_token_counts = []
+        self._token_count_array = np.zeros(0, dtype=np.int32)
+        self._token_prefix_index = None
+    
+    def _tokens_with_prefix(self, prefix: str) -> List[str]:
+        """Indexed name tokens starting with prefix."""
+        index = self._token_prefix_index
+        if index is None or len(index) != len(self._ranks_by_token):
+            tokens = list(self._ranks_by_token)
+            index = self._token_prefix_index = (
+                marisa_trie.Trie(tokens) if HAS_MARISA_TRIE else sorted(tokens)
+            )
+        
+        if HAS_MARISA_TRIE:
+            return index.keys(prefix)
+        return list(takewhile(
+            lambda token: token.startswith(prefix), islice(index, bisect_left(index, prefix), None)
+        ))
+    
+    def search_entities(
+        self,
+        query: str,
+        entity_type: Optional[str] = None,
+        limit: int = 5,
+        prefix: bool = False
+    ) -> List[Entity]:
         """
         Search for entities in the graph matching the query.
         Uses precision-focused token overlap matching.
-        """
-        import re
         
-        def get_tokens(text):
-            return set(re.findall(r'\w+', text.lower()))
-
-        query_tokens = get_tokens(query)
+        Only names sharing a token with the query are scored, found via
+        the inverted token index; their scores are computed as arrays.
+        
+        Args:
+            query: Search text
+            entity_type: Only return entities of this type (optional)
+            limit: Maximum number of entities
+            prefix: Also match name tokens that merely start with a query
+                token, e.g. "appl" matches "Apple iPhone"
+        """
+        query_tokens = _tokenize(query)
         # Filter short/common tokens (stop words)
-        stop_words = {'the', 'is', 'are', 'what', 'which', 'how', 'does', 'for', 'and', 'or', 'any', 'all', 'has', 'have', 'can', 'with', 'from', 'this', 'that', 'there', 'products', 'product'}
-        valid_tokens = {t for t in query_tokens if len(t) > 2 and t not in stop_words}
+        valid_tokens = {t for t in query_tokens if len(t) > 2 and t not in SEARCH_STOP_WORDS}
         
         if not valid_tokens:
             return []
         
+        self._sync_name_index()
+        if prefix:
+            # A query token matches a name once, however many of its tokens it prefixes
+            postings = [
+                set().union(*(self._ranks_by_token[t] for t in self._tokens_with_prefix(token)))
+                for token in valid_tokens
+            ]
+        else:
+            postings = [self._ranks_by_token[t] for t in valid_tokens if t in self._ranks_by_token]
+        if not any(postings):
+            return []
+        
+        # Candidate ranks (sorted, i.e. in insertion order) and the number
+        # of query tokens each one shares
+        ranks, common = np.unique(
+            np.fromiter(chain.from_iterable(postings), dtype=np.int64), return_counts=True
+        )
+        # Precision: what fraction of entity name tokens matched?
+        name_precision = common / self._token_count_array[ranks]
+        # Recall: what fraction of query tokens matched?
+        query_recall = common / len(valid_tokens)
+        scores = name_precision * 0.6 + query_recall * 0.4
+        
+        # Require at least 50% of the entity name tokens to match
+        # This prevents "apple" matching "apple oppo a 66" (only 1/4 tokens)
+        keep = (name_precision >= 0.5) | (common >= 2)
+        
+        typed_ids = self.entities_by_type.get(entity_type, set()) if entity_type else None
         scored_matches = []
         seen_ids = set()
         
-        for name, entity_id in self.name_to_id.items():
-            if entity_type:
-                entity = self.entities[entity_id]
-                if entity["type"] != entity_type:
-                    continue
-
-            name_tokens = get_tokens(name)
-            if not name_tokens:
+        for rank, score in zip(ranks[keep].tolist(), scores[keep].tolist()):
+            entity_id = self.name_to_id[self._names[rank]]
+            if typed_ids is not None and entity_id not in typed_ids:
                 continue
-            
-            common = valid_tokens.intersection(name_tokens)
-            
-            if common:
-                # Precision: what fraction of entity name tokens matched?
-                name_precision = len(common) / len(name_tokens)
-                # Recall: what fraction of query tokens matched?
-                query_recall = len(common) / len(valid_tokens)
-                
-                # Require at least 50% of the entity name tokens to match
-                # This prevents "apple" matching "apple oppo a 66" (only 1/4 tokens)
-                if name_precision >= 0.5 or len(common) >= 2:
-                    if entity_id not in seen_ids:
-                        score = name_precision * 0.6 + query_recall * 0.4
-                        scored_matches.append((score, self.entities[entity_id]))
-                        seen_ids.add(entity_id)
+            if entity_id not in seen_ids:
+                scored_matches.append((score, self.entities[entity_id]))
+                seen_ids.add(entity_id)
         
         # Sort by score descending
         scored_matches.sort(key=lambda x: x[0], reverse=True)
@@ -173,164 +348,248 @@ class KnowledgeGraph:
         """Get related entities (alias for get_related)."""
         return self.get_related(entity_id)
 
-    def get_related(self, entity_id: str, relationship_type: Optional[str] = None) -> List[Dict]:
+    def get_related(
+        self,
+        entity_id: str,
+        relationship_type: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
         """
         Get entities related to a given entity.
         
         Args:
             entity_id: Source entity ID
             relationship_type: Filter by relationship type (optional)
+            limit: Maximum number of related entities, outgoing first (optional)
             
         Returns:
             List of related entities with relationship info
         """
-        related = []
+        return list(islice(self._iter_related(entity_id, relationship_type), limit))
+    
+    def batch_get_related(
+        self,
+        entity_ids: Sequence[str],
+        limit_per: Optional[int] = 5
+    ) -> Dict[str, List[Dict]]:
+        """
+        get_related() for several entities at once.
         
+        Args:
+            entity_ids: Entity IDs to look up
+            limit_per: Maximum related entities per entity (None for all)
+            
+        Returns:
+            {entity_id: related entities, as from get_related()}
+        """
+        return {
+            entity_id: list(islice(self._iter_related(entity_id, None), limit_per))
+            for entity_id in entity_ids
+        }
+    
+    def _iter_related(self, entity_id: str, relationship_type: Optional[str]) -> Iterator[Dict]:
+        """Yield get_related() entries lazily, so a limit stops the scan early."""
         # Outgoing relationships
-        if entity_id in self.relationships:
-            for rel_type, target_id in self.relationships[entity_id]:
-                if relationship_type is None or rel_type == relationship_type:
-                    entity = self.entities.get(target_id)
-                    if entity:
-                        related.append({
-                            "entity": entity,
-                            "relationship": rel_type,
-                            "direction": "outgoing"
-                        })
+        for rel_type, target_id in self.relationships.get(entity_id, ()):
+            if relationship_type is None or rel_type == relationship_type:
+                entity = self.entities.get(target_id)
+                if entity:
+                    yield {
+                        "entity": entity,
+                        "relationship": rel_type,
+                        "direction": "outgoing"
+                    }
         
         # Incoming relationships
-        if entity_id in self.reverse_relationships:
-            for rel_type, source_id in self.reverse_relationships[entity_id]:
-                if relationship_type is None or rel_type == relationship_type:
-                    entity = self.entities.get(source_id)
-                    if entity:
-                        related.append({
-                            "entity": entity,
-
+        for rel_type, source_id in self.reverse_relationships.get(entity_id, ()):
+            if relationship_type is None or rel_type == relationship_type:
+                entity = self.entities.get(source_id)
+                if entity:
+                    yield {
+                        "entity": entity,
                         "relationship": rel_type,
                         "direction": "incoming"
-                    })
-        
-        return related
+                    }
     
-    def get_entities_by_type(self, entity_type: str) -> List[Dict]:
+    def get_entities_by_type(self, entity_type: str) -> List[Entity]:
         """Get all entities of a specific type."""
         return [
             self.entities[eid] 
             for eid in self.entities_by_type.get(entity_type, set())
         ]
     
-    def get_products_by_brand(self, brand_name: str) -> List[Dict]:
-        """Get all products for a specific brand."""
+    def get_products_by_brand(self, brand_name: str) -> List[Entity]:
+        """Get all products for a specific brand (case-insensitive)."""
         brand_id = self._generate_id("brand", brand_name)
-        products = []
-        
-        for rel_type, source_id in self.reverse_relationships.get(brand_id, []):
-            if rel_type == "MADE_BY":
-                product = self.entities.get(source_id)
-                if product:
-                    products.append(product)
-        
-        return products
+        return [
+            self.entities[pid]
+            for pid in self._sources_by_relation.get(("MADE_BY", brand_id), ())
+        ]
     
-    def get_products_by_category(self, category_name: str) -> List[Dict]:
-        """Get all products in a specific category."""
+    def get_products_by_category(self, category_name: str) -> List[Entity]:
+        """Get all products in a specific category (case-insensitive)."""
         category_id = self._generate_id("category", category_name)
-        products = []
-        
-        for rel_type, source_id in self.reverse_relationships.get(category_id, []):
-            if rel_type == "BELONGS_TO":
-                product = self.entities.get(source_id)
-                if product:
-                    products.append(product)
-        
-        return products
+        return [
+            self.entities[pid]
+            for pid in self._sources_by_relation.get(("BELONGS_TO", category_id), ())
+        ]
     
 
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get statistics about the knowledge graph."""
-        total_relationships = sum(len(rels) for rels in self.relationships.values())
+        """
+        Get statistics about the knowledge graph.
         
+        Counts are read off the indexes; the top brand and category lists
+        are cached like the D3 views until the graph changes.
+        """
         return {
             "total_entities": len(self.entities),
-            "total_relationships": total_relationships,
+            "total_relationships": len(self._edges),
             "entities_by_type": {
                 etype: len(eids) 
                 for etype, eids in self.entities_by_type.items()
             },
-            "top_brands": self._get_top_entities("brand", 10),
-            "top_categories": self._get_top_entities("category", 10)
+            "top_brands": list(self._cached_view(
+                "top_brand", 10, lambda n: self._get_top_entities("brand", n)
+            )),
+            "top_categories": list(self._cached_view(
+                "top_category", 10, lambda n: self._get_top_entities("category", n)
+            ))
         }
     
     def _get_top_entities(self, entity_type: str, limit: int) -> List[Dict]:
         """Get entities with most relationships."""
-        entities = []
-        for entity_id in self.entities_by_type.get(entity_type, set()):
-            entity = self.entities[entity_id]
-            count = len(self.reverse_relationships.get(entity_id, []))
-            entities.append({"name": entity["name"], "count": count})
-        
-        return sorted(entities, key=lambda x: -x["count"])[:limit]
+        reverse_relationships = self.reverse_relationships
+        top_ids = heapq.nlargest(
+            limit,
+            self.entities_by_type.get(entity_type, set()),
+            key=lambda entity_id: len(reverse_relationships.get(entity_id, ()))
+        )
+        return [
+            {"name": self.entities[entity_id].name, "count": len(reverse_relationships.get(entity_id, ()))}
+            for entity_id in top_ids
+        ]
     
     def to_d3_format(self, max_nodes: int = 200) -> Dict[str, Any]:
         """
         Convert graph to D3.js force-directed graph format.
         
+        Results are cached per max_nodes and rebuilt only after the graph
+        changes; treat the returned dict as read-only.
+        
         Returns:
             {nodes: [...], links: [...]}
         """
-        nodes = []
-        links = []
-        node_ids = set()
+        return self._cached_view("d3", max_nodes, self._build_d3_format)
+    
+    def to_d3_json(self, max_nodes: int = 200, soa: bool = False) -> bytes:
+        """
+        to_d3_format() (or to_d3_soa()) pre-serialized with orjson, cached the same way.
+        
+        Args:
+            max_nodes: Maximum nodes in the view
+            soa: Encode the column-oriented to_d3_soa() payload instead
         
-        # Sample entities if too many
+        Returns:
+            JSON-encoded D3 payload
+        """
+        if soa:
+            return self._cached_view(
+                "d3_soa_json", max_nodes, lambda n: orjson.dumps(self.to_d3_soa(n))
+            )
+        return self._cached_view(
+            "d3_json", max_nodes, lambda n: orjson.dumps(self.to_d3_format(n))
+        )
+    
+    def _cached_view(self, kind: str, max_nodes: int, build: Callable[[int], Any]) -> Any:
+        """Return a derived view (of up to max_nodes items), rebuilding it only after the graph changes."""
+        if self._view_cache_version != self._version or len(self._view_cache) >= VIEW_CACHE_SIZE:
+            self._view_cache.clear()
+            self._view_cache_version = self._version
+        
+        key = (kind, max_nodes)
+        if key not in self._view_cache:
+            self._view_cache[key] = build(max_nodes)
+        return self._view_cache[key]
+    
+    def _select_d3_ids(self, max_nodes: int) -> Set[str]:
+        """Pick the entities shown in a D3 view of at most ~max_nodes nodes."""
         all_entity_ids = list(self.entities.keys())
-        if len(all_entity_ids) > max_nodes:
-            # Prioritize brands and categories, then sample products
-            priority_ids = []
-            for etype in ["brand", "category", "price_range"]:
-                priority_ids.extend(list(self.entities_by_type.get(etype, set())))
-            
-            remaining = max_nodes - len(priority_ids)
-            product_ids = list(self.entities_by_type.get("product", set()))[:remaining]
-            selected_ids = set(priority_ids + product_ids)
-        else:
-            selected_ids = set(all_entity_ids)
+        if len(all_entity_ids) <= max_nodes:
+            return set(all_entity_ids)
+        
+        # Prioritize brands and categories, then sample products
+        priority_ids = []
+        for etype in ["brand", "category", "price_range"]:
+            priority_ids.extend(list(self.entities_by_type.get(etype, set())))
+        
+        remaining = max_nodes - len(priority_ids)
+        product_ids = list(self.entities_by_type.get("product", set()))[:remaining]
+        return set(priority_ids + product_ids)
+    
+    def _build_d3_format(self, max_nodes: int) -> Dict[str, Any]:
+        """Build the D3.js payload for to_d3_format()."""
+        nodes = []
+        selected_ids = self._select_d3_ids(max_nodes)
+        relationships = self.relationships
         
         # Build nodes
         for entity_id in selected_ids:
             entity = self.entities[entity_id]
             nodes.append({
                 "id": entity_id,
-                "name": entity["name"],
-                "type": entity["type"],
-                "group": self._get_group_number(entity["type"])
+                "name": entity.name,
+                "type": entity.type,
+                "group": D3_GROUPS.get(entity.type, 0)
             })
-            node_ids.add(entity_id)
         
-        # Build links (only for selected nodes)
-        for source_id in selected_ids:
-            for rel_type, target_id in self.relationships.get(source_id, []):
-                if target_id in node_ids:
-                    links.append({
-                        "source": source_id,
-                        "target": target_id,
-                        "type": rel_type
-                    })
+        # Links only between selected nodes
+        links = [
+            {"source": source_id, "target": target_id, "type": rel_type}
+            for source_id in selected_ids
+            for rel_type, target_id in relationships.get(source_id, ())
+            if target_id in selected_ids
+        ]
         
         return {"nodes": nodes, "links": links}
     
-    def _get_group_number(self, entity_type: str) -> int:
-        """Get group number for D3 visualization coloring."""
-        groups = {
-            "product": 1,
-            "brand": 2,
-            "category": 3,
-            "price_range": 4,
-            "feature": 5
+    def to_d3_soa(self, max_nodes: int = 200) -> Dict[str, Any]:
+        """
+        Same graph as to_d3_format(), as parallel column arrays.
+        
+        Cheaper to build and serialize than one dict per node/link.
+        Cached like to_d3_format(); treat the returned dict as read-only.
+        
+        Returns:
+            {nodes_soa: {id, name, type, group}, links_soa: {source, target, type}}
+        """
+        return self._cached_view("d3_soa", max_nodes, self._build_d3_soa)
+    
+    def _build_d3_soa(self, max_nodes: int) -> Dict[str, Any]:
+        """Build the column-oriented payload for to_d3_soa()."""
+        ids, names, types, groups = [], [], [], []
+        sources, targets, rel_types = [], [], []
+        selected_ids = self._select_d3_ids(max_nodes)
+        
+        for entity_id in selected_ids:
+            entity = self.entities[entity_id]
+            ids.append(entity_id)
+            names.append(entity.name)
+            types.append(entity.type)
+            groups.append(D3_GROUPS.get(entity.type, 0))
+        
+        for source_id in selected_ids:
+            for rel_type, target_id in self.relationships.get(source_id, ()):
+                if target_id in selected_ids:
+                    sources.append(source_id)
+                    targets.append(target_id)
+                    rel_types.append(rel_type)
+        
+        return {
+            "nodes_soa": {"id": ids, "name": names, "type": types, "group": groups},
+            "links_soa": {"source": sources, "target": targets, "type": rel_types}
         }
-        return groups.get(entity_type, 0)
     
     def build_from_products(self, products: List[Dict[str, Any]]):
         """
@@ -352,10 +611,28 @@ class KnowledgeGraph:
         ]
         
         # Add price range entities
-        for pr_name, _, _ in price_ranges:
-            self.add_entity("price_range", pr_name)
+        price_range_ids = [self.add_entity("price_range", pr_name) for pr_name, _, _ in price_ranges]
+        price_range_lows = [pr_min for _, pr_min, _ in price_ranges]
+        
+        # Brands, categories and features repeat across products: resolve
+        # each (type, name) to its entity ID once. IDs come from add_entity,
+        # so edges skip add_relationship's existence checks.
+        shared_ids: Dict[Tuple[str, str], str] = {}
+        
+        def shared_entity(entity_type: str, name: str) -> str:
+            key = (entity_type, name)
+            entity_id = shared_ids.get(key)
+            if entity_id is None:
+                entity_id = shared_ids[key] = self.add_entity(entity_type, name)
+            return entity_id
         
         for product in products:
+            # Each field is read once; short strings slice to themselves
+            brand = product.get("brand")
+            category = product.get("category", "")
+            features = product.get("features") or []
+            description = product.get("description") or ""
+            
             # Add product entity with rich properties
             product_name = product.get("name", "Unknown")
             product_id = self.add_entity("product", product_name, {
@@ -363,49 +640,79 @@ class KnowledgeGraph:
                 "rating": product.get("rating"),
                 "reviews_count": product.get("reviews_count"),
                 "brand": product.get("brand", ""),
-                "category": product.get("category", ""),
-                "features": product.get("features", [])[:5],  # Limit to 5 features
-                "description": product.get("description", "")[:200] if product.get("description") else ""  # Truncate description
+                "category": category,
+                "features": features[:5],  # Limit to 5 features
+                "description": description[:200]  # Truncate description
             })
             
             # Add brand and create relationship
-            brand = product.get("brand")
             if brand:
-                brand_id = self.add_entity("brand", brand)
-                self.add_relationship(product_id, "MADE_BY", brand_id)
+                self._link(product_id, "MADE_BY", shared_entity("brand", brand))
             
             # Add category and create relationship
-            category = product.get("category", "")
             if category:
                 # Handle compound categories like "Kitchen - Pressure Cooker"
-                main_category = category.split(" - ")[0] if " - " in category else category
-                category_id = self.add_entity("category", main_category)
-                self.add_relationship(product_id, "BELONGS_TO", category_id)
+                main_category = category.partition(" - ")[0]
+                self._link(product_id, "BELONGS_TO", shared_entity("category", main_category))
             
-            # Add price range relationship
+            # Add price range relationship (ranges are contiguous and sorted)
             price = product.get("price", 0)
-            for pr_name, pr_min, pr_max in price_ranges:
-                if pr_min <= price < pr_max:
-                    pr_id = self._generate_id("price_range", pr_name)
-                    self.add_relationship(product_id, "IN_PRICE_RANGE", pr_id)
-                    break
+            idx = bisect_right(price_range_lows, price) - 1
+            if idx >= 0 and price < price_ranges[idx][2]:
+                self._link(product_id, "IN_PRICE_RANGE", price_range_ids[idx])
             
             # Add feature relationships
-            features = product.get("features", [])
-            for feature in features[:3]:  # Limit features per product
-                feature_id = self.add_entity("feature", feature)
-                self.add_relationship(product_id, "HAS_FEATURE", feature_id)
+            for feature in islice(features, 3):  # Limit features per product
+                self._link(product_id, "HAS_FEATURE", shared_entity("feature", feature))
         
         logger.info(f"Knowledge graph built: {len(self.entities)} entities, "
-                    f"{sum(len(r) for r in self.relationships.values())} relationships")
+                    f"{len(self._edges)} relationships")
     
     def to_json(self) -> str:
         """Export graph as JSON."""
         return json.dumps({
-            "entities": self.entities,
+            "entities": {eid: entity.to_dict() for eid, entity in self.entities.items()},
             "relationships": dict(self.relationships),
             "stats": self.get_stats()
         }, indent=2)
+    
+    def save_state(self, path: Path):
+        """Pickle the graph indexes to disk."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "entities": self.entities,
+            "relationships": dict(self.relationships),
+            "reverse_relationships": dict(self.reverse_relationships),
+            "entities_by_type": dict(self.entities_by_type),
+            "name_to_id": self.name_to_id
+        }
+        with open(path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info(f"Saved knowledge graph state to {path}")
+    
+    def load_state(self, path: Path):
+        """Restore graph indexes pickled by save_state()."""
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        # States saved before entities were slotted hold plain dicts
+        self.entities = {
+            eid: Entity(**entity) if isinstance(entity, dict) else entity
+            for eid, entity in state["entities"].items()
+        }
+        self.relationships = defaultdict(list, state["relationships"])
+        self.reverse_relationships = defaultdict(list, state["reverse_relationships"])
+        self.entities_by_type = defaultdict(set, state["entities_by_type"])
+        self.name_to_id = state["name_to_id"]
+        self._sources_by_relation = defaultdict(list)
+        self._edges = set()
+        for target_id, incoming in self.reverse_relationships.items():
+            for rel_type, source_id in incoming:
+                self._sources_by_relation[(rel_type, target_id)].append(source_id)
+                self._edges.add((source_id, rel_type, target_id))
+        self._reset_name_index()
+        self._version += 1
+        logger.info(f"Loaded knowledge graph state from {path}: {len(self.entities)} entities")
 
 
 # Global knowledge graph instance
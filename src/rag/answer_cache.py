@@ -0,0 +1,155 @@
+"""
+Answer Cache - Reuse LLM Answers for Repeated Questions.
+
+Keeps recently generated answers in memory, keyed by the exact question
+and everything else the answer depends on. A question that misses the
+exact key can still reuse the answer of a near-duplicate question asked
+with the same context, found by embedding similarity.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Answers kept in memory, least recently used evicted first
+ANSWER_CACHE_SIZE = 512
+
+# Cosine similarity at which a cached question counts as the same question
+SIMILARITY_THRESHOLD = 0.95
+
+
+class AnswerCache:
+    """
+    LRU cache of answers keyed by (question, scope).
+    
+    The scope identifies what else the answer depends on (context, model,
+    generation settings); semantic matches are only made between questions
+    with the same scope. Without an embedding model only exact matches are
+    made. Safe to share between threads.
+    """
+    
+    def __init__(
+        self,
+        embedding_model=None,
+        maxsize: int = ANSWER_CACHE_SIZE,
+        threshold: float = SIMILARITY_THRESHOLD
+    ):
+        self.embedding_model = embedding_model
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        # Exact key -> (slot, answer), least recently used first
+        self._entries: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        
+        # Per slot: the normalized question embedding, the scope it can be
+        # matched in (None when it can't) and the exact key owning the slot
+        dim = embedding_model.embedding_dimension if embedding_model is not None else 0
+        self._embeddings = np.zeros((maxsize, dim), dtype=np.float32)
+        self._scopes = np.full(maxsize, None, dtype=object)
+        self._slot_keys: List[Optional[str]] = [None] * maxsize
+    
+    @staticmethod
+    def key(question: str, scope: str) -> str:
+        """Exact-match key for a question within a scope."""
+        return hashlib.sha1(f"{scope}\0{question}".encode("utf-8")).hexdigest()
+    
+    def get(
+        self,
+        question: str,
+        scope: str,
+        semantic: bool = True
+    ) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        Look up the cached answer for a question.
+        
+        Args:
+            question: Question text
+            scope: Identifies the context and settings the answer depends on
+            semantic: Also match near-duplicate questions by embedding
+        
+        Returns:
+            (cached answer or None, the question's embedding if one was
+            computed, to be passed on to put())
+        """
+        key = self.key(question, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1], None
+        
+        if not semantic or self.embedding_model is None:
+            with self._lock:
+                self.misses += 1
+            return None, None
+        
+        # Embed outside the lock; the model is the slow part
+        embedding = np.asarray(self.embedding_model.embed_query(question), dtype=np.float32)
+        embedding = embedding / max(float(np.linalg.norm(embedding)), 1e-12)
+        
+        with self._lock:
+            slots = np.flatnonzero(self._scopes == scope)
+            if slots.size:
+                scores = self._embeddings[slots] @ embedding
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    match_key = self._slot_keys[slots[best]]
+                    self._entries.move_to_end(match_key)
+                    self.hits += 1
+                    return self._entries[match_key][1], embedding
+            self.misses += 1
+        return None, embedding
+    
+    def put(
+        self,
+        question: str,
+        scope: str,
+        answer: str,
+        embedding: Optional[np.ndarray] = None
+    ):
+        """
+        Cache an answer, evicting the least recently used one when full.
+        
+        Args:
+            question: Question text
+            scope: Identifies the context and settings the answer depends on
+            answer: Generated answer
+            embedding: Normalized question embedding from get(); without one
+                the answer is only reused for the exact same question
+        """
+        if self.maxsize <= 0:
+            return
+        
+        key = self.key(question, scope)
+        with self._lock:
+            if key in self._entries:
+                slot = self._entries.pop(key)[0]
+            elif len(self._entries) < self.maxsize:
+                slot = len(self._entries)
+            else:
+                _, (slot, _) = self._entries.popitem(last=False)
+            
+            self._entries[key] = (slot, answer)
+            self._slot_keys[slot] = key
+            if embedding is not None:
+                self._embeddings[slot] = embedding
+                self._scopes[slot] = scope
+            else:
+                self._scopes[slot] = None
+    
+    def stats(self) -> dict:
+        """Hits, misses and size since the cache was created."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+    
+    def clear(self):
+        """Drop all cached answers."""
+        with self._lock:
+            self._entries.clear()
+            self._scopes[:] = None
+            self._slot_keys = [None] * self.maxsize
@@ -4,11 +4,13 @@ RAG Chain - Complete Retrieval-Augmented Generation pipeline.
 Orchestrates the full flow:
 Query → Retrieve → Generate → Respond with Sources
 """
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Dict, Any, Optional, List, Tuple
 
 from .retriever import Retriever
-from .generator import LLMGenerator
+from .generator import LLMGenerator, RAG_PROMPT_TEMPLATE
 from ..vectorstore import VectorStore
 
 logger = logging.getLogger(__name__)
@@ -26,19 +28,28 @@ class RAGChain:
         vector_store: VectorStore,
         generator: LLMGenerator,
         top_k: int = 5,
-        score_threshold: float = 0.1  # Lowered from 0.3
+        score_threshold: float = 0.1,  # Lowered from 0.3
+        hybrid_search: bool = False,
+        cache_context: bool = False
     ):
         """
         Initialize the RAG chain.
+        
+        Args:
+            hybrid_search: Fuse vector search with BM25 keyword ranking
+            cache_context: Store large contexts that are asked about
+                repeatedly in Gemini context caches
         """
         self.vector_store = vector_store
         self.generator = generator
+        self.cache_context = cache_context
         
         # Initialize retriever with lower threshold
         self.retriever = Retriever(
             vector_store=vector_store,
             top_k=top_k,
-            score_threshold=score_threshold
+            score_threshold=score_threshold,
+            hybrid=hybrid_search
         )
         
         logger.info("RAG chain initialized")
@@ -60,63 +71,199 @@ class RAGChain:
         logger.info(f"Processing query [{retrieval_mode}]: {question[:100]}...")
         
         doc_count = self.vector_store.count()
-        kg = get_knowledge_graph()
         
         # Step 1: Vector Search (skip if graph_only mode)
         retrieved_docs = []
         if retrieval_mode in ["vector_only", "hybrid"] and doc_count > 0:
-            all_results = self.vector_store.search(question, k=self.retriever.top_k)
+            all_results = self.vector_store.search(question, k=self.retriever.top_k, hybrid=self.retriever.hybrid)
             retrieved_docs = all_results[:3] if all_results else []
             logger.info(f"Vector search returned {len(retrieved_docs)} documents")
         
+        context, sources, retrieved_docs, found_entities = self._build_context(
+            question, retrieval_mode, retrieved_docs
+        )
+        
+        # If no documents and no graph context, let LLM respond naturally
+        if not context:
+            answer = self.generator.generate(question)
+            return self._no_context_response(answer, doc_count, retrieval_mode)
+        
+        # Step 5: Generate answer
+        result = self.generator.generate_with_sources(
+            question=question,
+            context=context,
+            sources=sources,
+            cache_context=self.cache_context
+        )
+        return self._context_response(result, context, retrieved_docs, found_entities, retrieval_mode)
+    
+    async def aquery(self, question: str, retrieval_mode: str = "hybrid") -> Dict[str, Any]:
+        """
+        Async version of query().
+        
+        Embedding runs in a worker thread and the answer comes from the
+        Gemini async API, so many queries can be in flight at once.
+        """
+        logger.info(f"Processing query [{retrieval_mode}]: {question[:100]}...")
+        
+        doc_count = self.vector_store.count()
+        
+        # Step 1: Vector Search (skip if graph_only mode)
+        retrieved_docs = []
+        if retrieval_mode in ["vector_only", "hybrid"] and doc_count > 0:
+            all_results = await self.vector_store.asearch(question, k=self.retriever.top_k, hybrid=self.retriever.hybrid)
+            retrieved_docs = all_results[:3] if all_results else []
+            logger.info(f"Vector search returned {len(retrieved_docs)} documents")
+        
+        return await self._aanswer(question, retrieval_mode, retrieved_docs, doc_count)
+    
+    async def aquery_many(self, questions: List[str], retrieval_mode: str = "hybrid") -> List[Dict[str, Any]]:
+        """
+        Answer several independent questions concurrently.
+        
+        All questions are embedded and searched in one batch (in a worker
+        thread), then their answers are generated concurrently; the
+        generator caps how many Gemini calls are in flight.
+        
+        Args:
+            questions: Questions to answer
+            retrieval_mode: As for query(), applied to every question
+            
+        Returns:
+            query() results, one per question, in order
+        """
+        if not questions:
+            return []
+        logger.info(f"Processing {len(questions)} queries [{retrieval_mode}]")
+        
+        doc_count = self.vector_store.count()
+        
+        all_results = [[] for _ in questions]
+        if retrieval_mode in ["vector_only", "hybrid"] and doc_count > 0:
+            all_results = await asyncio.to_thread(
+                self.vector_store.search_batch, questions, self.retriever.top_k, hybrid=self.retriever.hybrid
+            )
+        
+        return list(await asyncio.gather(*(
+            self._aanswer(question, retrieval_mode, results[:3], doc_count)
+            for question, results in zip(questions, all_results)
+        )))
+    
+    async def _aanswer(
+        self,
+        question: str,
+        retrieval_mode: str,
+        retrieved_docs: List[Dict[str, Any]],
+        doc_count: int
+    ) -> Dict[str, Any]:
+        """Build the context for retrieved documents and generate the answer."""
+        context, sources, retrieved_docs, found_entities = self._build_context(
+            question, retrieval_mode, retrieved_docs
+        )
+        
+        # If no documents and no graph context, let LLM respond naturally
+        if not context:
+            answer = await self.generator.agenerate(question)
+            return self._no_context_response(answer, doc_count, retrieval_mode)
+        
+        # Step 5: Generate answer
+        result = await self.generator.agenerate_with_sources(
+            question=question,
+            context=context,
+            sources=sources,
+            cache_context=self.cache_context
+        )
+        return self._context_response(result, context, retrieved_docs, found_entities, retrieval_mode)
+    
+    async def aquery_stream(self, question: str, retrieval_mode: str = "hybrid") -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming version of aquery().
+        
+        Yields events: first {"type": "sources", ...} with the sources and
+        retrieval stats, then {"type": "token", "text": ...} for each chunk
+        of the answer as Gemini generates it, then {"type": "done"}.
+        """
+        logger.info(f"Streaming query [{retrieval_mode}]: {question[:100]}...")
+        
+        doc_count = self.vector_store.count()
+        
+        retrieved_docs = []
+        if retrieval_mode in ["vector_only", "hybrid"] and doc_count > 0:
+            all_results = await self.vector_store.asearch(question, k=self.retriever.top_k, hybrid=self.retriever.hybrid)
+            retrieved_docs = all_results[:3] if all_results else []
+        
+        context, sources, retrieved_docs, found_entities = self._build_context(
+            question, retrieval_mode, retrieved_docs
+        )
+        
+        yield {
+            "type": "sources",
+            "sources": sources,
+            "context_used": bool(context),
+            "documents_retrieved": len(retrieved_docs),
+            "graph_entities_found": len(found_entities),
+            "retrieval_mode": retrieval_mode
+        }
+        async for text in self.generator.agenerate_stream(question, context=context):
+            yield {"type": "token", "text": text}
+        yield {"type": "done"}
+    
+    def _build_context(
+        self,
+        question: str,
+        retrieval_mode: str,
+        retrieved_docs: List[Dict[str, Any]]
+    ) -> Tuple[str, List[Dict[str, Any]], List[Dict[str, Any]], List[str]]:
+        """
+        Run graph search and assemble the LLM context.
+        
+        Returns:
+            (context, sources, retrieved_docs, found_entities) - context is
+            empty when neither vector nor graph search found anything
+        """
+        kg = get_knowledge_graph()
+        
         # Step 2: Graph Search (skip if vector_only mode)
-        graph_context = ""
+        graph_parts = []
         found_entities = []
         
         if retrieval_mode in ["graph_only", "hybrid"]:
             try:
-                # Search for matching entities in the graph
-                matching_entities = kg.search_entities(question)
+                # Search for matching entities in the graph; use only the
+                # top 2 to avoid context overflow
+                matching_entities = kg.search_entities(question, limit=2)
+                # Fetch details including the top 5 relationships of each
+                related_by_id = kg.batch_get_related([e.id for e in matching_entities], limit_per=5)
                 
                 for entity in matching_entities:
-                    # Fetch details including relationships
-                    related = kg.get_related(entity['id'])
-                    found_entities.append(entity['name'])
+                    related = related_by_id[entity.id]
+                    found_entities.append(entity.name)
                     
                     # Format graph context
-                    graph_context += f"Entity: {entity['name']} ({entity['type']})\n"
-                    if entity.get('properties'):
-                        props = ", ".join([f"{k}: {v}" for k, v in entity['properties'].items() if v])
-                        graph_context += f"Properties: {props}\n"
+                    graph_parts.append(f"Entity: {entity.name} ({entity.type})\n")
+                    if entity.properties:
+                        props = ", ".join(f"{k}: {v}" for k, v in entity.properties.items() if v)
+                        graph_parts.append(f"Properties: {props}\n")
                     
                     if related:
-                        rels = []
-                        for rel in related[:5]:  # Top 5 relationships
-                            direction = "->" if rel['direction'] == 'outgoing' else "<-"
-                            rels.append(f"{direction} {rel['relationship']} {rel['entity']['name']} ({rel['entity']['type']})")
-                        graph_context += "Relationships:\n- " + "\n- ".join(rels) + "\n"
-                    graph_context += "\n"
-                    
-                    # Use only top 2 matched entities to avoid context overflow
-                    if len(found_entities) >= 2:
-                        break
+                        graph_parts.append("Relationships:\n- ")
+                        graph_parts.append("\n- ".join(
+                            f"{'->' if rel['direction'] == 'outgoing' else '<-'} "
+                            f"{rel['relationship']} {rel['entity'].name} ({rel['entity'].type})"
+                            for rel in related
+                        ))
+                        graph_parts.append("\n")
+                    graph_parts.append("\n")
                         
-                if graph_context:
+                if graph_parts:
                     logger.info(f"Graph search found entities: {found_entities}")
             except Exception as e:
                 logger.warning(f"Graph retrieval failed: {e}")
+        
+        graph_context = "".join(graph_parts)
 
-        # If no documents and no graph context, let LLM respond naturally
         if not retrieved_docs and not graph_context:
-            answer = self.generator.generate(question)
-            return {
-                "answer": answer,
-                "sources": [],
-                "context_used": False,
-                "documents_searched": doc_count,
-                "retrieval_mode": retrieval_mode,
-                "graph_entities_found": 0
-            }
+            return "", [], retrieved_docs, found_entities
             
         # HYBRID STRATEGY: Combine both vector and graph results
         # Graph provides structured facts, vector provides broader context
@@ -180,17 +327,34 @@ class RAGChain:
                     "relevance_score": doc.get("score", 0)
                 })
         
-        # Step 5: Generate answer
-        result = self.generator.generate_with_sources(
-            question=question,
-            context=context,
-            sources=sources
-        )
-        
+        return context, sources, retrieved_docs, found_entities
+    
+    def _no_context_response(self, answer: str, doc_count: int, retrieval_mode: str) -> Dict[str, Any]:
+        """Response for an answer generated without retrieved context."""
+        return {
+            "answer": answer,
+            "sources": [],
+            "context_used": False,
+            "context_length": 0,
+            "documents_searched": doc_count,
+            "retrieval_mode": retrieval_mode,
+            "graph_entities_found": 0
+        }
+    
+    def _context_response(
+        self,
+        result: Dict[str, Any],
+        context: str,
+        retrieved_docs: List[Dict[str, Any]],
+        found_entities: List[str],
+        retrieval_mode: str
+    ) -> Dict[str, Any]:
+        """Response for an answer grounded in retrieved context."""
         return {
             "answer": result["answer"],
             "sources": result["sources"],
             "context_used": True,
+            "context_length": len(context),
             "documents_retrieved": len(retrieved_docs),
             "graph_entities_found": len(found_entities),
             "retrieval_mode": retrieval_mode,
@@ -237,6 +401,21 @@ class RAGChain:
         
         return len(texts)
     
+    @property
+    def version(self) -> str:
+        """
+        Fingerprint of what answers depend on: the LLM, the prompt
+        template, the retriever settings and the set of stored documents.
+        
+        Hashes every document ID, so compute it once per batch of queries.
+        """
+        ids = "\n".join(sorted(self.vector_store.get_all_ids()))
+        key = (
+            f"{self.generator.model_name}:{RAG_PROMPT_TEMPLATE}:{self.retriever.top_k}:"
+            f"{self.retriever.score_threshold}:{self.retriever.hybrid}:{ids}"
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get RAG chain statistics."""
         store_stats = self.vector_store.get_stats()
@@ -4,18 +4,65 @@ LLM Generator - Google Gemini Integration
 Uses Google's Gemini API for answer generation.
 FREE tier available at: https://aistudio.google.com/app/apikey
 """
+import asyncio
+import hashlib
 import logging
+import random
+import re
+import threading
 import time
-from typing import Optional
+import weakref
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Tuple
+
+from .answer_cache import ANSWER_CACHE_SIZE, AnswerCache
 
 logger = logging.getLogger(__name__)
 
-# Retry configuration for rate limits
+# Retry configuration for rate limits and transient server errors
 MAX_RETRIES = 5
 INITIAL_BACKOFF = 3  # seconds
+MAX_BACKOFF = 60  # seconds
+
+# HTTP statuses worth retrying: rate limited, or the service briefly failing
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+SERVER_ERROR_MARKERS = ("500", "502", "503", "504", "UNAVAILABLE", "INTERNAL")
+
+# Retry delay suggested in a Gemini error body (RetryInfo), e.g. 'retryDelay': '17s'
+RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*:\s*['\"]?(\d+(?:\.\d+)?)s")
+
+# Keep-alive pool for the Gemini HTTP clients (reused across requests)
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 60  # seconds
+
+# Async Gemini calls in flight at once, per event loop
+MAX_CONCURRENT_REQUESTS = 16
+
+# Gemini context caching of RAG contexts. Gemini rejects caches below a
+# model-dependent minimum size (4,096 tokens for gemini-2.0-flash), so
+# smaller contexts are sent inline. A cache is only created the second time
+# a context is seen, since most retrieved contexts are never repeated.
+CONTEXT_CACHE_MIN_TOKENS = 4096
+CHARS_PER_TOKEN = 4  # rough estimate, only used against the minimum above
+CONTEXT_CACHE_TTL = 600  # seconds
+CONTEXT_CACHE_TTL_MARGIN = 30  # stop using a cache this long before it expires
+CONTEXT_CACHE_SIZE = 64  # cache names remembered, least recently used dropped
+
+# Gemini Batch Mode polling
+BATCH_POLL_INTERVAL = 10  # seconds
+BATCH_TIMEOUT = 6 * 60 * 60  # seconds
+BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
 
 # Try new google.genai first, fall back to old google.generativeai
 try:
+    import httpx
     from google import genai
     from google.genai import types
     USE_NEW_API = True
@@ -26,15 +73,74 @@ except ImportError:
     logger.info("Using legacy google.generativeai API")
 
 
-# Default prompt template for RAG
-RAG_PROMPT_TEMPLATE = """You are a helpful AI assistant. Answer the question based on the provided context.
+# Returned when rate-limit retries are exhausted
+HIGH_DEMAND_MESSAGE = "I'm currently experiencing high demand. Please wait a moment and try again."
+
+# Returned when Gemini gives no text (e.g. a safety-blocked or empty candidate)
+NO_RESPONSE_MESSAGE = "I couldn't generate a response."
+
+# generate() reports failures as replies starting with one of these; they are never cached
+ERROR_REPLY_PREFIXES = ("Error:", HIGH_DEMAND_MESSAGE, NO_RESPONSE_MESSAGE)
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Check if an API error is a rate limit (429) error."""
+    error_str = str(error)
+    return "429" in error_str or "RESOURCE_EXHAUSTED" in error_str or "quota" in error_str.lower()
+
+
+def _is_retryable_error(error: Exception) -> bool:
+    """Check if an API error is a rate limit or a transient server error."""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS_CODES
+    return _is_rate_limit_error(error) or any(marker in str(error) for marker in SERVER_ERROR_MARKERS)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait, from Retry-After or the error body."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    
+    match = RETRY_DELAY_RE.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+def _backoff_delay(error: Exception, previous: float) -> float:
+    """
+    Delay before the next retry.
+    
+    Uses the server's requested delay when it gives one, otherwise
+    decorrelated jitter: random between INITIAL_BACKOFF and three times
+    the previous delay, so concurrent callers spread out instead of
+    retrying in lockstep.
+    """
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        return min(retry_after, MAX_BACKOFF)
+    return min(MAX_BACKOFF, random.uniform(INITIAL_BACKOFF, previous * 3))
+
+
+# Default prompt template for RAG, in two parts: with context caching the
+# context part is cached on Gemini's side and only the question part is sent
+RAG_CONTEXT_TEMPLATE = """You are a helpful AI assistant. Answer the question based on the provided context.
 
 CONTEXT:
 {context}
 
-QUESTION: {question}
+"""
+RAG_QUESTION_TEMPLATE = """QUESTION: {question}
 
 Provide a helpful, accurate answer based on the context above. If the context is relevant, use it to answer. Be concise."""
+RAG_PROMPT_TEMPLATE = RAG_CONTEXT_TEMPLATE + RAG_QUESTION_TEMPLATE
 
 
 class LLMGenerator:
@@ -47,16 +153,60 @@ class LLMGenerator:
         api_key: str,
         model_name: str = "gemini-2.0-flash",
         temperature: float = 0.3,
-        max_output_tokens: int = 1024
+        max_output_tokens: int = 1024,
+        embedding_model=None,
+        answer_cache_size: int = ANSWER_CACHE_SIZE,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS
     ):
+        """
+        Initialize the generator.
+        
+        Args:
+            api_key: Google API key
+            model_name: Gemini model to use
+            temperature: Default sampling temperature
+            max_output_tokens: Default output token limit
+            embedding_model: Also lets the answer cache reuse answers to
+                near-duplicate questions asked with the same context. Off by
+                default: similar questions about different products can
+                share retrieved context but need different answers
+            answer_cache_size: Answers kept in the cache (0 disables it)
+            max_concurrency: Async Gemini calls in flight at once
+        """
         self.api_key = api_key
         self.model_name = model_name
         self.temperature = temperature
         self.max_output_tokens = max_output_tokens
+        self.max_concurrency = max_concurrency
+        
+        # asyncio semaphores belong to one event loop, so keep one per loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        
+        self.answer_cache: Optional[AnswerCache] = None
+        if answer_cache_size > 0:
+            self.answer_cache = AnswerCache(embedding_model, maxsize=answer_cache_size)
+        
+        # Context key -> (Gemini cache name, or None if creating it failed,
+        # monotonic time to stop using it), least recently used first
+        self._context_caches: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        # Context keys seen once without a cache, least recently used first
+        self._context_sightings: "OrderedDict[str, None]" = OrderedDict()
+        self._context_caches_lock = threading.Lock()
         
         if USE_NEW_API:
-            # New google.genai API
-            self.client = genai.Client(api_key=api_key)
+            # New google.genai API - one client, so one pooled HTTP session
+            # for sync calls and one for async (client.aio) calls
+            pool = {
+                "limits": httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY
+                )
+            }
+            self.client = genai.Client(
+                api_key=api_key,
+                http_options=types.HttpOptions(client_args=pool, async_client_args=pool)
+            )
         else:
             # Legacy API
             genai_old.configure(api_key=api_key)
@@ -70,24 +220,173 @@ class LLMGenerator:
         
         logger.info(f"Initialized Gemini model: {model_name}")
     
-    def generate(
+    def close(self):
+        """Release the pooled HTTP connections held by the Gemini client."""
+        if USE_NEW_API:
+            self.client.close()
+    
+    async def aclose(self):
+        """Release the pooled connections of both the sync and async Gemini clients."""
+        if USE_NEW_API:
+            await self.client.aio.aclose()
+            self.client.close()
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Semaphore capping async Gemini calls on the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+    
+    def _generation_settings(
         self,
-        prompt: str,
-        context: str = "",
-        system_prompt: Optional[str] = None
-    ) -> str:
-        """Generate a response using the LLM with retry logic for rate limits."""
-        # Build prompt
+        temperature: Optional[float],
+        max_output_tokens: Optional[int]
+    ) -> dict:
+        """Per-call generation settings, defaulting to the generator's own."""
+        return {
+            "temperature": self.temperature if temperature is None else temperature,
+            "max_output_tokens": self.max_output_tokens if max_output_tokens is None else max_output_tokens,
+        }
+    
+    def _build_prompt(self, prompt: str, context: str) -> str:
+        """Wrap the prompt in the RAG template when context is given."""
         if context:
-            full_prompt = RAG_PROMPT_TEMPLATE.format(
+            return RAG_PROMPT_TEMPLATE.format(
                 context=context,
                 question=prompt
             )
-        else:
-            full_prompt = prompt
+        return prompt
+    
+    def _cache_scope(self, context: str, settings: dict) -> str:
+        """Answer cache scope: everything besides the question an answer depends on."""
+        return hashlib.sha1(
+            f"{self.model_name}\0{settings['temperature']}\0{settings['max_output_tokens']}\0{context}".encode("utf-8")
+        ).hexdigest()
+    
+    def _context_cacheable(self, context: str) -> bool:
+        """Whether a context is large enough for Gemini context caching."""
+        return USE_NEW_API and len(context) >= CONTEXT_CACHE_MIN_TOKENS * CHARS_PER_TOKEN
+    
+    def _context_cache_key(self, context: str) -> str:
+        """Identifies a context cache: the model and the exact context text."""
+        return hashlib.sha1(f"{self.model_name}\0{context}".encode("utf-8")).hexdigest()
+    
+    def _context_cache_config(self, context: str) -> "types.CreateCachedContentConfig":
+        """Config creating a Gemini cache of the context part of the RAG prompt."""
+        return types.CreateCachedContentConfig(
+            contents=[RAG_CONTEXT_TEMPLATE.format(context=context)],
+            ttl=f"{CONTEXT_CACHE_TTL}s"
+        )
+    
+    def _known_context_cache(self, key: str) -> Tuple[bool, Optional[str]]:
+        """
+        (whether the key is known and unexpired, its cache name).
         
-        # Retry loop with exponential backoff
+        The first sighting of a key counts as known with no cache, so the
+        context is sent inline and only a repeat creates a cache.
+        """
+        with self._context_caches_lock:
+            entry = self._context_caches.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._context_caches.move_to_end(key)
+                return True, entry[0]
+            if key in self._context_sightings:
+                del self._context_sightings[key]
+                return False, None
+            self._context_sightings[key] = None
+            if len(self._context_sightings) > CONTEXT_CACHE_SIZE:
+                self._context_sightings.popitem(last=False)
+            return True, None
+    
+    def _remember_context_cache(self, key: str, name: Optional[str]):
+        """Record a created cache (or a failed attempt, so it isn't retried until the TTL passes)."""
+        with self._context_caches_lock:
+            self._context_caches[key] = (name, time.monotonic() + CONTEXT_CACHE_TTL - CONTEXT_CACHE_TTL_MARGIN)
+            self._context_caches.move_to_end(key)
+            while len(self._context_caches) > CONTEXT_CACHE_SIZE:
+                self._context_caches.popitem(last=False)
+    
+    def _context_cache_name(self, context: str) -> Optional[str]:
+        """Name of the Gemini cache holding a context, creating it if needed (None if not cached)."""
+        key = self._context_cache_key(context)
+        known, name = self._known_context_cache(key)
+        if not known:
+            try:
+                name = self.client.caches.create(
+                    model=self.model_name, config=self._context_cache_config(context)
+                ).name
+            except Exception as e:
+                logger.info(f"Sending context inline, caching it failed: {e}")
+                name = None
+            self._remember_context_cache(key, name)
+        return name
+    
+    async def _acontext_cache_name(self, context: str) -> Optional[str]:
+        """Async version of _context_cache_name()."""
+        key = self._context_cache_key(context)
+        known, name = self._known_context_cache(key)
+        if not known:
+            try:
+                cache = await self.client.aio.caches.create(
+                    model=self.model_name, config=self._context_cache_config(context)
+                )
+                name = cache.name
+            except Exception as e:
+                logger.info(f"Sending context inline, caching it failed: {e}")
+                name = None
+            self._remember_context_cache(key, name)
+        return name
+    
+    def generate(
+        self,
+        prompt: str,
+        context: str = "",
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_output_tokens: Optional[int] = None,
+        cache_context: bool = False
+    ) -> str:
+        """
+        Generate a response using the LLM with retry logic for rate limits.
+        
+        temperature and max_output_tokens override the generator's settings
+        for this call only. With the answer cache enabled, a repeated question
+        is answered from the cache. Given an embedding model, near-duplicates
+        also match when asked with the same context; prompts without context
+        only match exactly.
+        
+        With cache_context, a large enough context seen a second time is
+        stored in a Gemini context cache and reused by later calls with the
+        same context, so only the question is sent and prefilled.
+        """
+        full_prompt = self._build_prompt(prompt, context)
+        settings = self._generation_settings(temperature, max_output_tokens)
+        
+        if self.answer_cache is not None:
+            question = prompt if context else full_prompt
+            scope = self._cache_scope(context, settings)
+            answer, embedding = self.answer_cache.get(question, scope, semantic=bool(context))
+            if answer is not None:
+                return answer
+        
+        if cache_context and self._context_cacheable(context):
+            cache_name = self._context_cache_name(context)
+            if cache_name is not None:
+                full_prompt = RAG_QUESTION_TEMPLATE.format(question=prompt)
+                settings = {**settings, "cached_content": cache_name}
+        
+        answer = self._generate(full_prompt, settings)
+        if self.answer_cache is not None and answer and not answer.startswith(ERROR_REPLY_PREFIXES):
+            self.answer_cache.put(question, scope, answer, embedding)
+        return answer
+    
+    def _generate(self, full_prompt: str, settings: dict) -> str:
+        """Call Gemini, retrying on rate limits."""
+        # Retry loop with jittered exponential backoff
         last_error = None
+        wait_time = INITIAL_BACKOFF
         for attempt in range(MAX_RETRIES + 1):
             try:
                 if USE_NEW_API:
@@ -95,33 +394,30 @@ class LLMGenerator:
                     response = self.client.models.generate_content(
                         model=self.model_name,
                         contents=full_prompt,
-                        config=types.GenerateContentConfig(
-                            temperature=self.temperature,
-                            max_output_tokens=self.max_output_tokens,
-                        )
+                        config=types.GenerateContentConfig(**settings)
                     )
-                    return response.text
+                    # text is None when the candidate was blocked or empty
+                    return response.text or NO_RESPONSE_MESSAGE
                 else:
                     # Legacy API
-                    response = self.model.generate_content(full_prompt)
+                    response = self.model.generate_content(full_prompt, generation_config=settings)
                     if response.parts:
                         return response.text
-                    return "I couldn't generate a response."
+                    return NO_RESPONSE_MESSAGE
                     
             except Exception as e:
                 last_error = e
-                error_str = str(e)
                 
-                # Check if it's a rate limit error (429)
-                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str or "quota" in error_str.lower():
+                # Retry rate limits (429) and transient server errors (5xx)
+                if _is_retryable_error(e):
                     if attempt < MAX_RETRIES:
-                        wait_time = INITIAL_BACKOFF * (2 ** attempt)  # Exponential backoff
-                        logger.warning(f"Rate limit hit, retrying in {wait_time}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                        wait_time = _backoff_delay(e, wait_time)
+                        logger.warning(f"Gemini call failed ({e}), retrying in {wait_time:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
                         time.sleep(wait_time)
                         continue
                     else:
-                        logger.error(f"Rate limit exceeded after {MAX_RETRIES} retries")
-                        return "I'm currently experiencing high demand. Please wait a moment and try again."
+                        logger.error(f"Gemini call still failing after {MAX_RETRIES} retries")
+                        return HIGH_DEMAND_MESSAGE
                 else:
                     # Non-rate-limit error, don't retry
                     logger.error(f"Error generating response: {e}")
@@ -129,16 +425,374 @@ class LLMGenerator:
         
         # If we get here, all retries failed
         logger.error(f"All retries failed: {last_error}")
-        return "I'm currently experiencing high demand. Please wait a moment and try again."
+        return HIGH_DEMAND_MESSAGE
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        context: str = "",
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_output_tokens: Optional[int] = None,
+        cache_context: bool = False
+    ) -> str:
+        """Async version of generate() using the Gemini async API."""
+        full_prompt = self._build_prompt(prompt, context)
+        settings = self._generation_settings(temperature, max_output_tokens)
+        
+        if self.answer_cache is not None:
+            # Embedding the question for the cache lookup runs in a worker thread
+            question = prompt if context else full_prompt
+            scope = self._cache_scope(context, settings)
+            answer, embedding = await asyncio.to_thread(
+                self.answer_cache.get, question, scope, bool(context)
+            )
+            if answer is not None:
+                return answer
+        
+        if cache_context and self._context_cacheable(context):
+            cache_name = await self._acontext_cache_name(context)
+            if cache_name is not None:
+                full_prompt = RAG_QUESTION_TEMPLATE.format(question=prompt)
+                settings = {**settings, "cached_content": cache_name}
+        
+        answer = await self._agenerate(full_prompt, settings)
+        if self.answer_cache is not None and answer and not answer.startswith(ERROR_REPLY_PREFIXES):
+            self.answer_cache.put(question, scope, answer, embedding)
+        return answer
+    
+    async def _agenerate(self, full_prompt: str, settings: dict) -> str:
+        """Async version of _generate()."""
+        # Retry loop with jittered exponential backoff
+        last_error = None
+        wait_time = INITIAL_BACKOFF
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                # Only the call itself holds a slot, not the backoff sleeps
+                if USE_NEW_API:
+                    # New API
+                    async with self._semaphore():
+                        response = await self.client.aio.models.generate_content(
+                            model=self.model_name,
+                            contents=full_prompt,
+                            config=types.GenerateContentConfig(**settings)
+                        )
+                    # text is None when the candidate was blocked or empty
+                    return response.text or NO_RESPONSE_MESSAGE
+                else:
+                    # Legacy API
+                    async with self._semaphore():
+                        response = await self.model.generate_content_async(full_prompt, generation_config=settings)
+                    if response.parts:
+                        return response.text
+                    return NO_RESPONSE_MESSAGE
+                    
+            except Exception as e:
+                last_error = e
+                
+                # Retry rate limits (429) and transient server errors (5xx)
+                if _is_retryable_error(e):
+                    if attempt < MAX_RETRIES:
+                        wait_time = _backoff_delay(e, wait_time)
+                        logger.warning(f"Gemini call failed ({e}), retrying in {wait_time:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                        await asyncio.sleep(wait_time)
+                        continue
+                    else:
+                        logger.error(f"Gemini call still failing after {MAX_RETRIES} retries")
+                        return HIGH_DEMAND_MESSAGE
+                else:
+                    # Non-rate-limit error, don't retry
+                    logger.error(f"Error generating response: {e}")
+                    return f"Error: {str(e)}"
+        
+        # If we get here, all retries failed
+        logger.error(f"All retries failed: {last_error}")
+        return HIGH_DEMAND_MESSAGE
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        context: str = "",
+        temperature: Optional[float] = None,
+        max_output_tokens: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Generate a response, yielding text chunks as Gemini produces them.
+        
+        Rate limits and transient errors are retried from scratch, like
+        generate(), as long as nothing has been yielded yet. An error after
+        that ends the stream with an error message. Answers are read from
+        and stored in the answer cache like generate()'s.
+        """
+        full_prompt = self._build_prompt(prompt, context)
+        settings = self._generation_settings(temperature, max_output_tokens)
+        
+        if self.answer_cache is not None:
+            question = prompt if context else full_prompt
+            scope = self._cache_scope(context, settings)
+            answer, embedding = self.answer_cache.get(question, scope, semantic=bool(context))
+            if answer is not None:
+                yield answer
+                return
+        
+        parts = []
+        wait_time = INITIAL_BACKOFF
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                for text in self._stream_chunks(full_prompt, settings):
+                    parts.append(text)
+                    yield text
+                break
+            except Exception as e:
+                if parts or not _is_retryable_error(e):
+                    logger.error(f"Error streaming response: {e}")
+                    yield f"Error: {str(e)}"
+                    return
+                if attempt == MAX_RETRIES:
+                    logger.error(f"Gemini call still failing after {MAX_RETRIES} retries")
+                    yield HIGH_DEMAND_MESSAGE
+                    return
+                wait_time = _backoff_delay(e, wait_time)
+                logger.warning(f"Gemini call failed ({e}), retrying in {wait_time:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                time.sleep(wait_time)
+        
+        if self.answer_cache is not None and parts:
+            self.answer_cache.put(question, scope, "".join(parts), embedding)
+    
+    def _stream_chunks(self, full_prompt: str, settings: dict) -> Iterator[str]:
+        """Text chunks of one streamed Gemini call."""
+        if USE_NEW_API:
+            for chunk in self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=full_prompt,
+                config=types.GenerateContentConfig(**settings)
+            ):
+                if chunk.text:
+                    yield chunk.text
+        else:
+            for chunk in self.model.generate_content(full_prompt, generation_config=settings, stream=True):
+                if chunk.parts:
+                    yield chunk.text
+    
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        context: str = "",
+        temperature: Optional[float] = None,
+        max_output_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Async version of generate_stream() using the Gemini async API."""
+        full_prompt = self._build_prompt(prompt, context)
+        settings = self._generation_settings(temperature, max_output_tokens)
+        
+        if self.answer_cache is not None:
+            question = prompt if context else full_prompt
+            scope = self._cache_scope(context, settings)
+            answer, embedding = await asyncio.to_thread(
+                self.answer_cache.get, question, scope, bool(context)
+            )
+            if answer is not None:
+                yield answer
+                return
+        
+        parts = []
+        wait_time = INITIAL_BACKOFF
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                # The stream holds its slot until the last chunk arrives
+                async with self._semaphore():
+                    async for text in self._astream_chunks(full_prompt, settings):
+                        parts.append(text)
+                        yield text
+                break
+            except Exception as e:
+                if parts or not _is_retryable_error(e):
+                    logger.error(f"Error streaming response: {e}")
+                    yield f"Error: {str(e)}"
+                    return
+                if attempt == MAX_RETRIES:
+                    logger.error(f"Gemini call still failing after {MAX_RETRIES} retries")
+                    yield HIGH_DEMAND_MESSAGE
+                    return
+                wait_time = _backoff_delay(e, wait_time)
+                logger.warning(f"Gemini call failed ({e}), retrying in {wait_time:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                await asyncio.sleep(wait_time)
+        
+        if self.answer_cache is not None and parts:
+            self.answer_cache.put(question, scope, "".join(parts), embedding)
+    
+    async def _astream_chunks(self, full_prompt: str, settings: dict) -> AsyncIterator[str]:
+        """Async version of _stream_chunks()."""
+        if USE_NEW_API:
+            stream = await self.client.aio.models.generate_content_stream(
+                model=self.model_name,
+                contents=full_prompt,
+                config=types.GenerateContentConfig(**settings)
+            )
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+        else:
+            response = await self.model.generate_content_async(full_prompt, generation_config=settings, stream=True)
+            async for chunk in response:
+                if chunk.parts:
+                    yield chunk.text
+    
+    async def agenerate_many(
+        self,
+        prompts: Sequence[str],
+        contexts: Optional[Sequence[str]] = None,
+        temperature: Optional[float] = None,
+        max_output_tokens: Optional[int] = None
+    ) -> List[str]:
+        """
+        Generate responses for many prompts concurrently.
+        
+        At most max_concurrency calls are in flight at once; the rest wait
+        for a free slot on the shared connection pool.
+        
+        Args:
+            prompts: Prompts (questions, when contexts are given)
+            contexts: Optional context per prompt, applied with the RAG template
+            temperature: Overrides the generator's temperature
+            max_output_tokens: Overrides the generator's output token limit
+            
+        Returns:
+            One response text per prompt, in order
+        """
+        if contexts is None:
+            contexts = [""] * len(prompts)
+        return list(await asyncio.gather(*(
+            self.agenerate(prompt, context, temperature=temperature, max_output_tokens=max_output_tokens)
+            for prompt, context in zip(prompts, contexts)
+        )))
+    
+    def generate_batch(
+        self,
+        prompts: List[str],
+        display_name: str = "rag-batch",
+        poll_interval: float = BATCH_POLL_INTERVAL,
+        timeout: float = BATCH_TIMEOUT,
+        temperature: Optional[float] = None,
+        max_output_tokens: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """
+        Generate responses for many prompts as one Gemini Batch Mode job.
+        
+        The job is submitted with inline requests and polled until it
+        finishes, replacing one API round-trip per prompt. The legacy API
+        has no batch support, so it falls back to sequential generate().
+        
+        Args:
+            prompts: Prompts to run (no RAG template is applied)
+            display_name: Job name shown in the Gemini console
+            poll_interval: Seconds between job status checks
+            timeout: Seconds to wait before giving up on the job
+            temperature: Overrides the generator's temperature for the job
+            max_output_tokens: Overrides the generator's output token limit
+            
+        Returns:
+            One response text per prompt, in order (None where the request failed)
+            
+        Raises:
+            RuntimeError: If the job fails, is cancelled/expired or times out.
+                A job still running when polling gives up is cancelled first,
+                so callers falling back to per-prompt calls don't pay twice.
+        """
+        if not prompts:
+            return []
+        
+        if not USE_NEW_API:
+            return [
+                self.generate(prompt, temperature=temperature, max_output_tokens=max_output_tokens)
+                for prompt in prompts
+            ]
+        
+        settings = self._generation_settings(temperature, max_output_tokens)
+        
+        job = self.client.batches.create(
+            model=self.model_name,
+            src=[
+                {
+                    "contents": [{"parts": [{"text": prompt}], "role": "user"}],
+                    "config": settings,
+                }
+                for prompt in prompts
+            ],
+            config={"display_name": display_name}
+        )
+        logger.info(f"Submitted Gemini batch {job.name} with {len(prompts)} requests")
+        
+        deadline = time.monotonic() + timeout
+        try:
+            while job.state.name not in BATCH_DONE_STATES:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"Batch {job.name} did not finish within {timeout}s")
+                time.sleep(poll_interval)
+                job = self._get_batch(job.name)
+        except BaseException:
+            self._cancel_batch(job.name)
+            raise
+        
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            raise RuntimeError(f"Batch {job.name} ended in state {job.state.name}: {job.error}")
+        
+        texts = []
+        for item in job.dest.inlined_responses:
+            if item.response:
+                texts.append(item.response.text)
+            else:
+                logger.warning(f"Batch request failed: {item.error}")
+                texts.append(None)
+        
+        logger.info(f"Batch {job.name} finished")
+        return texts
+    
+    def _get_batch(self, name: str):
+        """Fetch a batch job's status, retrying rate limits and transient server errors."""
+        wait_time = INITIAL_BACKOFF
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return self.client.batches.get(name=name)
+            except Exception as e:
+                if not _is_retryable_error(e) or attempt == MAX_RETRIES:
+                    raise
+                wait_time = _backoff_delay(e, wait_time)
+                logger.warning(f"Polling batch {name} failed ({e}), retrying in {wait_time:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+                time.sleep(wait_time)
+    
+    def _cancel_batch(self, name: str):
+        """Cancel a batch job that is being given up on (best effort)."""
+        try:
+            self.client.batches.cancel(name=name)
+            logger.warning(f"Cancelled Gemini batch {name}")
+        except Exception as e:
+            logger.error(f"Could not cancel Gemini batch {name}: {e}")
     
     def generate_with_sources(
         self,
         question: str,
         context: str,
-        sources: list
+        sources: list,
+        cache_context: bool = False
     ) -> dict:
         """Generate a response with source citations."""
-        answer = self.generate(question, context=context)
+        answer = self.generate(question, context=context, cache_context=cache_context)
+        return {
+            "answer": answer,
+            "sources": sources,
+            "model": self.model_name
+        }
+    
+    async def agenerate_with_sources(
+        self,
+        question: str,
+        context: str,
+        sources: list,
+        cache_context: bool = False
+    ) -> dict:
+        """Async version of generate_with_sources()."""
+        answer = await self.agenerate(question, context=context, cache_context=cache_context)
         return {
             "answer": answer,
             "sources": sources,
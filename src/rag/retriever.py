@@ -2,7 +2,7 @@
 Retriever - Semantic search for relevant documents.
 
 Retrieves the most relevant document chunks for a given query
-using vector similarity search.
+using vector similarity search, optionally fused with BM25.
 """
 import logging
 from typing import List, Dict, Any, Optional
@@ -17,6 +17,7 @@ class Retriever:
     
     Features:
     - Semantic search via embeddings
+    - Optional hybrid (dense + BM25) ranking
     - Metadata filtering
     - Score thresholding
     - Configurable top-k
@@ -26,7 +27,8 @@ class Retriever:
         self,
         vector_store: VectorStore,
         top_k: int = 5,
-        score_threshold: float = 0.3
+        score_threshold: float = 0.3,
+        hybrid: bool = False
     ):
         """
         Initialize the retriever.
@@ -35,10 +37,13 @@ class Retriever:
             vector_store: Vector store instance
             top_k: Number of documents to retrieve
             score_threshold: Minimum similarity score (0-1)
+            hybrid: Rank by reciprocal rank fusion of cosine similarity and
+                BM25 (see VectorStore.search)
         """
         self.vector_store = vector_store
         self.top_k = top_k
         self.score_threshold = score_threshold
+        self.hybrid = hybrid
     
     def retrieve(
         self,
@@ -63,10 +68,39 @@ class Retriever:
         results = self.vector_store.search(
             query=query,
             k=num_results,
-            filter_metadata=filter_metadata
+            filter_metadata=filter_metadata,
+            hybrid=self.hybrid
         )
         
-        # Filter by score threshold
+        return self._above_threshold(results)
+    
+    def retrieve_batch(
+        self,
+        queries: List[str],
+        k: Optional[int] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve relevant documents for several queries in one vector search.
+        
+        Args:
+            queries: Search queries
+            k: Number of results per query (overrides default top_k)
+            filter_metadata: Optional metadata filter
+            
+        Returns:
+            retrieve() results for each query, in the same order
+        """
+        batch_results = self.vector_store.search_batch(
+            queries,
+            k=k or self.top_k,
+            filter_metadata=filter_metadata,
+            hybrid=self.hybrid
+        )
+        return [self._above_threshold(results) for results in batch_results]
+    
+    def _above_threshold(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filter search results by score threshold."""
         filtered_results = [
             r for r in results
             if r.get("score", 0) >= self.score_threshold
@@ -0,0 +1,107 @@
+"""
+BM25 Index - Lexical scoring for hybrid search.
+
+Okapi BM25 over an inverted index of lowercased word tokens. Documents are
+only ever appended, so the index grows alongside the vector store and a
+query is scored against every document with a few NumPy scatter-adds (one
+per query term).
+"""
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Term frequency saturation and document length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of a text."""
+    return TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """
+    Append-only BM25 index.
+    
+    Postings are kept in typed arrays (document positions in insertion
+    order, and term frequencies), so scoring copies them into NumPy without
+    a Python loop. Not thread-safe; VectorStore guards it with a lock.
+    """
+    
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        """
+        Initialize the index.
+        
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization (0 disables it)
+        """
+        self.k1 = k1
+        self.b = b
+        
+        # Term -> (positions of the documents containing it, frequency in each)
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._lengths = array("f")
+        self._total_length = 0.0
+    
+    def __len__(self) -> int:
+        """Number of indexed documents."""
+        return len(self._lengths)
+    
+    def add(self, documents: Iterable[str]):
+        """Index documents, at the positions following those already indexed."""
+        for document in documents:
+            position = len(self._lengths)
+            tokens = tokenize(document)
+            for term, frequency in Counter(tokens).items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("q"), array("f"))
+                postings[0].append(position)
+                postings[1].append(frequency)
+            self._lengths.append(len(tokens))
+            self._total_length += len(tokens)
+    
+    def scores(self, query: str, n: int) -> np.ndarray:
+        """
+        BM25 scores of the first n indexed documents for a query.
+        
+        Args:
+            query: Query text
+            n: Number of documents to score
+        
+        Returns:
+            float32 array of n scores (0 for documents sharing no term)
+        """
+        scores = np.zeros(n, dtype=np.float32)
+        count = len(self._lengths)
+        if n == 0 or count == 0:
+            return scores
+        
+        lengths = np.array(self._lengths, dtype=np.float32)[:n]
+        average_length = max(self._total_length / count, 1e-9)
+        length_norm = self.k1 * (1 - self.b + self.b * lengths / average_length)
+        
+        for term in dict.fromkeys(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            positions = np.array(postings[0], dtype=np.int64)
+            frequencies = np.array(postings[1], dtype=np.float32)
+            # Postings are in position order; drop documents past n
+            end = int(np.searchsorted(positions, n))
+            positions, frequencies = positions[:end], frequencies[:end]
+            
+            # Non-negative IDF variant (as in Lucene)
+            df = len(postings[0])
+            idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+            scores[positions] += idf * frequencies * (self.k1 + 1) / (frequencies + length_norm[positions])
+        
+        return scores
@@ -5,11 +5,62 @@ Uses sentence-transformers for local embedding generation.
 No API keys required - runs entirely on your machine.
 """
 import logging
+import os
+import platform
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from pathlib import Path
 from typing import List, Optional
+
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+# int8-quantized ONNX exports of the embedding models, one directory per model
+ONNX_CACHE_DIR = Path.home() / ".cache" / "rag" / "onnx"
+
+# Backend of the float PyTorch model (fp32, or fp16 on a GPU)
+TORCH_BACKEND = "torch"
+
+
+def _onnx_quantization_preset() -> str:
+    """
+    Dynamic int8 quantization preset matching this CPU: arm64 on ARM,
+    otherwise the widest of avx512_vnni, avx512 and avx2 it supports.
+    """
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "arm64"
+    
+    flags = set()
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    flags = set(line.split(":", 1)[1].split())
+                    break
+    except OSError:
+        # Not Linux; AVX2 is the safe baseline on x86-64
+        pass
+    
+    if "avx512_vnni" in flags:
+        return "avx512_vnni"
+    if "avx512f" in flags:
+        return "avx512"
+    return "avx2"
+
+
+ONNX_QUANTIZATION = _onnx_quantization_preset()
+ONNX_FILE_NAME = f"onnx/model_qint8_{ONNX_QUANTIZATION}.onnx"
+
+# Query embeddings kept for repeated queries, least recently used evicted first
+QUERY_CACHE_SIZE = 1024
+
+# CPU threads per encode call; the libraries default to every core, which
+# oversubscribes the CPU when several requests embed at once
+EMBED_THREADS = min(4, os.cpu_count() or 1)
+
 
 class EmbeddingModel:
     """
@@ -30,32 +81,129 @@ class EmbeddingModel:
         "paraphrase-MiniLM-L6-v2": 384,
     }
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        use_onnx: bool = False,
+        onnx_cache_dir: Path = ONNX_CACHE_DIR,
+        query_cache_size: int = QUERY_CACHE_SIZE,
+        num_threads: Optional[int] = EMBED_THREADS,
+        fp16: bool = False
+    ):
         """
         Initialize the embedding model.
         
         Args:
             model_name: HuggingFace model name (downloads automatically)
+            use_onnx: Run an int8-quantized ONNX export of the model with ONNX
+                Runtime (several times faster on CPU). Needs
+                optimum[onnxruntime]. Its embeddings differ from the PyTorch
+                model's, so vector stores record the backend and refuse
+                to mix them
+            onnx_cache_dir: Where the ONNX exports are kept
+            query_cache_size: Query embeddings cached by embed_query() (0 disables it)
+            num_threads: CPU threads used by PyTorch / ONNX Runtime (None keeps
+                the library default). PyTorch's setting is process-wide.
+            fp16: On a CUDA GPU, run the PyTorch model in half precision
+                instead of the CPU-oriented ONNX export
         """
         self.model_name = model_name
+        self.use_onnx = use_onnx
+        self.onnx_cache_dir = Path(onnx_cache_dir)
+        self.num_threads = num_threads
+        if fp16:
+            # Only import torch here when half precision is asked for
+            import torch
+            fp16 = torch.cuda.is_available()
+        self.fp16 = fp16
         self._model: Optional[SentenceTransformer] = None
+        
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
         logger.info(f"Initializing embedding model: {model_name}")
     
+    @property
+    def backend(self) -> str:
+        """
+        Backend the embeddings come from, e.g. "torch" or "onnx-qint8-avx2".
+        
+        Embeddings from different backends are not comparable.
+        """
+        if self.use_onnx and not self.fp16:
+            return f"onnx-qint8-{ONNX_QUANTIZATION}"
+        return TORCH_BACKEND
+    
     @property
     def model(self) -> SentenceTransformer:
         """Lazy load the model."""
         if self._model is None:
-            logger.info(f"Loading model {self.model_name}...")
-            self._model = SentenceTransformer(self.model_name)
+            logger.info(f"Loading model {self.model_name} ({self.backend})...")
+            if self.backend != TORCH_BACKEND:
+                self._model = self._load_onnx_model()
+            else:
+                import torch
+                
+                if self.num_threads:
+                    torch.set_num_threads(self.num_threads)
+                if self.fp16:
+                    self._model = SentenceTransformer(self.model_name, device="cuda").half()
+                else:
+                    self._model = SentenceTransformer(self.model_name)
             logger.info("Model loaded successfully")
         return self._model
     
+    def _load_onnx_model(self) -> SentenceTransformer:
+        """
+        Load the int8-quantized ONNX export of the model, exporting it first
+        if it isn't cached yet.
+        
+        Requires sentence-transformers >= 3.2 with optimum[onnxruntime].
+        """
+        import onnxruntime
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        
+        export_dir = self.onnx_cache_dir / self.model_name.replace("/", "__")
+        if not (export_dir / ONNX_FILE_NAME).exists():
+            logger.info(f"Exporting {self.model_name} to int8 ONNX in {export_dir}...")
+            model = SentenceTransformer(self.model_name, backend="onnx")
+            model.save(str(export_dir))
+            export_dynamic_quantized_onnx_model(model, ONNX_QUANTIZATION, str(export_dir))
+        
+        model_kwargs = {"file_name": ONNX_FILE_NAME}
+        if self.num_threads:
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = self.num_threads
+            model_kwargs["session_options"] = session_options
+        
+        return SentenceTransformer(str(export_dir), backend="onnx", model_kwargs=model_kwargs)
+    
+    def _encode(self, sentences, **kwargs) -> np.ndarray:
+        """
+        Encode with the model, outside autograd for the PyTorch backend.
+        
+        Returns:
+            float32 unit-length embeddings (fp16 models are upcast)
+        """
+        model = self.model
+        if self.backend == TORCH_BACKEND:
+            import torch
+            
+            no_grad = torch.inference_mode()
+        else:
+            no_grad = nullcontext()
+        with no_grad:
+            embeddings = model.encode(
+                sentences, convert_to_numpy=True, normalize_embeddings=True, **kwargs
+            )
+        return embeddings.astype(np.float32, copy=False)
+    
     @property
     def embedding_dimension(self) -> int:
         """Get the embedding dimension for the current model."""
         return self.MODEL_DIMENSIONS.get(self.model_name, 384)
     
-    def embed_text(self, text: str) -> List[float]:
+    def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
         
@@ -63,15 +211,14 @@ class EmbeddingModel:
             text: Text to embed
             
         Returns:
-            List of floats (embedding vector)
+            Unit-length float32 embedding vector (zeros for blank text)
         """
         if not text.strip():
-            return [0.0] * self.embedding_dimension
+            return np.zeros(self.embedding_dimension, dtype=np.float32)
         
-        embedding = self.model.encode(text, convert_to_tensor=False)
-        return embedding.tolist()
+        return self._encode(text)
     
-    def embed_texts(self, texts: List[str], batch_size: int = 32, show_progress: bool = True) -> List[List[float]]:
+    def embed_texts(self, texts: List[str], batch_size: int = 32, show_progress: bool = True) -> np.ndarray:
         """
         Generate embeddings for multiple texts.
         
@@ -81,37 +228,52 @@ class EmbeddingModel:
             show_progress: Show progress bar
             
         Returns:
-            List of embedding vectors
+            float32 array with one unit-length embedding per row
         """
         if not texts:
-            return []
+            return np.zeros((0, self.embedding_dimension), dtype=np.float32)
         
         logger.info(f"Generating embeddings for {len(texts)} texts...")
         
-        embeddings = self.model.encode(
+        embeddings = self._encode(
             texts,
             batch_size=batch_size,
-            show_progress_bar=show_progress,
-            convert_to_tensor=False
+            show_progress_bar=show_progress
         )
         
         logger.info(f"Generated {len(embeddings)} embeddings")
-        return [emb.tolist() for emb in embeddings]
+        return embeddings
     
-    def embed_query(self, query: str) -> List[float]:
+    def embed_query(self, query: str) -> np.ndarray:
         """
         Generate embedding for a search query.
         
         Note: Some models use different embeddings for queries vs documents.
         This method can be extended to support asymmetric search.
         
+        Repeated queries are answered from an LRU cache of their embeddings,
+        which is why the returned array is read-only.
+        
         Args:
             query: Search query
             
         Returns:
             Query embedding vector
         """
-        return self.embed_text(query)
+        with self._query_cache_lock:
+            embedding = self._query_cache.get(query)
+            if embedding is not None:
+                self._query_cache.move_to_end(query)
+                return embedding
+        
+        embedding = self.embed_text(query)
+        embedding.flags.writeable = False
+        if self.query_cache_size > 0:
+            with self._query_cache_lock:
+                self._query_cache[query] = embedding
+                if len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+        return embedding
     
     def similarity(self, text1: str, text2: str) -> float:
         """
@@ -124,10 +286,6 @@ class EmbeddingModel:
         Returns:
             Similarity score (0 to 1)
         """
-        from sentence_transformers import util
-        
-        emb1 = self.model.encode(text1, convert_to_tensor=True)
-        emb2 = self.model.encode(text2, convert_to_tensor=True)
-        
-        similarity = util.cos_sim(emb1, emb2)
-        return float(similarity[0][0])
+        # Unit-length embeddings, so the dot product is the cosine
+        emb1, emb2 = self._encode([text1, text2])
+        return float(emb1 @ emb2)
@@ -4,16 +4,103 @@ Vector Store - FAISS Integration (FREE, Windows-compatible)
 FAISS is a free, open-source vector database from Facebook AI.
 Has prebuilt Windows wheels - no compilation needed!
 """
+import asyncio
+import hashlib
 import logging
+import os
 import pickle
-from typing import List, Optional, Dict, Any
+import threading
+import uuid
+from itertools import islice
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from pathlib import Path
 import numpy as np
+import orjson
 
-from .embeddings import EmbeddingModel
+# Approximate nearest-neighbor search for large collections, if available
+try:
+    import faiss
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+
+from .bm25 import BM25Index
+from .embeddings import EmbeddingModel, TORCH_BACKEND
 
 logger = logging.getLogger(__name__)
 
+# Texts per SentenceTransformer.encode() batch when embedding new documents
+EMBED_BATCH_SIZE = 64
+
+# One JSONL line per stored document
+RECORD_JSON_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+
+# Unfiltered searches use a FAISS HNSW index from this many documents on;
+# below it, exact scoring is fast enough and has perfect recall
+ANN_MIN_DOCUMENTS = 10_000
+
+# HNSW graph degree and search beam width (higher: better recall, slower)
+HNSW_M = 32
+HNSW_EF_SEARCH = 64
+
+# Rows the HNSW index grows by before a save rewrites its file; persist()
+# writes any growth (the file is a full snapshot, unlike the append-only
+# document files, so rewriting it on every add would make ingest quadratic)
+ANN_SAVE_EVERY = 10_000
+
+# Rank offset in reciprocal rank fusion of dense and BM25 results
+RRF_K = 60
+
+
+def _content_digest(document: str) -> bytes:
+    """128-bit hash identifying a document's text."""
+    return hashlib.blake2b(document.encode("utf-8"), digest_size=16).digest()
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows in place (zero rows stay zero), so dot products are cosines."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    vectors /= np.maximum(norms, 1e-12)
+    return vectors
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    """1-based rank of each score along the last axis, highest first."""
+    order = np.argsort(-scores, axis=-1, kind="stable")
+    ranks = np.empty(scores.shape, dtype=np.float32)
+    np.put_along_axis(ranks, order, np.arange(1, scores.shape[-1] + 1, dtype=np.float32), axis=-1)
+    return ranks
+
+
+def _rrf_scores(dense_scores: np.ndarray, lexical_scores: np.ndarray) -> np.ndarray:
+    """
+    Reciprocal rank fusion of dense and BM25 scores.
+    
+    Every candidate gets 1 / (RRF_K + rank) from each ranking; documents
+    sharing no term with the query get nothing from the BM25 one.
+    """
+    fused = 1.0 / (RRF_K + _ranks(dense_scores))
+    fused += np.where(lexical_scores > 0, 1.0 / (RRF_K + _ranks(lexical_scores)), 0.0)
+    return fused
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, in O(n) plus a sort of k.
+    
+    Ties go to the lower index, as with a stable sort of all scores.
+    """
+    if k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    if k < len(scores):
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[:k - len(above)]
+        candidates = np.sort(np.concatenate([above, tied]))
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
 
 class VectorStore:
     """
@@ -25,7 +112,20 @@ class VectorStore:
     - Store document embeddings
     - Semantic similarity search
     - Metadata storage
-    - Persistent storage via pickle
+    - Persistent, append-only storage
+    
+    Embeddings are kept L2-normalized in one contiguous float32 matrix, so
+    a search scores every document with a single matrix-vector product.
+    
+    On disk, <collection>.f32 holds the raw matrix rows (memory-mapped on
+    load, so startup doesn't deserialize them), <collection>.jsonl one
+    {id, doc, metadata} record per row, and <collection>.json the row count,
+    dimension and embedding backend. Stores pickled by earlier versions are
+    converted on load.
+    
+    Embeddings from different backends (e.g. PyTorch and int8 ONNX) are not
+    comparable, so searching or adding with a model whose backend differs
+    from the stored one raises ValueError.
     """
     
     def __init__(
@@ -51,97 +151,374 @@ class VectorStore:
         
         # Storage
         self.documents: List[str] = []
-        self.embeddings: List[List[float]] = []
         self.metadatas: List[Dict[str, Any]] = []
         self.ids: List[str] = []
         
+        # Normalized embeddings: _matrix is the first len(documents) rows of
+        # _buffer, which grows geometrically so appends don't copy every time
+        self._buffer = np.zeros((0, self.embedding_model.embedding_dimension), dtype=np.float32)
+        self._matrix = self._buffer
+        # Rows already written to disk by _save()
+        self._persisted_count = 0
+        # Backend of the stored embeddings (None until the first add)
+        self.embedding_backend: Optional[str] = None
+        
+        # HNSW index over the matrix rows, built on the first large search
+        # and caught up with new rows lazily; FAISS indexes can't be added
+        # to while they are searched, so every use holds _ann_lock
+        self._ann_index = None
+        self._ann_lock = threading.Lock()
+        # Rows in the saved HNSW index file
+        self._ann_saved_count = 0
+        
+        # Metadata key -> that key's value for each stored document (None
+        # where missing), built on the first search filtering on the key
+        # and extended as documents are added
+        self._metadata_columns: Dict[str, np.ndarray] = {}
+        
+        # BM25 index over the documents for hybrid search, built on the
+        # first hybrid search and caught up lazily like the HNSW index
+        self._bm25: Optional[BM25Index] = None
+        self._bm25_lock = threading.Lock()
+        
+        # Content digest -> ID of the first stored document with that text,
+        # built from the stored documents on the first add
+        self._id_by_digest: Optional[Dict[bytes, str]] = None
+        
+        # Guards the parallel lists above against concurrent writers
+        # (ingest endpoints add documents from the threadpool)
+        self._write_lock = threading.Lock()
+        
         # Try to load existing data
         self._load()
         
         logger.info(f"Vector store initialized with {len(self.documents)} documents")
     
     def _get_storage_path(self) -> Path:
-        """Get the path to the storage file."""
+        """Get the path to the legacy pickle storage file."""
         return self.persist_directory / f"{self.collection_name}.pkl"
     
+    def _get_matrix_path(self) -> Path:
+        """Get the path to the legacy .npy embedding matrix."""
+        return self.persist_directory / f"{self.collection_name}.npy"
+    
+    def _get_paths(self) -> Tuple[Path, Path, Path]:
+        """Get the (index, embeddings, records) file paths."""
+        base = self.persist_directory / self.collection_name
+        return base.with_suffix(".json"), base.with_suffix(".f32"), base.with_suffix(".jsonl")
+    
+    def _get_ann_path(self) -> Path:
+        """Get the path to the saved HNSW index."""
+        return self.persist_directory / f"{self.collection_name}.hnsw"
+    
+    def _model_backend(self) -> str:
+        """
+        Backend of the embedding model, checked against the stored one.
+        
+        Raises:
+            ValueError: If the store holds embeddings from another backend
+        """
+        backend = getattr(self.embedding_model, "backend", TORCH_BACKEND)
+        stored = self.embedding_backend
+        if stored is not None and stored != backend and len(self.documents):
+            raise ValueError(
+                f"Collection '{self.collection_name}' holds {stored} embeddings, but the "
+                f"embedding model produces {backend} embeddings; use the same backend "
+                f"or re-ingest the documents"
+            )
+        return backend
+    
+    def _append_embeddings(self, embeddings: Any):
+        """Normalize new embeddings and append them to the matrix."""
+        rows = _normalize_rows(np.array(embeddings, dtype=np.float32, ndmin=2))
+        n = len(self._matrix)
+        if n == 0 and rows.shape[1] != self._buffer.shape[1]:
+            # Dimension comes from the data when it differs from the model's
+            self._buffer = np.zeros((0, rows.shape[1]), dtype=np.float32)
+        
+        if n + len(rows) > len(self._buffer):
+            # Also moves a memory-mapped matrix into memory on the first add
+            buffer = np.empty((max(2 * len(self._buffer), n + len(rows)), rows.shape[1]), dtype=np.float32)
+            buffer[:n] = self._matrix
+            self._buffer = buffer
+        self._buffer[n:n + len(rows)] = rows
+        self._matrix = self._buffer[:n + len(rows)]
+    
     def _save(self):
-        """Save the vector store to disk."""
-        data = {
-            "documents": self.documents,
-            "embeddings": self.embeddings,
-            "metadatas": self.metadatas,
-            "ids": self.ids
-        }
-        with open(self._get_storage_path(), "wb") as f:
-            pickle.dump(data, f)
-        logger.debug(f"Saved {len(self.documents)} documents to disk")
+        """
+        Append documents added since the last save to disk.
+        
+        Embedding rows go to the raw float32 file and records to the JSONL
+        file; nothing already saved is rewritten. The index file, replaced
+        last, holds the committed row count, so a save interrupted midway
+        leaves the previous state loadable.
+        """
+        index_path, matrix_path, records_path = self._get_paths()
+        n = len(self._matrix)
+        if self._persisted_count and not index_path.exists():
+            self._persisted_count = 0
+        start = self._persisted_count
+        
+        mode = "ab" if start else "wb"
+        with open(matrix_path, mode) as f:
+            f.write(np.ascontiguousarray(self._matrix[start:n]).tobytes())
+        with open(records_path, mode) as f:
+            f.write(b"".join(
+                orjson.dumps(
+                    {"id": doc_id, "doc": document, "metadata": metadata},
+                    option=RECORD_JSON_OPTIONS,
+                    default=str
+                )
+                for doc_id, document, metadata in zip(
+                    self.ids[start:n], self.documents[start:n], self.metadatas[start:n]
+                )
+            ))
+        
+        tmp_path = index_path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(orjson.dumps(
+            {"n": n, "dim": self._matrix.shape[1], "backend": self.embedding_backend}
+        ))
+        os.replace(tmp_path, index_path)
+        self._persisted_count = n
+        
+        self._save_ann()
+        logger.debug(f"Saved {n - start} new documents to disk ({n} total)")
+    
+    def _save_ann(self, force: bool = False):
+        """
+        Write the HNSW index file if the index grew by ANN_SAVE_EVERY rows
+        since it was last written, or by any rows when forced.
+        """
+        if self._ann_index is None:
+            return
+        with self._ann_lock:
+            grown = self._ann_index.ntotal - self._ann_saved_count
+            if grown > 0 and (force or grown >= ANN_SAVE_EVERY):
+                faiss.write_index(self._ann_index, str(self._get_ann_path()))
+                self._ann_saved_count = self._ann_index.ntotal
+    
+    def persist(self):
+        """Flush the in-memory store, including the HNSW index, to disk."""
+        with self._write_lock:
+            self._save()
+            self._save_ann(force=True)
     
     def _load(self):
         """Load the vector store from disk."""
-        path = self._get_storage_path()
-        if path.exists():
-            try:
-                with open(path, "rb") as f:
-                    data = pickle.load(f)
-                self.documents = data.get("documents", [])
-                self.embeddings = data.get("embeddings", [])
-                self.metadatas = data.get("metadatas", [])
-                self.ids = data.get("ids", [])
-                logger.info(f"Loaded {len(self.documents)} documents from disk")
-            except Exception as e:
-                logger.error(f"Error loading vector store: {e}")
+        index_path, matrix_path, records_path = self._get_paths()
+        try:
+            if index_path.exists():
+                self._load_files(index_path, matrix_path, records_path)
+            elif self._get_storage_path().exists():
+                self._load_legacy()
+                # Convert to the append-only files once
+                self._save()
+            else:
+                return
+            logger.info(f"Loaded {len(self.documents)} documents from disk")
+        except Exception as e:
+            logger.error(f"Error loading vector store: {e}")
+    
+    def _load_files(self, index_path: Path, matrix_path: Path, records_path: Path):
+        """
+        Memory-map the embeddings and read the records written by _save().
+        
+        Rows and records past the committed count (from an interrupted save)
+        are truncated away.
+        """
+        index = orjson.loads(index_path.read_bytes())
+        n, dim = index["n"], index["dim"]
+        # Stores saved before the backend was recorded hold PyTorch embeddings
+        self.embedding_backend = index.get("backend", TORCH_BACKEND) if n else None
+        
+        with open(records_path, "rb") as f:
+            lines = list(islice(f, n))
+        if len(lines) < n:
+            raise ValueError(f"{records_path} has {len(lines)} records, expected {n}")
+        
+        matrix_bytes = n * dim * np.dtype(np.float32).itemsize
+        if matrix_path.stat().st_size > matrix_bytes:
+            os.truncate(matrix_path, matrix_bytes)
+        records_bytes = sum(map(len, lines))
+        if records_path.stat().st_size > records_bytes:
+            os.truncate(records_path, records_bytes)
+        
+        records = [orjson.loads(line) for line in lines]
+        self.ids = [r["id"] for r in records]
+        self.documents = [r["doc"] for r in records]
+        self.metadatas = [r["metadata"] for r in records]
+        
+        if n:
+            self._buffer = self._matrix = np.memmap(matrix_path, dtype=np.float32, mode="r", shape=(n, dim))
+        else:
+            self._buffer = self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._persisted_count = n
+        
+        ann_path = self._get_ann_path()
+        if HAS_FAISS and ann_path.exists():
+            index = faiss.read_index(str(ann_path))
+            # An index ahead of the committed rows is stale; rebuild it on demand
+            if index.ntotal <= n:
+                self._ann_index = index
+                self._ann_saved_count = index.ntotal
+    
+    def _load_legacy(self):
+        """Load a store pickled by earlier versions."""
+        with open(self._get_storage_path(), "rb") as f:
+            data = pickle.load(f)
+        if "embeddings" in data:
+            embeddings = data["embeddings"]
+        else:
+            embeddings = np.load(self._get_matrix_path())
+        if len(embeddings):
+            self._append_embeddings(embeddings)
+            self.embedding_backend = TORCH_BACKEND
+        self.documents = data.get("documents", [])
+        self.metadatas = data.get("metadatas", [])
+        self.ids = data.get("ids", [])
     
     def add_documents(
         self,
         documents: List[str],
         metadatas: Optional[List[Dict[str, Any]]] = None,
-        ids: Optional[List[str]] = None
+        ids: Optional[List[str]] = None,
+        embeddings: Optional[Any] = None,
+        persist: bool = True,
+        batch_size: int = EMBED_BATCH_SIZE,
+        deduplicate: bool = True
     ) -> List[str]:
         """
         Add documents to the vector store.
         
+        All documents are embedded in one batched encode call and appended
+        in one step. Documents whose exact text is already stored (or
+        appears earlier in the batch) are skipped before embedding, and
+        get the stored document's ID.
+        
         Args:
             documents: List of document texts
             metadatas: Optional list of metadata dicts
             ids: Optional list of unique IDs
+            embeddings: Optional precomputed embeddings, one row per document
+                (skips the model)
+            persist: Write the store to disk after adding. Bulk loaders can
+                pass False and call persist() once at the end.
+            batch_size: Texts per embedding batch
+            deduplicate: Skip documents with already stored text
             
         Returns:
-            List of document IDs
+            List of document IDs, one per input document
         """
         if not documents:
             return []
         
-        # Generate IDs if not provided
-        import uuid
-        if ids is None:
-            ids = [str(uuid.uuid4()) for _ in documents]
-        
-        # Generate embeddings
-        logger.info(f"Adding {len(documents)} documents to vector store...")
-        new_embeddings = self.embedding_model.embed_texts(documents)
-        
         # Prepare metadatas
         if metadatas is None:
             metadatas = [{"source": "unknown"} for _ in documents]
         
-        # Add to storage
-        self.documents.extend(documents)
-        self.embeddings.extend(new_embeddings)
-        self.metadatas.extend(metadatas)
-        self.ids.extend(ids)
+        digests = None
+        if deduplicate:
+            digests = [_content_digest(document) for document in documents]
+            # Content-addressed IDs, so re-ingesting a text gives the same ID
+            if ids is None:
+                ids = [digest.hex() for digest in digests]
+            result_ids = list(ids)
+            
+            keep = self._new_documents(digests, result_ids)
+            if len(keep) < len(documents):
+                logger.info(f"Skipping {len(documents) - len(keep)} documents already stored")
+                documents = [documents[i] for i in keep]
+                metadatas = [metadatas[i] for i in keep]
+                ids = [result_ids[i] for i in keep]
+                digests = [digests[i] for i in keep]
+                if embeddings is not None:
+                    embeddings = np.asarray(embeddings)[keep]
+            if not documents:
+                return result_ids
+        else:
+            # Duplicate texts are stored separately, so they need distinct IDs
+            if ids is None:
+                ids = [uuid.uuid4().hex for _ in documents]
+            result_ids = list(ids)
         
-        # Persist
-        self._save()
+        # Generate embeddings
+        logger.info(f"Adding {len(documents)} documents to vector store...")
+        backend = self._model_backend()
+        if embeddings is None:
+            new_embeddings = self.embedding_model.embed_texts(
+                documents, batch_size=batch_size, show_progress=False
+            )
+        else:
+            new_embeddings = embeddings
+        
+        # Add to storage
+        with self._write_lock:
+            self.documents.extend(documents)
+            self.metadatas.extend(metadatas)
+            self.ids.extend(ids)
+            # After the lists, so a concurrent search never sees a row
+            # without its document
+            self._append_embeddings(new_embeddings)
+            # Precomputed embeddings are taken to match the model's backend
+            self.embedding_backend = backend
+            
+            if self._id_by_digest is not None:
+                if digests is None:
+                    digests = [_content_digest(document) for document in documents]
+                for digest, doc_id in zip(digests, ids):
+                    self._id_by_digest.setdefault(digest, doc_id)
+            
+            # Persist
+            if persist:
+                self._save()
         
         logger.info(f"Added {len(documents)} documents. Total: {len(self.documents)}")
-        return ids
+        return result_ids
     
-    def add_chunks(self, chunks: List[dict]) -> List[str]:
+    def _new_documents(self, digests: List[bytes], ids: List[str]) -> List[int]:
         """
-        Add text chunks to the vector store.
+        Find the documents whose text isn't stored yet.
+        
+        Args:
+            digests: Content digests of the texts being added
+            ids: Their IDs; entries of duplicates are replaced in place with
+                the ID of the stored (or earlier) document with the same text
+            
+        Returns:
+            Positions of the new documents
+        """
+        with self._write_lock:
+            if self._id_by_digest is None:
+                id_by_digest = {}
+                for document, doc_id in zip(self.documents, self.ids):
+                    id_by_digest.setdefault(_content_digest(document), doc_id)
+                self._id_by_digest = id_by_digest
+            stored = self._id_by_digest
+        
+        keep = []
+        batch = {}
+        for i, digest in enumerate(digests):
+            existing = stored.get(digest) or batch.get(digest)
+            if existing is not None:
+                ids[i] = existing
+            else:
+                batch[digest] = ids[i]
+                keep.append(i)
+        return keep
+    
+    def add_chunks(
+        self,
+        chunks: List[dict],
+        persist: bool = True,
+        batch_size: int = EMBED_BATCH_SIZE
+    ) -> List[str]:
+        """
+        Add text chunks to the vector store in a single bulk add.
         
         Args:
             chunks: List of chunk dicts with 'content', 'source', 'metadata'
+            persist: Write the store to disk after adding
+            batch_size: Texts per embedding batch
             
         Returns:
             List of document IDs
@@ -155,26 +532,19 @@ class VectorStore:
             metadata["chunk_index"] = chunk.get("chunk_index", 0)
             metadatas.append(metadata)
         
-        return self.add_documents(documents, metadatas=metadatas)
-    
-    def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
-        """Calculate cosine similarity between two vectors."""
-        a = np.array(vec1)
-        b = np.array(vec2)
-        
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
-        
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        
-        return float(np.dot(a, b) / (norm_a * norm_b))
+        return self.add_documents(
+            documents,
+            metadatas=metadatas,
+            persist=persist,
+            batch_size=batch_size
+        )
     
     def search(
         self,
         query: str,
         k: int = 5,
-        filter_metadata: Optional[Dict[str, Any]] = None
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        hybrid: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Search for similar documents.
@@ -183,60 +553,267 @@ class VectorStore:
             query: Search query
             k: Number of results to return
             filter_metadata: Optional metadata filter
+            hybrid: Rank by reciprocal rank fusion of cosine similarity and
+                BM25, so exact-term matches (names, model numbers) rank
+                high. Always scores every candidate exactly.
             
         Returns:
-            List of results with 'content', 'metadata', 'score'
+            List of results with 'content', 'metadata', 'score' (cosine
+            similarity), plus 'rrf_score' for hybrid searches
         """
         if len(self.documents) == 0:
             logger.warning("No documents in collection")
             return []
         
         # Generate query embedding
-        query_embedding = self.embedding_model.embed_query(query)
-        
-        # Calculate similarities
-        similarities = []
-        for i, doc_embedding in enumerate(self.embeddings):
-            # Apply metadata filter if provided
-            if filter_metadata:
-                match = all(
-                    self.metadatas[i].get(k) == v 
-                    for k, v in filter_metadata.items()
-                )
-                if not match:
-                    continue
+        self._model_backend()
+        query_embedding = _normalize_rows(
+            np.array(self.embedding_model.embed_query(query), dtype=np.float32)
+        )
+        
+        # Rows added after this point are not searched; the dense scores,
+        # BM25 scores and metadata filter all cover these same n rows
+        matrix = self._matrix
+        n = len(matrix)
+        if hybrid:
+            rows, candidates = self._candidates(matrix, filter_metadata)
+            lexical_scores = self._lexical_scores([query], n, rows)[0]
+            results = self._fused_results(candidates @ query_embedding, lexical_scores, rows, k)
+        elif not filter_metadata and self._use_ann(n):
+            results = self._ann_search(query_embedding[np.newaxis], n, k)[0]
+        else:
+            rows, candidates = self._candidates(matrix, filter_metadata)
+            results = self._top_results(candidates @ query_embedding, rows, k)
+        
+        logger.info(f"Found {len(results)} results for query: {query[:50]}...")
+        return results
+    
+    def search_batch(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        hybrid: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several queries at once.
+        
+        Embeds all queries in one batch and scores them against every
+        document with a single matrix product.
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            filter_metadata: Optional metadata filter, applied to all queries
+            hybrid: Fuse with BM25 rankings, as for search()
             
-            score = self._cosine_similarity(query_embedding, doc_embedding)
-            similarities.append((i, score))
+        Returns:
+            search() results for each query, in the same order
+        """
+        if not queries:
+            return []
+        if len(self.documents) == 0:
+            logger.warning("No documents in collection")
+            return [[] for _ in queries]
         
-        # Sort by similarity (highest first)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        self._model_backend()
+        # Rows added after this point are not searched
+        matrix = self._matrix
+        n = len(matrix)
+        rows, candidates = self._candidates(matrix, filter_metadata)
         
-        # Get top k results
-        results = []
-        for i, score in similarities[:k]:
-            results.append({
-                "content": self.documents[i],
-                "metadata": self.metadatas[i],
-                "score": round(score, 4),
-                "id": self.ids[i]
-            })
+        # Blank queries get a zero vector, as embed_query() gives them
+        query_embeddings = np.zeros((len(queries), candidates.shape[1]), dtype=np.float32)
+        nonblank = [i for i, query in enumerate(queries) if query.strip()]
+        if nonblank:
+            query_embeddings[nonblank] = self.embedding_model.embed_texts(
+                [queries[i] for i in nonblank], show_progress=False
+            )
+        _normalize_rows(query_embeddings)
         
-        logger.info(f"Found {len(results)} results for query: {query[:50]}...")
+        if hybrid:
+            dense_scores = query_embeddings @ candidates.T
+            lexical_scores = self._lexical_scores(queries, n, rows)
+            results = [
+                self._fused_results(row_scores, row_lexical_scores, rows, k)
+                for row_scores, row_lexical_scores in zip(dense_scores, lexical_scores)
+            ]
+        elif not filter_metadata and self._use_ann(n):
+            results = self._ann_search(query_embeddings, n, k)
+        else:
+            scores = query_embeddings @ candidates.T
+            results = [self._top_results(row_scores, rows, k) for row_scores in scores]
+        
+        logger.info(f"Searched {len(queries)} queries in one batch")
         return results
     
+    def _candidates(
+        self,
+        matrix: np.ndarray,
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """
+        Matrix rows a search scores.
+        
+        Args:
+            matrix: The embedding rows the search covers, read once by the
+                caller so rows appended meanwhile are left out consistently
+            filter_metadata: Optional metadata filter
+        
+        Returns:
+            (row indices matching filter_metadata, or None if unfiltered,
+            the embedding rows to score)
+        """
+        if not filter_metadata:
+            return None, matrix
+        
+        n = len(matrix)
+        mask = np.ones(n, dtype=bool)
+        for key, value in filter_metadata.items():
+            if value is None or isinstance(value, (str, int, float)):
+                mask &= self._metadata_column(key, n) == value
+            else:
+                # numpy would broadcast a list or dict value instead of comparing it
+                mask &= np.fromiter(
+                    (metadata.get(key) == value for metadata in self.metadatas[:n]), dtype=bool, count=n
+                )
+        
+        rows = np.flatnonzero(mask)
+        return rows, matrix[rows]
+    
+    def _metadata_column(self, key: str, n: int) -> np.ndarray:
+        """Values of one metadata key for the first n documents, as an object array."""
+        column = self._metadata_columns.get(key)
+        if column is None or len(column) < n:
+            start = 0 if column is None else len(column)
+            new_values = np.fromiter(
+                (metadata.get(key) for metadata in self.metadatas[start:n]), dtype=object, count=n - start
+            )
+            column = new_values if column is None else np.concatenate((column, new_values))
+            self._metadata_columns[key] = column
+        return column[:n]
+    
+    def _top_results(
+        self,
+        scores: np.ndarray,
+        rows: Optional[np.ndarray],
+        k: int
+    ) -> List[Dict[str, Any]]:
+        """Format the k best-scoring candidates (highest cosine similarity first)."""
+        return [
+            self._result(int(rows[j]) if rows is not None else int(j), scores[j])
+            for j in _top_k(scores, k)
+        ]
+    
+    def _fused_results(
+        self,
+        dense_scores: np.ndarray,
+        lexical_scores: np.ndarray,
+        rows: Optional[np.ndarray],
+        k: int
+    ) -> List[Dict[str, Any]]:
+        """Format the k candidates ranked best by fusing cosine and BM25 rankings."""
+        fused = _rrf_scores(dense_scores, lexical_scores)
+        results = []
+        for j in _top_k(fused, k):
+            result = self._result(int(rows[j]) if rows is not None else int(j), dense_scores[j])
+            result["rrf_score"] = float(fused[j])
+            results.append(result)
+        return results
+    
+    def _lexical_scores(self, queries: List[str], n: int, rows: Optional[np.ndarray]) -> np.ndarray:
+        """
+        BM25 scores of the candidates for each query.
+        
+        Builds the BM25 index on first use and indexes documents stored
+        since the last hybrid search.
+        
+        Args:
+            queries: Search queries
+            n: Number of documents searched
+            rows: Candidate row indices, or None for the first n rows
+            
+        Returns:
+            (queries, candidates) score matrix
+        """
+        with self._bm25_lock:
+            if self._bm25 is None:
+                self._bm25 = BM25Index()
+                logger.info(f"Building BM25 index over {n} documents...")
+            if len(self._bm25) < n:
+                self._bm25.add(self.documents[len(self._bm25):n])
+            scores = np.stack([self._bm25.scores(query, n) for query in queries])
+        return scores if rows is None else scores[:, rows]
+    
+    def _result(self, i: int, score: float) -> Dict[str, Any]:
+        """Search result for matrix row i."""
+        return {
+            "content": self.documents[i],
+            "metadata": self.metadatas[i],
+            "score": float(score),
+            "id": self.ids[i]
+        }
+    
+    def _use_ann(self, n: int) -> bool:
+        """Whether a search over n rows goes through the HNSW index."""
+        return HAS_FAISS and n >= ANN_MIN_DOCUMENTS
+    
+    def _ann_search(self, query_embeddings: np.ndarray, n: int, k: int) -> List[List[Dict[str, Any]]]:
+        """
+        Approximate top-k search over the first n rows with the HNSW index.
+        
+        Builds the index on first use and adds rows stored since the last
+        search. Inner product on normalized rows is cosine similarity.
+        """
+        with self._ann_lock:
+            if self._ann_index is None:
+                self._ann_index = faiss.IndexHNSWFlat(self._matrix.shape[1], HNSW_M, faiss.METRIC_INNER_PRODUCT)
+                self._ann_index.hnsw.efSearch = HNSW_EF_SEARCH
+                logger.info(f"Building HNSW index over {n} documents...")
+            if self._ann_index.ntotal < n:
+                self._ann_index.add(np.ascontiguousarray(self._matrix[self._ann_index.ntotal:n]))
+            scores, indices = self._ann_index.search(np.ascontiguousarray(query_embeddings), min(k, n))
+        
+        # Rows past n (added by a concurrent writer) are dropped; -1 pads missing hits
+        return [
+            [self._result(int(i), score) for i, score in zip(row_indices, row_scores) if 0 <= i < n]
+            for row_indices, row_scores in zip(indices, scores)
+        ]
+    
+    async def asearch(
+        self,
+        query: str,
+        k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        hybrid: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Async search - runs the embedding and scan in a worker thread."""
+        return await asyncio.to_thread(self.search, query, k, filter_metadata, hybrid)
+    
     def delete_collection(self) -> None:
         """Delete the entire collection."""
         logger.warning(f"Deleting collection '{self.collection_name}'")
-        self.documents = []
-        self.embeddings = []
-        self.metadatas = []
-        self.ids = []
-        
-        # Delete file
-        path = self._get_storage_path()
-        if path.exists():
-            path.unlink()
+        # Under the write lock, so a concurrent add can't interleave with the reset
+        with self._write_lock:
+            self.documents = []
+            self.metadatas = []
+            self.ids = []
+            self._buffer = np.zeros((0, self.embedding_model.embedding_dimension), dtype=np.float32)
+            self._matrix = self._buffer
+            self._persisted_count = 0
+            self.embedding_backend = None
+            self._metadata_columns = {}
+            self._id_by_digest = None
+            with self._bm25_lock:
+                self._bm25 = None
+            with self._ann_lock:
+                self._ann_index = None
+                self._ann_saved_count = 0
+            
+            # Delete files
+            for path in (*self._get_paths(), self._get_ann_path(), self._get_storage_path(), self._get_matrix_path()):
+                if path.exists():
+                    path.unlink()
     
     @property
     def collection(self):
@@ -253,16 +830,35 @@ class VectorStore:
             "collection_name": self.collection_name,
             "document_count": len(self.documents),
             "persist_directory": str(self.persist_directory),
-            "embedding_model": self.embedding_model.model_name
+            "embedding_model": self.embedding_model.model_name,
+            "embedding_backend": self.embedding_backend
         }
     
+    def get_columns(self) -> Dict[str, List[Any]]:
+        """
+        Get the stored data as parallel columns.
+        
+        The lists are the store's own storage, not copies - do not mutate.
+        """
+        return {
+            "ids": self.ids,
+            "documents": self.documents,
+            "metadatas": self.metadatas
+        }
+    
+    def get_all_ids(self) -> List[str]:
+        """Get the IDs of all stored documents."""
+        return list(self.ids)
+    
+    def iter_all_documents(self) -> Iterator[Dict[str, Any]]:
+        """Yield all documents with their metadata, one at a time."""
+        for content, metadata, doc_id in zip(self.documents, self.metadatas, self.ids):
+            yield {
+                "content": content,
+                "metadata": metadata,
+                "id": doc_id
+            }
+    
     def get_all_documents(self) -> List[Dict[str, Any]]:
         """Get all documents with their metadata."""
-        return [
-            {
-                "content": self.documents[i],
-                "metadata": self.metadatas[i],
-                "id": self.ids[i]
-            }
-            for i in range(len(self.documents))
-        ]
+        return list(self.iter_all_documents())